@@ -2,15 +2,24 @@
 
 import itertools
 import numbers
+import weakref
 from datetime import timedelta, datetime
 from collections import namedtuple
 
+from generator import ConfirmationCodeGenerator, CounterAllocator
+
 
 class TimeZone:
-    """Base class for time zones with name and offset"""
+    """Base class for time zones with name and offset
+
+    Time zones are immutable and interned: equal time zones are one shared object.
+    """
     
-    def __init__(self, name, offset_hours, offset_minutes):
-        """
+    __slots__ = ("_name", "_offset_hours", "_offset_minutes", "_offset", "__weakref__")
+    _registry = weakref.WeakValueDictionary()
+    
+    def __new__(cls, name, offset_hours, offset_minutes):
+        """Get the interned time zone, creating it if new
 
         Args:
             name (type): time zone name, non-empty
@@ -22,24 +31,53 @@ class TimeZone:
             ValueError: hour offset is not an integer
             ValueError: minute offset is not an integer in [-59, 59]
             ValueError: calculated offset is not in [-12:00, +14:00]
+
+        Returns:
+            TimeZone: shared time zone
         """
         if name is None or len(str(name).strip()) == 0:
             raise ValueError("Time zone name cannot be empty.")
-        self._name = str(name).strip()
+        name = str(name).strip()
         
         if not isinstance(offset_hours, numbers.Integral):
             raise ValueError("Hours offset must be an integer.")
         if not isinstance(offset_minutes, numbers.Integral) or offset_minutes < -59 or offset_minutes > 59:
             raise ValueError("Minutes offset must be an integer in [-59, 59].")
+        
+        key = (cls, name, offset_hours, offset_minutes)
+        timezone = cls._registry.get(key)
+        if timezone is not None:
+            return timezone
+        
         # sign of minutes will be set to sign of hours
         offset = timedelta(hours=offset_hours, minutes=offset_minutes)
         # offsets are in [-12:00, 14:00]
         # see https://en.wikipedia.org/wiki/List_of_UTC_time_offsets
         if offset < timedelta(hours=-12, minutes=0) or offset > timedelta(hours=14, minutes=0):
             raise ValueError("Offset must be between -12:00 and +14:00.")
-        self._offset_hours = offset_hours
-        self._offset_minutes = offset_minutes
-        self._offset = offset
+        timezone = super().__new__(cls)
+        object.__setattr__(timezone, "_name", name)
+        object.__setattr__(timezone, "_offset_hours", offset_hours)
+        object.__setattr__(timezone, "_offset_minutes", offset_minutes)
+        object.__setattr__(timezone, "_offset", offset)
+        # setdefault keeps the first one if another thread interned it meanwhile
+        return cls._registry.setdefault(key, timezone)
+    
+    def __setattr__(self, name, value):
+        """
+
+        Raises:
+            AttributeError: time zones are shared, hence immutable
+        """
+        raise AttributeError("TimeZone is immutable.")
+    
+    def __reduce__(self):
+        """Unpickle to the interned time zone
+
+        Returns:
+            tuple: constructor and its arguments
+        """
+        return type(self), (self._name, self._offset_hours, self._offset_minutes)
     
     @property
     def name(self):
@@ -50,6 +88,24 @@ class TimeZone:
         """
         return self._name
     
+    @property
+    def offset_hours(self):
+        """
+
+        Returns:
+            int: time zone hour offset
+        """
+        return self._offset_hours
+    
+    @property
+    def offset_minutes(self):
+        """
+
+        Returns:
+            int: time zone minute offset
+        """
+        return self._offset_minutes
+    
     @property
     def offset(self):
         """
@@ -73,6 +129,14 @@ class TimeZone:
                 self._offset_hours == other._offset_hours and
                 self._offset_minutes == other._offset_minutes)
     
+    def __hash__(self):
+        """
+
+        Returns:
+            int: hash value based on name, offset_hours, offset_minutes
+        """
+        return hash((self._name, self._offset_hours, self._offset_minutes))
+    
     def __repr__(self):
         """
 
@@ -90,9 +154,11 @@ Confirmation = namedtuple("Confirmation", "account_number, transaction_code, tra
 class Account:
     """Base class for bank accounts"""
     
+    __slots__ = ("_account_number", "_first_name", "_last_name", "_timezone", "_balance", "_name_observers")
+    
     transaction_counter = itertools.count(0)
+    _confirmation_code_generator = ConfirmationCodeGenerator(CounterAllocator(transaction_counter))
     _interest_rate = 0.5  # percentage
-    
     _transaction_codes = {
         "deposit": "D",
         "withdraw": "W",
@@ -111,6 +177,7 @@ class Account:
             initial_balance (int, optional): initial balance. Defaults to 0.
         """
         self._account_number = account_number
+        self._name_observers = None
         self.first_name = first_name
         self.last_name = last_name
         
@@ -142,7 +209,39 @@ class Account:
         """
         if len(str(value).strip()) == 0:
             raise ValueError(f"{field_title} cannot be empty.")
+        old_value = getattr(self, property_name, None)
         setattr(self, property_name, value)
+        observers = self._name_observers
+        if observers is not None:
+            for reference in observers:
+                observer = reference()
+                if observer is not None:
+                    observer.rename(self, property_name, old_value)
+    
+    def add_name_observer(self, observer):
+        """Notify observer of first and last name changes, without keeping it alive
+
+        Args:
+            observer (type): object with a rename(account, property_name, old_value) method, e.g.
+                AccountRegistry
+        """
+        reference = weakref.ref(observer)
+        observers = self._name_observers or ()
+        if reference not in observers:
+            # replaced rather than mutated, so a notification loop in another thread is unaffected
+            self._name_observers = observers + (reference,)
+    
+    def remove_name_observer(self, observer):
+        """
+
+        Args:
+            observer (type): object added with add_name_observer()
+        """
+        observers = tuple(
+            reference for reference in self._name_observers or ()
+            if reference() is not observer and reference() is not None
+        )
+        self._name_observers = observers or None
     
     @property 
     def first_name(self):
@@ -244,6 +343,79 @@ class Account:
             raise ValueError("Interest rate must be a non-negative real number.")
         cls._interest_rate = value
     
+    @classmethod
+    def get_confirmation_code_generator(cls):
+        """Ensure confirmation codes are generated uniformly across all instances
+
+        Returns:
+            ConfirmationCodeGenerator: confirmation code generator
+        """
+        return cls._confirmation_code_generator
+    
+    @classmethod
+    def set_confirmation_code_generator(cls, value):
+        """
+
+        Args:
+            value (type): confirmation code generator
+
+        Raises:
+            ValueError: value is not a ConfirmationCodeGenerator object
+        """
+        if not isinstance(value, ConfirmationCodeGenerator):
+            raise ValueError("Confirmation code generator must be a valid ConfirmationCodeGenerator object.")
+        cls._confirmation_code_generator = value
+    
+    @classmethod
+    def interest_segments(cls, periods, rate_schedule=None):
+        """Validate periods and rate schedule
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Raises:
+            ValueError: periods is not a non-negative integer
+            ValueError: a segment is not a non-negative integer period count with a non-negative real rate
+            ValueError: segments do not cover all periods
+
+        Returns:
+            list: (period_count, rate) segments
+        """
+        if not isinstance(periods, numbers.Integral) or periods < 0:
+            raise ValueError("Periods must be a non-negative integer.")
+        if rate_schedule is None:
+            return [(periods, cls.get_interest_rate())]
+        
+        segments = []
+        for period_count, rate in rate_schedule:
+            if not isinstance(period_count, numbers.Integral) or period_count < 0:
+                raise ValueError("Period count must be a non-negative integer.")
+            if not isinstance(rate, numbers.Real) or rate < 0:
+                raise ValueError("Interest rate must be a non-negative real number.")
+            segments.append((period_count, rate))
+        if sum(period_count for period_count, _ in segments) != periods:
+            raise ValueError("Rate schedule must cover all periods.")
+        return segments
+    
+    @classmethod
+    def interest_factor(cls, periods, rate_schedule=None):
+        """Compounded growth over all periods, one power per rate segment
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Returns:
+            real: factor to multiply balance by
+        """
+        factor = 1
+        for period_count, rate in cls.interest_segments(periods, rate_schedule):
+            factor *= (1 + rate / 100) ** period_count
+        return factor
+    
     @staticmethod
     def validate_real_number(value, min_value=None):
         """Validate value as a real_number no less than min_value if given
@@ -279,8 +451,7 @@ class Account:
         Returns:
             str: confirmation code
         """
-        dt_str = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        return f"{transaction_code}-{self.account_number}-{dt_str}-{next(Account.transaction_counter)}"
+        return Account.get_confirmation_code_generator().generate(transaction_code, self.account_number)
     
     @staticmethod
     def parse_confirmation_code(confirmation_code, preferred_time_zone=None):
@@ -342,6 +513,26 @@ class Account:
         
         return conf_code
     
+    def deposit_many(self, values):
+        """Deposit many values with one balance update
+
+        Args:
+            values (iterable): values
+
+        Returns:
+            list: confirmation codes, one per value
+        """
+        values = [Account.validate_real_number(value, min_value=0.01) for value in values]
+        
+        conf_codes = Account.get_confirmation_code_generator().reserve_codes(
+            Account._transaction_codes["deposit"], (self.account_number,), len(values)
+        )
+        
+        # deposit only when everything works
+        self._balance += sum(values)
+        
+        return list(conf_codes)
+    
     def withdraw(self, value):
         """
 
@@ -383,5 +574,27 @@ class Account:
         self._balance += interest
         
         return conf_code
+    
+    def accrue_interest(self, periods, rate_schedule=None):
+        """Pay interest compounded over many periods in closed form
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Returns:
+            ReservedConfirmationCodes: one confirmation code per period, formatted only when accessed
+        """
+        factor = Account.interest_factor(periods, rate_schedule)
+        
+        conf_codes = Account.get_confirmation_code_generator().reserve_codes(
+            Account._transaction_codes["interest"], (self.account_number,), periods
+        )
+        
+        # pay interest only when everything works
+        self._balance *= factor
+        
+        return conf_codes
 
 
@@ -0,0 +1,58 @@
+"""
+Stress benchmark for thread-safe accounts
+Command line: python bench_locking.py [accounts] [transfers_per_thread]
+"""
+
+from locking import ThreadSafeAccount, transfer
+import random
+import sys
+import threading
+import time
+
+
+def run(thread_count, account_count, transfers_per_thread):
+    """Run random transfers from thread_count threads
+
+    Args:
+        thread_count (int): number of threads
+        account_count (int): number of accounts
+        transfers_per_thread (int): number of transfers per thread
+
+    Returns:
+        tuple: transfers per second, and whether total balance is preserved
+    """
+    accounts = [ThreadSafeAccount(f"A{i}", "FIRST", "LAST", None, 1000) for i in range(account_count)]
+    total = sum(account.balance for account in accounts)
+    start = threading.Barrier(thread_count + 1)
+    
+    def transfer_randomly(seed):
+        rng = random.Random(seed)
+        start.wait()
+        for _ in range(transfers_per_thread):
+            src, dst = rng.sample(accounts, 2)
+            transfer(src, dst, rng.randint(1, 100))
+    
+    threads = [threading.Thread(target=transfer_randomly, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    
+    preserved = sum(account.balance for account in accounts) == total
+    return thread_count * transfers_per_thread / elapsed, preserved
+
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    transfers_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    print(f"{'threads':>8} {'transfers/s':>14} {'preserved':>10}")
+    for thread_count in (1, 2, 4, 8, 16):
+        rate, preserved = run(thread_count, account_count, transfers_per_thread)
+        print(f"{thread_count:>8} {rate:>14,.0f} {str(preserved):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Memory benchmark for accounts
+Command line: python bench_memory.py [accounts]
+"""
+
+from account import Account
+from datetime import timedelta
+import sys
+import tracemalloc
+
+
+class DictTimeZone:
+    """Layout of TimeZone before interning: attributes in __dict__, one object per account"""
+    
+    def __init__(self, name, offset_hours, offset_minutes):
+        self._name = name
+        self._offset_hours = offset_hours
+        self._offset_minutes = offset_minutes
+        self._offset = timedelta(hours=offset_hours, minutes=offset_minutes)
+
+
+class DictAccount:
+    """Layout of Account before __slots__: attributes in __dict__, own default time zone"""
+    
+    def __init__(self, account_number, first_name, last_name, timezone=None, initial_balance=0):
+        self._account_number = account_number
+        self._first_name = first_name
+        self._last_name = last_name
+        self._timezone = DictTimeZone("UTC", 0, 0)
+        self._balance = initial_balance
+
+
+def bytes_per_account(factory, account_numbers):
+    """
+
+    Args:
+        factory (type): account class
+        account_numbers (list): account numbers, allocated beforehand
+
+    Returns:
+        float: bytes allocated per account, excluding the account number
+    """
+    tracemalloc.start()
+    accounts = [factory(account_number, "FIRST", "LAST", None, 100.0) for account_number in account_numbers]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del accounts
+    return current / len(account_numbers)
+
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    account_numbers = [f"A{i}" for i in range(account_count)]
+    before = bytes_per_account(DictAccount, account_numbers)
+    after = bytes_per_account(Account, account_numbers)
+    print(f"before (__dict__, own TimeZone): {before:>7.1f} bytes/account")
+    print(f"after (__slots__, shared TimeZone): {after:>4.1f} bytes/account")
+    print(f"estimated for 10M accounts: {before * 1e7 / 2**30:.2f} GiB -> {after * 1e7 / 2**30:.2f} GiB")
+
+
+if __name__ == "__main__":
+    main()
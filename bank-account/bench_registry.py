@@ -0,0 +1,80 @@
+"""
+Benchmark for the account registry
+Command line: python bench_registry.py [accounts] [queries]
+"""
+
+from account import Account
+from registry import AccountRegistry
+import random
+import string
+import sys
+import time
+
+
+def random_name(rng):
+    """
+
+    Args:
+        rng (random.Random): random generator
+
+    Returns:
+        str: capitalized name of 4 to 10 letters
+    """
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))).capitalize()
+
+
+def rate(count, seconds):
+    """
+
+    Args:
+        count (int): number of operations
+        seconds (real): elapsed time
+
+    Returns:
+        str: operations per second
+    """
+    return f"{count / seconds:,.0f}/s"
+
+
+def main(account_count, query_count):
+    rng = random.Random(0)
+    started = time.perf_counter()
+    accounts = [
+        Account(f"A{i}", random_name(rng), random_name(rng)) for i in range(account_count)
+    ]
+    print(f"created {account_count:,} accounts in {time.perf_counter() - started:.1f}s")
+    
+    started = time.perf_counter()
+    registry = AccountRegistry(accounts)
+    print(f"registered in {time.perf_counter() - started:.1f}s")
+    
+    numbers = [f"A{rng.randrange(account_count)}" for _ in range(query_count)]
+    prefixes = [random_name(rng)[:3].lower() for _ in range(query_count)]
+    
+    started = time.perf_counter()
+    for number in numbers:
+        registry.get(number)
+    print(f"lookup by account number: {rate(query_count, time.perf_counter() - started)}")
+    
+    started = time.perf_counter()
+    found = sum(len(registry.find_by_last_name(prefix)) for prefix in prefixes)
+    print(f"last name prefix search: {rate(query_count, time.perf_counter() - started)}, {found / query_count:.1f} accounts per query")
+    
+    renamed = rng.sample(accounts, min(query_count, account_count))
+    started = time.perf_counter()
+    for account in renamed:
+        account.last_name = random_name(rng)
+    print(f"rename with reindexing: {rate(len(renamed), time.perf_counter() - started)}")
+    
+    # former approach, scanning a list
+    scan_count = max(1, query_count // 1000)
+    started = time.perf_counter()
+    for prefix in prefixes[:scan_count]:
+        [account for account in accounts if account.last_name.casefold().startswith(prefix)]
+    print(f"last name prefix scan of a list: {rate(scan_count, time.perf_counter() - started)}")
+
+
+if __name__ == "__main__":
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    main(account_count, query_count)
@@ -0,0 +1,50 @@
+"""
+Benchmark for SQLite persistence
+Command line: python bench_repository.py [accounts]
+"""
+
+from account import TimeZone, Account
+from repository import AccountRepository
+import os
+import sys
+import tempfile
+import time
+
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    timezones = [TimeZone("UTC", 0, 0), TimeZone("MST", -7, 0), TimeZone("IST", 5, 30)]
+    accounts = [
+        Account(f"A{i}", "FIRST", "LAST", timezones[i % len(timezones)], 100)
+        for i in range(account_count)
+    ]
+    codes = [(account, account.deposit(10)) for account in accounts]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "accounts.db")
+        with AccountRepository(path) as repository:
+            t0 = time.perf_counter()
+            repository.save_accounts(accounts)
+            repository.flush()
+            elapsed = time.perf_counter() - t0
+            print(f"insert accounts:     {account_count / elapsed:>12,.0f} rows/s")
+            
+            t0 = time.perf_counter()
+            for account, code in codes:
+                repository.save_transaction(account, code)
+            repository.flush()
+            elapsed = time.perf_counter() - t0
+            print(f"insert transactions: {account_count / elapsed:>12,.0f} rows/s")
+        
+        with AccountRepository(path) as repository:
+            t0 = time.perf_counter()
+            count = sum(1 for _ in repository.load_accounts())
+            print(f"load {count:,} accounts: {time.perf_counter() - t0:>8.2f} s")
+            
+            t0 = time.perf_counter()
+            book = repository.load_book()
+            print(f"load {len(book):,} into book: {time.perf_counter() - t0:>6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
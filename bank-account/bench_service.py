@@ -0,0 +1,76 @@
+"""
+Benchmark for the asyncio account service
+Command line: python bench_service.py [clients] [requests_per_client] [accounts]
+"""
+
+from account import Account
+from service import AccountService
+import asyncio
+import random
+import sys
+import time
+
+
+def percentile(values, fraction):
+    """
+
+    Args:
+        values (list): values
+        fraction (real): fraction in [0, 1]
+
+    Returns:
+        real: value at the fraction of sorted values
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run_clients(deposit, account_numbers, client_count, requests_per_client):
+    """Stand-in client: many coroutines sending deposits to random accounts
+
+    Args:
+        deposit (coroutine function): deposit(account_number, value)
+        account_numbers (list): account numbers
+        client_count (int): number of concurrent clients
+        requests_per_client (int): number of requests per client
+
+    Returns:
+        tuple: requests per second, p99 latency in milliseconds
+    """
+    latencies = []
+    
+    async def client(seed):
+        rng = random.Random(seed)
+        for _ in range(requests_per_client):
+            t0 = time.perf_counter()
+            await deposit(rng.choice(account_numbers), 1)
+            latencies.append(time.perf_counter() - t0)
+    
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(client_count)))
+    elapsed = time.perf_counter() - t0
+    return len(latencies) / elapsed, percentile(latencies, 0.99) * 1000
+
+
+async def main():
+    client_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    account_count = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    account_numbers = [f"A{i}" for i in range(account_count)]
+    
+    accounts = {number: Account(number, "FIRST", "LAST") for number in account_numbers}
+    loop = asyncio.get_running_loop()
+    
+    async def executor_deposit(account_number, value):
+        return await loop.run_in_executor(None, accounts[account_number].deposit, value)
+    
+    rate, p99 = await run_clients(executor_deposit, account_numbers, client_count, requests_per_client)
+    print(f"run_in_executor: {rate:>10,.0f} requests/s  p99 {p99:>8.2f} ms")
+    
+    async with AccountService(Account(number, "FIRST", "LAST") for number in account_numbers) as service:
+        rate, p99 = await run_clients(service.deposit, account_numbers, client_count, requests_per_client)
+    print(f"AccountService:  {rate:>10,.0f} requests/s  p99 {p99:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
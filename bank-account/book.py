@@ -0,0 +1,424 @@
+"""Columnar account book"""
+
+import numpy as np
+
+from account import TimeZone, Account
+
+
+class AccountBook:
+    """Container keeping balances, account numbers and time zones of many accounts in arrays"""
+    
+    _initial_capacity = 16
+    
+    def __init__(self):
+        """Create an empty book"""
+        self._size = 0
+        self._index = {}
+        self._account_numbers = np.empty(AccountBook._initial_capacity, dtype=object)
+        self._balances = np.zeros(AccountBook._initial_capacity, dtype=np.float64)
+        self._timezone_ids = np.zeros(AccountBook._initial_capacity, dtype=np.int32)
+        self._timezones = []
+        self._timezone_lookup = {}
+    
+    @classmethod
+    def from_accounts(cls, accounts):
+        """Build a book from existing Account objects
+
+        Args:
+            accounts (iterable): Account objects
+
+        Returns:
+            AccountBook: book holding the accounts' numbers, time zones and balances
+        """
+        accounts = list(accounts)
+        book = cls()
+        book.extend(
+            [account.account_number for account in accounts],
+            [account.timezone for account in accounts],
+            [account.balance for account in accounts],
+        )
+        return book
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of accounts
+        """
+        return self._size
+    
+    def __contains__(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            bool: True if account number is in the book
+        """
+        return account_number in self._index
+    
+    @property
+    def account_numbers(self):
+        """
+
+        Returns:
+            numpy.ndarray: account numbers, read-only
+        """
+        return self._read_only(self._account_numbers[:self._size])
+    
+    @property
+    def balances(self):
+        """
+
+        Returns:
+            numpy.ndarray: balances, read-only
+        """
+        return self._read_only(self._balances[:self._size])
+    
+    @property
+    def timezone_ids(self):
+        """
+
+        Returns:
+            numpy.ndarray: index into `timezones` for each account, read-only
+        """
+        return self._read_only(self._timezone_ids[:self._size])
+    
+    @property
+    def timezones(self):
+        """
+
+        Returns:
+            tuple: distinct time zones referenced by `timezone_ids`
+        """
+        return tuple(self._timezones)
+    
+    @staticmethod
+    def _read_only(array):
+        """Return a read-only view so that balances cannot be changed bypassing transactions
+
+        Args:
+            array (numpy.ndarray): array
+
+        Returns:
+            numpy.ndarray: read-only view
+        """
+        view = array.view()
+        view.flags.writeable = False
+        return view
+    
+    def _grow(self):
+        """Double capacity of all columns"""
+        capacity = 2 * len(self._balances)
+        for name in ("_account_numbers", "_balances", "_timezone_ids"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+    
+    def _timezone_id(self, timezone):
+        """Get index of timezone in the distinct time zones, registering it if new
+
+        Args:
+            timezone (TimeZone): time zone
+
+        Returns:
+            int: time zone index
+        """
+        timezone_id = self._timezone_lookup.get(timezone)
+        if timezone_id is None:
+            timezone_id = len(self._timezones)
+            self._timezones.append(timezone)
+            self._timezone_lookup[timezone] = timezone_id
+        return timezone_id
+    
+    def add(self, account_number, timezone=None, initial_balance=0):
+        """
+
+        Args:
+            account_number (type): account number, unique in the book
+            timezone (TimeZone, optional): preferred time zone. Defaults to None.
+            initial_balance (int, optional): initial balance. Defaults to 0.
+
+        Raises:
+            ValueError: account number already exists
+            ValueError: time zone is not a TimeZone object
+
+        Returns:
+            int: position of the account in the book
+        """
+        if account_number in self._index:
+            raise ValueError(f"Account number {account_number} already exists.")
+        if timezone is None:
+            timezone = TimeZone("UTC", 0, 0)
+        if not isinstance(timezone, TimeZone):
+            raise ValueError("Time zone must be a valid TimeZone object.")
+        initial_balance = Account.validate_real_number(initial_balance, min_value=0)
+        
+        if self._size == len(self._balances):
+            self._grow()
+        position = self._size
+        self._account_numbers[position] = account_number
+        self._balances[position] = initial_balance
+        self._timezone_ids[position] = self._timezone_id(timezone)
+        self._index[account_number] = position
+        self._size += 1
+        return position
+    
+    def extend(self, account_numbers, timezones=None, initial_balances=None):
+        """Add many accounts at once
+
+        Args:
+            account_numbers (iterable): account numbers, unique in the book
+            timezones (iterable, optional): preferred time zone of each account. Defaults to None for UTC.
+            initial_balances (array-like, optional): initial balance of each account. Defaults to None for 0.
+
+        Raises:
+            ValueError: account number already exists or is repeated
+            ValueError: time zone is not a TimeZone object
+            ValueError: initial balances are not non-negative real numbers
+        """
+        account_numbers = list(account_numbers)
+        count = len(account_numbers)
+        new_index = {}
+        for offset, account_number in enumerate(account_numbers):
+            if account_number in self._index or account_number in new_index:
+                raise ValueError(f"Account number {account_number} already exists.")
+            new_index[account_number] = self._size + offset
+        
+        if timezones is None:
+            timezone_ids = np.full(count, self._timezone_id(TimeZone("UTC", 0, 0)), dtype=np.int32)
+        else:
+            timezones = list(timezones)
+            if any(not isinstance(timezone, TimeZone) for timezone in timezones):
+                raise ValueError("Time zone must be a valid TimeZone object.")
+            timezone_ids = np.fromiter((self._timezone_id(tz) for tz in timezones), dtype=np.int32, count=count)
+        
+        if initial_balances is None:
+            initial_balances = np.zeros(count)
+        initial_balances = AccountBook._validate_values(initial_balances, count, 0)
+        
+        while self._size + count > len(self._balances):
+            self._grow()
+        end = self._size + count
+        self._account_numbers[self._size:end] = account_numbers
+        self._balances[self._size:end] = initial_balances
+        self._timezone_ids[self._size:end] = timezone_ids
+        self._index.update(new_index)
+        self._size = end
+    
+    def balance(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            real: current balance of the account
+        """
+        return float(self._balances[self._position(account_number)])
+    
+    def timezone(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            TimeZone: preferred time zone of the account
+        """
+        return self._timezones[self._timezone_ids[self._position(account_number)]]
+    
+    def _position(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is not in the book
+
+        Returns:
+            int: position of the account in the book
+        """
+        try:
+            return self._index[account_number]
+        except KeyError:
+            raise ValueError(f"Unknown account number {account_number}.") from None
+    
+    def _positions(self, account_numbers):
+        """
+
+        Args:
+            account_numbers (iterable): account numbers
+
+        Returns:
+            numpy.ndarray: positions of the accounts in the book
+        """
+        return np.fromiter((self._position(n) for n in account_numbers), dtype=np.intp)
+    
+    @staticmethod
+    def _validate_values(values, count, min_value):
+        """Validate a batch of values with the rules of Account.validate_real_number
+
+        Args:
+            values (array-like): values
+            count (int): expected number of values
+            min_value (real): minimal value for lower bound
+
+        Raises:
+            ValueError: values are not real numbers
+            ValueError: number of values does not match number of accounts
+            ValueError: any value is less than min_value
+
+        Returns:
+            numpy.ndarray: values as floats
+        """
+        values = np.asarray(values)
+        if values.dtype.kind not in "iuf":
+            raise ValueError("Value must be a real number.")
+        values = values.astype(np.float64, copy=False).reshape(-1)
+        if len(values) != count:
+            raise ValueError("Number of values must match number of accounts.")
+        if (values < min_value).any():
+            raise ValueError(f"Value must be no less than {min_value}.")
+        return values
+    
+    @staticmethod
+    def _occurrence_rounds(positions):
+        """Split entries into rounds touching each account at most once, preserving batch order
+
+        Round r holds the (r + 1)-th entry of every account with more than r entries, so it only
+        touches those accounts, and all rounds together touch each entry once.
+
+        Args:
+            positions (numpy.ndarray): positions of the accounts
+
+        Yields:
+            numpy.ndarray: entries of the round, in batch order
+        """
+        count = len(positions)
+        if not count:
+            return
+        order = np.argsort(positions, kind="stable")
+        sorted_positions = positions[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_positions[1:] != sorted_positions[:-1])))
+        lengths = np.diff(np.append(starts, count))
+        # groups by decreasing length, so round r takes the groups of a prefix
+        by_length = np.argsort(-lengths, kind="stable")
+        starts, descending = starts[by_length], -lengths[by_length]
+        for round_ in range(int(-descending[0])):
+            active = np.searchsorted(descending, -round_, side="left")
+            yield np.sort(order[starts[:active] + round_])
+    
+    def _confirmation_codes(self, positions, transaction_codes):
+        """Generate confirmation codes sharing one timestamp, with consecutive transaction ids
+
+        Args:
+            positions (numpy.ndarray): positions of the accounts
+            transaction_codes (numpy.ndarray or str): transaction code of each entry
+
+        Returns:
+            numpy.ndarray: confirmation codes
+        """
+        count = len(positions)
+        if count == 0:
+            return np.array([], dtype=str)
+        generator = Account.get_confirmation_code_generator()
+        dt_str = generator.timestamp()
+        id_ranges = generator.reserve_transaction_ids(count)
+        transaction_ids = np.concatenate([np.arange(r.start, r.stop) for r in id_ranges]).astype(str)
+        account_numbers = self._account_numbers[positions].astype(str)
+        codes = np.char.add(transaction_codes, "-")
+        codes = np.char.add(codes, account_numbers)
+        codes = np.char.add(codes, f"-{dt_str}-")
+        return np.char.add(codes, transaction_ids)
+    
+    def deposit(self, account_numbers, values):
+        """Deposit a batch of values
+
+        Args:
+            account_numbers (iterable): account number of each deposit
+            values (array-like): value of each deposit
+
+        Returns:
+            numpy.ndarray: confirmation codes, in batch order
+        """
+        positions = self._positions(account_numbers)
+        values = AccountBook._validate_values(values, len(positions), 0.01)
+        
+        transaction_code = Account._transaction_codes["deposit"]
+        conf_codes = self._confirmation_codes(positions, transaction_code)
+        
+        # unbuffered, applied in batch order for repeated accounts
+        np.add.at(self._balances, positions, values)
+        
+        return conf_codes
+    
+    def withdraw(self, account_numbers, values):
+        """Withdraw a batch of values, rejecting those with insufficient funds
+
+        Args:
+            account_numbers (iterable): account number of each withdrawal
+            values (array-like): value of each withdrawal
+
+        Returns:
+            numpy.ndarray: confirmation codes, in batch order
+        """
+        positions = self._positions(account_numbers)
+        values = AccountBook._validate_values(values, len(positions), 0.01)
+        
+        accepted = np.zeros(len(positions), dtype=bool)
+        # every round touches each account at most once, so rounds run in batch order per account
+        for entries in AccountBook._occurrence_rounds(positions):
+            round_positions = positions[entries]
+            round_values = values[entries]
+            ok = self._balances[round_positions] - round_values >= 0
+            self._balances[round_positions[ok]] -= round_values[ok]
+            accepted[entries] = ok
+        
+        transaction_codes = np.where(
+            accepted,
+            Account._transaction_codes["withdraw"],
+            Account._transaction_codes["rejected"],
+        )
+        return self._confirmation_codes(positions, transaction_codes)
+    
+    def pay_interest(self):
+        """Pay monthly interest to every account
+
+        Returns:
+            numpy.ndarray: confirmation codes, in book order
+        """
+        # same operation order as Account.pay_interest for identical results
+        interest = self._balances[:self._size] * Account.get_interest_rate() / 100
+        
+        positions = np.arange(self._size)
+        conf_codes = self._confirmation_codes(positions, Account._transaction_codes["interest"])
+        
+        self._balances[:self._size] += interest
+        
+        return conf_codes
+    
+    def accrue_interest(self, periods, rate_schedule=None):
+        """Pay interest compounded over many periods to every account in closed form
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Returns:
+            ReservedConfirmationCodes: one confirmation code per account and period, in book order,
+                formatted only when accessed
+        """
+        factor = Account.interest_factor(periods, rate_schedule)
+        
+        conf_codes = Account.get_confirmation_code_generator().reserve_codes(
+            Account._transaction_codes["interest"], self._account_numbers[:self._size].copy(), periods
+        )
+        
+        self._balances[:self._size] *= factor
+        
+        return conf_codes
@@ -0,0 +1,156 @@
+"""Compact binary encoding of confirmation codes"""
+
+import struct
+import calendar
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from confirmation import ConfirmationParser
+
+
+class ConfirmationCodec:
+    """Fixed-width binary encoding of confirmation codes
+
+    Each code packs into 17 bytes: transaction code letter, account id, UTC epoch seconds and
+    transaction id. Account ids index the codec's table of account numbers, which must be kept
+    with the encoded data to decode it.
+    """
+    
+    record = struct.Struct("<cIIQ")
+    record_dtype = np.dtype([
+        ("transaction_code", "S1"),
+        ("account_id", "<u4"),
+        ("time_utc", "<u4"),
+        ("transaction_id", "<u8"),
+    ])
+    _epoch = datetime(1970, 1, 1)
+    
+    def __init__(self, account_numbers=()):
+        """
+
+        Args:
+            account_numbers (iterable, optional): account number of each id, e.g. a saved table.
+                Defaults to ().
+
+        Raises:
+            ValueError: account numbers are repeated
+        """
+        self._account_numbers = []
+        self._account_ids = {}
+        for account_number in account_numbers:
+            if account_number in self._account_ids:
+                raise ValueError(f"Account number {account_number} already exists.")
+            self._account_id(account_number)
+    
+    @property
+    def account_numbers(self):
+        """
+
+        Returns:
+            tuple: account number of each id, to be saved with the encoded data
+        """
+        return tuple(self._account_numbers)
+    
+    def _account_id(self, account_number):
+        """Get id of account number, assigning the next one if new
+
+        Args:
+            account_number (str): account number
+
+        Returns:
+            int: account id
+        """
+        account_id = self._account_ids.get(account_number)
+        if account_id is None:
+            account_id = self._account_ids[account_number] = len(self._account_numbers)
+            self._account_numbers.append(account_number)
+        return account_id
+    
+    def encode(self, confirmation_code):
+        """
+
+        Args:
+            confirmation_code (str): confirmation code
+
+        Raises:
+            ValueError: confirmation code does not contain four parts joined by "-"
+            ValueError: transaction code is not a single ASCII letter
+            ValueError: datetime string is not a valid datetime string in [1970, 2106)
+            ValueError: transaction id is not a non-negative 64-bit integer
+
+        Returns:
+            bytes: encoded confirmation code
+        """
+        parts = confirmation_code.split("-")
+        if len(parts) != 4:
+            raise ValueError("Invalid confirmation code.")
+        transaction_code, account_number, raw_dt_utc, transaction_id = parts
+        
+        if len(transaction_code) != 1 or not transaction_code.isascii():
+            raise ValueError("Invalid transaction code.")
+        dt_utc = ConfirmationParser.datetime_utc(raw_dt_utc)
+        epoch_seconds = calendar.timegm(dt_utc.timetuple())
+        if not 0 <= epoch_seconds < 2 ** 32:
+            raise ValueError("Transaction datetime must be in [1970, 2106).")
+        if not (transaction_id.isascii() and transaction_id.isdigit()) or int(transaction_id) >= 2 ** 64:
+            raise ValueError("Invalid transaction id.")
+        
+        return ConfirmationCodec.record.pack(
+            transaction_code.encode(), self._account_id(account_number), epoch_seconds, int(transaction_id)
+        )
+    
+    def encode_many(self, confirmation_codes):
+        """
+
+        Args:
+            confirmation_codes (iterable): confirmation codes
+
+        Returns:
+            bytes: encoded confirmation codes, back to back
+        """
+        return b"".join(self.encode(confirmation_code) for confirmation_code in confirmation_codes)
+    
+    def decode(self, data, offset=0):
+        """
+
+        Args:
+            data (bytes-like): encoded confirmation codes, e.g. bytes, memoryview or mmap
+            offset (int, optional): byte offset of the code. Defaults to 0.
+
+        Returns:
+            str: confirmation code, as accepted by `Account.parse_confirmation_code`
+        """
+        transaction_code, account_id, epoch_seconds, transaction_id = ConfirmationCodec.record.unpack_from(data, offset)
+        dt_str = (ConfirmationCodec._epoch + timedelta(seconds=epoch_seconds)).strftime("%Y%m%d%H%M%S")
+        return f"{transaction_code.decode()}-{self._account_numbers[account_id]}-{dt_str}-{transaction_id}"
+    
+    def decode_records(self, data):
+        """View encoded confirmation codes as a structured array without copying or building strings
+
+        Args:
+            data (bytes-like): encoded confirmation codes, e.g. bytes, memoryview or mmap
+
+        Returns:
+            numpy.ndarray: records, see `record_dtype`
+        """
+        return np.frombuffer(data, dtype=ConfirmationCodec.record_dtype)
+    
+    def decode_columns(self, data):
+        """Decode encoded confirmation codes into columns in one vectorized pass
+
+        Args:
+            data (bytes-like): encoded confirmation codes, e.g. bytes, memoryview or mmap
+
+        Returns:
+            dict: numpy arrays `transaction_code`, `account_number`, `time_utc` (datetime64)
+                and `transaction_id`
+        """
+        records = self.decode_records(data)
+        account_numbers = np.array(self._account_numbers, dtype=object)
+        return {
+            "transaction_code": records["transaction_code"],
+            "account_number": account_numbers[records["account_id"]],
+            "time_utc": records["time_utc"].astype("datetime64[s]"),
+            "transaction_id": records["transaction_id"],
+        }
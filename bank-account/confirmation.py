@@ -0,0 +1,234 @@
+"""Bulk confirmation code parsing"""
+
+import itertools
+from datetime import datetime
+from collections import namedtuple
+
+import numpy as np
+
+from account import TimeZone, Confirmation
+
+
+ParseError = namedtuple("ParseError", "line_number, confirmation_code, message")
+
+
+class ConfirmationParser:
+    """Streaming parser for many confirmation codes, collecting bad codes instead of raising"""
+    
+    _datetime_width = 14  # %Y%m%d%H%M%S
+    
+    def __init__(self, preferred_time_zone=None):
+        """
+
+        Args:
+            preferred_time_zone (TimeZone, optional): preferred time zone. Defaults to None.
+
+        Raises:
+            ValueError: preferred time zone is not a TimeZone object
+        """
+        if preferred_time_zone is None:
+            preferred_time_zone = TimeZone("UTC", 0, 0)
+        if not isinstance(preferred_time_zone, TimeZone):
+            raise ValueError("Invalid TimeZone specified.")
+        self._time_zone = preferred_time_zone
+        self._offset_seconds = np.timedelta64(int(preferred_time_zone.offset.total_seconds()), "s")
+        self._errors = []
+        # codes generated in the same second share the datetime string
+        self._last_raw_dt = None
+        self._last_times = None
+    
+    @property
+    def errors(self):
+        """
+
+        Returns:
+            list: ParseError for each bad code seen so far, in input order
+        """
+        return self._errors
+    
+    @staticmethod
+    def numbered(codes):
+        """Number codes from 1 and skip blank lines
+
+        Args:
+            codes (iterable): confirmation codes, e.g. lines of a file
+
+        Yields:
+            tuple: line number and stripped confirmation code
+        """
+        for line_number, code in enumerate(codes, 1):
+            code = code.strip()
+            if code:
+                yield line_number, code
+    
+    @staticmethod
+    def datetime_utc(raw_dt_utc):
+        """Convert fixed-width UTC datetime string without strptime
+
+        Args:
+            raw_dt_utc (str): datetime string as %Y%m%d%H%M%S
+
+        Raises:
+            ValueError: datetime string is not a valid datetime string
+
+        Returns:
+            datetime: naive UTC datetime
+        """
+        if len(raw_dt_utc) != ConfirmationParser._datetime_width or not (raw_dt_utc.isascii() and raw_dt_utc.isdigit()):
+            raise ValueError("Invalid transaction datetime.")
+        try:
+            return datetime(
+                int(raw_dt_utc[:4]), int(raw_dt_utc[4:6]), int(raw_dt_utc[6:8]),
+                int(raw_dt_utc[8:10]), int(raw_dt_utc[10:12]), int(raw_dt_utc[12:14]),
+            )
+        except ValueError as e:
+            raise ValueError("Invalid transaction datetime.") from e
+    
+    def times(self, raw_dt_utc):
+        """Convert fixed-width UTC datetime string without strptime, reusing the last conversion
+
+        Args:
+            raw_dt_utc (str): datetime string as %Y%m%d%H%M%S
+
+        Raises:
+            ValueError: datetime string is not a valid datetime string
+
+        Returns:
+            tuple: UTC time in ISO format and time in preferred time zone
+        """
+        if raw_dt_utc == self._last_raw_dt:
+            return self._last_times
+        dt_utc = ConfirmationParser.datetime_utc(raw_dt_utc)
+        dt_preferred = dt_utc + self._time_zone.offset
+        times = (dt_utc.isoformat(), f"{dt_preferred.isoformat(' ')} ({self._time_zone.name})")
+        self._last_raw_dt = raw_dt_utc
+        self._last_times = times
+        return times
+    
+    def parse(self, codes):
+        """Parse confirmation codes lazily
+
+        Args:
+            codes (iterable): confirmation codes, e.g. lines of a file
+
+        Yields:
+            Confirmation: Confirmation object for each valid code, bad codes are added to `errors`
+        """
+        for line_number, code in ConfirmationParser.numbered(codes):
+            parts = code.split("-")
+            if len(parts) != 4:
+                self._errors.append(ParseError(line_number, code, "Invalid confirmation code."))
+                continue
+            transaction_code, account_number, raw_dt_utc, transaction_id = parts
+            try:
+                time_utc, time = self.times(raw_dt_utc)
+            except ValueError as e:
+                self._errors.append(ParseError(line_number, code, str(e)))
+                continue
+            yield Confirmation(account_number, transaction_code, transaction_id, time_utc, time)
+    
+    def parse_file(self, path):
+        """Parse confirmation codes from a file, one per line
+
+        Args:
+            path (str): file path
+
+        Yields:
+            Confirmation: Confirmation object for each valid code
+        """
+        with open(path) as f:
+            yield from self.parse(f)
+    
+    def parse_columns(self, codes, chunk_size=65536):
+        """Parse confirmation codes into columnar chunks, converting datetimes in a vectorized way
+
+        Args:
+            codes (iterable): confirmation codes, e.g. lines of a file
+            chunk_size (int, optional): number of lines per chunk. Defaults to 65536.
+
+        Yields:
+            dict: numpy arrays `line_number`, `account_number`, `transaction_code`,
+                `transaction_id`, `time_utc` and `time` (datetime64 in preferred time zone)
+                for the valid codes of each chunk
+        """
+        numbered = ConfirmationParser.numbered(codes)
+        while True:
+            chunk = list(itertools.islice(numbered, chunk_size))
+            if not chunk:
+                return
+            yield self._parse_chunk(chunk)
+    
+    def _parse_chunk(self, chunk):
+        """
+
+        Args:
+            chunk (list): line numbers and confirmation codes
+
+        Returns:
+            dict: columns of valid codes
+        """
+        line_numbers = []
+        rows = []
+        errors = []
+        for line_number, code in chunk:
+            parts = code.split("-")
+            if len(parts) != 4:
+                errors.append(ParseError(line_number, code, "Invalid confirmation code."))
+                continue
+            line_numbers.append(line_number)
+            rows.append(parts)
+        
+        line_numbers = np.array(line_numbers, dtype=np.int64)
+        if rows:
+            transaction_codes, account_numbers, raw_dts, transaction_ids = (np.array(column) for column in zip(*rows))
+        else:
+            transaction_codes = account_numbers = raw_dts = transaction_ids = np.array([], dtype=str)
+        
+        time_utc, valid = ConfirmationParser._to_datetime64(raw_dts)
+        for i in np.flatnonzero(~valid):
+            code = "-".join(rows[i])
+            errors.append(ParseError(int(line_numbers[i]), code, "Invalid transaction datetime."))
+        self._errors.extend(sorted(errors, key=lambda error: error.line_number))
+        
+        return {
+            "line_number": line_numbers[valid],
+            "account_number": account_numbers[valid],
+            "transaction_code": transaction_codes[valid],
+            "transaction_id": transaction_ids[valid],
+            "time_utc": time_utc[valid],
+            "time": time_utc[valid] + self._offset_seconds,
+        }
+    
+    @staticmethod
+    def _to_datetime64(raw_dts):
+        """Convert fixed-width %Y%m%d%H%M%S strings to datetime64 in one pass
+
+        Args:
+            raw_dts (numpy.ndarray): datetime strings
+
+        Returns:
+            tuple: datetime64[s] array and mask of valid datetime strings
+        """
+        count = len(raw_dts)
+        width = ConfirmationParser._datetime_width
+        valid = np.char.str_len(raw_dts) == width if count else np.zeros(0, dtype=bool)
+        # fixed-width unicode strings viewed as one code point per column
+        fixed = np.where(valid, raw_dts, "0" * width).astype(f"U{width}")
+        digits = fixed.view(np.uint32).reshape(count, width).astype(np.int64) - ord("0")
+        valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        
+        def field(start, stop):
+            weights = 10 ** np.arange(stop - start - 1, -1, -1)
+            return digits[:, start:stop] @ weights
+        
+        year, month, day = field(0, 4), field(4, 6), field(6, 8)
+        hour, minute, second = field(8, 10), field(10, 12), field(12, 14)
+        valid &= (year >= 1) & (month >= 1) & (month <= 12) & (hour <= 23) & (minute <= 59) & (second <= 59)
+        
+        months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+        days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+        valid &= (day >= 1) & (day <= days_in_month)
+        
+        seconds = np.where(valid, (day - 1) * 86400 + hour * 3600 + minute * 60 + second, 0)
+        time_utc = months.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+        return time_utc, valid
@@ -0,0 +1,337 @@
+"""Confirmation code generation"""
+
+import os
+import time
+import bisect
+import struct
+import threading
+import itertools
+import collections
+import multiprocessing
+import weakref
+from collections.abc import Sequence
+
+try:
+    import fcntl
+except ImportError:  # only needed by FileLockAllocator, not available on Windows
+    fcntl = None
+
+
+class TransactionIdAllocator:
+    """Base class for allocators handing out blocks of unique transaction ids"""
+    
+    def reserve(self, count):
+        """Reserve count consecutive transaction ids, implemented specifically in each subclass
+
+        Args:
+            count (int): number of ids
+
+        Returns:
+            range: reserved ids
+        """
+        raise NotImplementedError
+
+
+class CounterAllocator(TransactionIdAllocator):
+    """Allocator over an in-process counter, unique within one process only"""
+    
+    def __init__(self, counter=None):
+        """
+
+        Args:
+            counter (itertools.count, optional): shared counter. Defaults to None for a new one from 0.
+        """
+        self._counter = itertools.count(0) if counter is None else counter
+        self._lock = threading.Lock()
+    
+    def reserve(self, count):
+        """
+
+        Args:
+            count (int): number of ids
+
+        Returns:
+            range: reserved ids
+        """
+        with self._lock:
+            start = next(self._counter)
+            # advance the counter past the rest of the block
+            collections.deque(itertools.islice(self._counter, count - 1), maxlen=0)
+        return range(start, start + count)
+
+
+class SharedMemoryAllocator(TransactionIdAllocator):
+    """Allocator over a counter in shared memory, unique across processes sharing this object
+
+    Create it before starting the worker processes and pass it to them, e.g. as Process
+    arguments or a pool initializer argument.
+    """
+    
+    def __init__(self, start=0):
+        """
+
+        Args:
+            start (int, optional): first transaction id. Defaults to 0.
+        """
+        self._value = multiprocessing.Value("q", start)
+    
+    def reserve(self, count):
+        """
+
+        Args:
+            count (int): number of ids
+
+        Returns:
+            range: reserved ids
+        """
+        with self._value.get_lock():
+            start = self._value.value
+            self._value.value = start + count
+        return range(start, start + count)
+
+
+class FileLockAllocator(TransactionIdAllocator):
+    """Allocator over a counter stored in a locked local file, unique across unrelated processes"""
+    
+    _format = struct.Struct("<q")
+    
+    def __init__(self, path, start=0):
+        """
+
+        Args:
+            path (str): counter file path, created if missing
+            start (int, optional): first transaction id if file is new. Defaults to 0.
+
+        Raises:
+            ImportError: fcntl is not available
+        """
+        if fcntl is None:
+            raise ImportError("FileLockAllocator requires fcntl.")
+        self._path = path
+        self._start = start
+    
+    def reserve(self, count):
+        """
+
+        Args:
+            count (int): number of ids
+
+        Returns:
+            range: reserved ids
+        """
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, FileLockAllocator._format.size, 0)
+            if len(data) == FileLockAllocator._format.size:
+                start = FileLockAllocator._format.unpack(data)[0]
+            else:
+                start = self._start
+            os.pwrite(fd, FileLockAllocator._format.pack(start + count), 0)
+        finally:
+            # closing releases the lock
+            os.close(fd)
+        return range(start, start + count)
+
+
+class ReservedConfirmationCodes(Sequence):
+    """Confirmation codes with reserved transaction ids, formatted only when accessed
+
+    Codes run through all periods of the first account, then the next account, etc.
+    """
+    
+    def __init__(self, transaction_code, account_numbers, periods, dt_str, id_ranges):
+        """
+
+        Args:
+            transaction_code (str): transaction code
+            account_numbers (sequence): account numbers
+            periods (int): number of codes per account
+            dt_str (str): timestamp as %Y%m%d%H%M%S
+            id_ranges (list): ranges of reserved transaction ids, in order
+        """
+        self._transaction_code = transaction_code
+        self._account_numbers = account_numbers
+        self._periods = periods
+        self._dt_str = dt_str
+        self._id_ranges = id_ranges
+        self._range_starts = list(itertools.accumulate((len(r) for r in id_ranges), initial=0))
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of codes
+        """
+        return len(self._account_numbers) * self._periods
+    
+    def __getitem__(self, index):
+        """
+
+        Args:
+            index (int or slice): position of code
+
+        Raises:
+            IndexError: index is out of range
+
+        Returns:
+            str or list: confirmation code, or list of codes for a slice
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Confirmation code index out of range.")
+        which = bisect.bisect_right(self._range_starts, index) - 1
+        transaction_id = self._id_ranges[which][index - self._range_starts[which]]
+        account_number = self._account_numbers[index // self._periods]
+        return f"{self._transaction_code}-{account_number}-{self._dt_str}-{transaction_id}"
+    
+    def __iter__(self):
+        """
+
+        Yields:
+            str: confirmation codes, in order
+        """
+        ids = itertools.chain.from_iterable(self._id_ranges)
+        for account_number in self._account_numbers:
+            prefix = f"{self._transaction_code}-{account_number}-{self._dt_str}-"
+            for transaction_id in itertools.islice(ids, self._periods):
+                yield f"{prefix}{transaction_id}"
+
+
+class ConfirmationCodeGenerator:
+    """Generator of confirmation codes with a cached timestamp and block-reserved transaction ids"""
+    
+    _instances = weakref.WeakSet()
+    
+    def __init__(self, allocator=None, block_size=1024):
+        """
+
+        Args:
+            allocator (TransactionIdAllocator, optional): source of transaction ids. Defaults to None
+                for a new CounterAllocator.
+            block_size (int, optional): number of ids reserved from allocator at a time. Defaults to 1024.
+
+        Raises:
+            ValueError: allocator is not a TransactionIdAllocator object
+            ValueError: block size is not a positive integer
+        """
+        if allocator is None:
+            allocator = CounterAllocator()
+        if not isinstance(allocator, TransactionIdAllocator):
+            raise ValueError("Allocator must be a valid TransactionIdAllocator object.")
+        if not isinstance(block_size, int) or block_size < 1:
+            raise ValueError("Block size must be a positive integer.")
+        self._allocator = allocator
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._stop = 0
+        self._timestamp = (None, None)
+        ConfirmationCodeGenerator._instances.add(self)
+    
+    @property
+    def allocator(self):
+        """
+
+        Returns:
+            TransactionIdAllocator: source of transaction ids
+        """
+        return self._allocator
+    
+    @property
+    def block_size(self):
+        """
+
+        Returns:
+            int: number of ids reserved from allocator at a time
+        """
+        return self._block_size
+    
+    def timestamp(self):
+        """Current UTC time, formatted only once per second
+
+        Returns:
+            str: timestamp as %Y%m%d%H%M%S
+        """
+        second = int(time.time())
+        cached_second, dt_str = self._timestamp
+        if second != cached_second:
+            dt_str = time.strftime("%Y%m%d%H%M%S", time.gmtime(second))
+            self._timestamp = (second, dt_str)
+        return dt_str
+    
+    def reserve_transaction_ids(self, count):
+        """Take count transaction ids, from the current block first
+
+        Args:
+            count (int): number of ids
+
+        Returns:
+            list: ranges of ids, in order
+        """
+        ranges = []
+        with self._lock:
+            taken = min(count, self._stop - self._next_id)
+            if taken > 0:
+                ranges.append(range(self._next_id, self._next_id + taken))
+                self._next_id += taken
+                count -= taken
+            if count > 0:
+                block = self._allocator.reserve(max(count, self._block_size))
+                ranges.append(range(block.start, block.start + count))
+                self._next_id = block.start + count
+                self._stop = block.stop
+        return ranges
+    
+    def reserve_codes(self, transaction_code, account_numbers, periods):
+        """Reserve transaction ids for periods codes per account, formatting codes lazily
+
+        Args:
+            transaction_code (str): transaction code
+            account_numbers (sequence): account numbers
+            periods (int): number of codes per account
+
+        Returns:
+            ReservedConfirmationCodes: confirmation codes
+        """
+        dt_str = self.timestamp()
+        id_ranges = self.reserve_transaction_ids(len(account_numbers) * periods)
+        return ReservedConfirmationCodes(transaction_code, account_numbers, periods, dt_str, id_ranges)
+    
+    def generate(self, transaction_code, account_number):
+        """
+
+        Args:
+            transaction_code (str): transaction code
+            account_number (type): account number
+
+        Returns:
+            str: confirmation code
+        """
+        dt_str = self.timestamp()
+        with self._lock:
+            if self._next_id == self._stop:
+                block = self._allocator.reserve(self._block_size)
+                self._next_id = block.start
+                self._stop = block.stop
+            transaction_id = self._next_id
+            self._next_id += 1
+        return f"{transaction_code}-{account_number}-{dt_str}-{transaction_id}"
+    
+    def _discard_block(self):
+        """Drop the current block so that a forked child does not reuse the parent's ids"""
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._stop = 0
+
+
+def _discard_blocks_after_fork():
+    """Drop current blocks of all generators in a forked child"""
+    for generator in ConfirmationCodeGenerator._instances:
+        generator._discard_block()
+
+
+os.register_at_fork(after_in_child=_discard_blocks_after_fork)
@@ -0,0 +1,187 @@
+"""Indexed transaction history"""
+
+import bisect
+from datetime import datetime, timezone
+
+from account import TimeZone, Account, Confirmation
+from confirmation import ConfirmationParser
+
+
+class _TimeIndex:
+    """Confirmations kept sorted by UTC time, searched by binary search"""
+    
+    __slots__ = ("times", "confirmations")
+    
+    def __init__(self):
+        """Create an empty index"""
+        self.times = []
+        self.confirmations = []
+    
+    def insert(self, confirmation):
+        """Append in O(1) when in time order, insert by binary search otherwise
+
+        Args:
+            confirmation (Confirmation): confirmation
+        """
+        time_utc = confirmation.time_utc
+        if not self.times or self.times[-1] <= time_utc:
+            self.times.append(time_utc)
+            self.confirmations.append(confirmation)
+        else:
+            position = bisect.bisect_right(self.times, time_utc)
+            self.times.insert(position, time_utc)
+            self.confirmations.insert(position, confirmation)
+    
+    def between(self, start, end):
+        """
+
+        Args:
+            start (str or None): inclusive lower bound in ISO format
+            end (str or None): exclusive upper bound in ISO format
+
+        Returns:
+            list: confirmations in time order
+        """
+        lo = 0 if start is None else bisect.bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect.bisect_left(self.times, end)
+        return self.confirmations[lo:hi]
+
+
+class TransactionHistory:
+    """Store of Confirmation objects indexed by account number and by transaction code"""
+    
+    def __init__(self, preferred_time_zone=None):
+        """
+
+        Args:
+            preferred_time_zone (TimeZone, optional): preferred time zone of stored confirmations.
+                Defaults to None.
+
+        Raises:
+            ValueError: preferred time zone is not a TimeZone object
+        """
+        if preferred_time_zone is None:
+            preferred_time_zone = TimeZone("UTC", 0, 0)
+        if not isinstance(preferred_time_zone, TimeZone):
+            raise ValueError("Invalid TimeZone specified.")
+        self._time_zone = preferred_time_zone
+        self._count = 0
+        self._by_account = {}
+        self._by_transaction_code = {}
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of stored confirmations
+        """
+        return self._count
+    
+    def add_confirmation(self, confirmation):
+        """
+
+        Args:
+            confirmation (Confirmation): confirmation
+
+        Raises:
+            ValueError: confirmation is not a Confirmation object
+        """
+        if not isinstance(confirmation, Confirmation):
+            raise ValueError("Confirmation must be a valid Confirmation object.")
+        self._by_account.setdefault(confirmation.account_number, _TimeIndex()).insert(confirmation)
+        self._by_transaction_code.setdefault(confirmation.transaction_code, _TimeIndex()).insert(confirmation)
+        self._count += 1
+    
+    def add(self, confirmation_code):
+        """Add a transaction, e.g. with the code returned by `Account.deposit`
+
+        Args:
+            confirmation_code (str): confirmation code
+
+        Raises:
+            ValueError: confirmation code is invalid
+
+        Returns:
+            Confirmation: Confirmation object
+        """
+        confirmation = Account.parse_confirmation_code(confirmation_code, self._time_zone)
+        self.add_confirmation(confirmation)
+        return confirmation
+    
+    def extend(self, confirmation_codes):
+        """Add many transactions, skipping bad codes
+
+        Args:
+            confirmation_codes (iterable): confirmation codes, e.g. lines of a file
+
+        Returns:
+            list: ParseError for each bad code
+        """
+        parser = ConfirmationParser(self._time_zone)
+        for confirmation in parser.parse(confirmation_codes):
+            self.add_confirmation(confirmation)
+        return parser.errors
+    
+    @staticmethod
+    def _bound(value):
+        """
+
+        Args:
+            value (datetime or str or None): time bound, in UTC unless it has a UTC offset
+
+        Raises:
+            ValueError: bound is not a datetime object or an ISO string
+
+        Returns:
+            str or None: bound in the ISO format of Confirmation.time_utc
+        """
+        if value is None:
+            return value
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                return value  # compared as a prefix, e.g. "2019-03"
+            if parsed.tzinfo is None:
+                return value
+            value = parsed
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                # Confirmation.time_utc is naive UTC
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            return value.isoformat()
+        raise ValueError("Time bound must be a datetime object or an ISO format string.")
+    
+    def query(self, account_number=None, transaction_code=None, start=None, end=None):
+        """Find transactions by account, transaction code and UTC time range
+
+        Args:
+            account_number (str, optional): account number. Defaults to None for all accounts.
+            transaction_code (str, optional): transaction code, e.g. "X" for rejected.
+                Defaults to None for all codes.
+            start (datetime or str, optional): inclusive lower bound of UTC time, converted to UTC if it
+                has a UTC offset. Defaults to None.
+            end (datetime or str, optional): exclusive upper bound of UTC time, converted to UTC if it
+                has a UTC offset. Defaults to None.
+
+        Returns:
+            list: Confirmation objects in time order
+        """
+        start, end = TransactionHistory._bound(start), TransactionHistory._bound(end)
+        if account_number is not None:
+            index = self._by_account.get(account_number)
+            if index is None:
+                return []
+            confirmations = index.between(start, end)
+            if transaction_code is not None:
+                confirmations = [c for c in confirmations if c.transaction_code == transaction_code]
+            return confirmations
+        if transaction_code is not None:
+            index = self._by_transaction_code.get(transaction_code)
+            return [] if index is None else index.between(start, end)
+        
+        confirmations = []
+        for index in self._by_transaction_code.values():
+            confirmations.extend(index.between(start, end))
+        confirmations.sort(key=lambda c: c.time_utc)
+        return confirmations
@@ -0,0 +1,359 @@
+"""Append-only transaction journal"""
+
+import os
+import mmap
+import time
+import struct
+import threading
+
+import numpy as np
+
+from account import Account
+
+
+class TransactionJournal:
+    """Memory-mapped journal of fixed-size transaction records with group commit
+
+    The file starts with a header holding the number of committed records. Records appended
+    after the last commit are not durable and are overwritten when the journal is reopened.
+    """
+    
+    _magic = b"TXJ1"
+    _header = struct.Struct("<4sq")
+    _record = struct.Struct("<c31sddqq")
+    record_dtype = np.dtype([
+        ("transaction_code", "S1"),
+        ("account_number", "S31"),
+        ("amount", "<f8"),
+        ("balance", "<f8"),
+        ("transaction_id", "<i8"),
+        ("timestamp", "<i8"),
+    ])
+    opening_code = "O"
+    
+    def __init__(self, path, group_size=256, commit_interval=0.05, capacity=65536):
+        """Open or create a journal
+
+        Args:
+            path (str): journal file path
+            group_size (int, optional): commit after this many appends. Defaults to 256.
+            commit_interval (real, optional): commit on append when this many seconds passed
+                since last commit. Defaults to 0.05.
+            capacity (int, optional): number of records preallocated for a new file. Defaults to 65536.
+
+        Raises:
+            ValueError: file is not a transaction journal
+        """
+        self._path = path
+        self._group_size = group_size
+        self._commit_interval = commit_interval
+        self._lock = threading.Lock()
+        
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size == 0:
+            os.ftruncate(self._fd, TransactionJournal._offset(capacity))
+            self._mm = mmap.mmap(self._fd, 0)
+            TransactionJournal._header.pack_into(self._mm, 0, TransactionJournal._magic, 0)
+            self._mm.flush()
+        else:
+            self._mm = mmap.mmap(self._fd, 0)
+        magic, committed = TransactionJournal._header.unpack_from(self._mm, 0)
+        if magic != TransactionJournal._magic:
+            self._mm.close()
+            os.close(self._fd)
+            raise ValueError(f"{path} is not a transaction journal.")
+        self._count = committed
+        self._committed = committed
+        self._last_commit = time.monotonic()
+    
+    @staticmethod
+    def _offset(index):
+        """
+
+        Args:
+            index (int): record index
+
+        Returns:
+            int: byte offset of record, the header taking one record slot
+        """
+        return (index + 1) * TransactionJournal._record.size
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of appended records, committed or not
+        """
+        return self._count
+    
+    @property
+    def committed(self):
+        """
+
+        Returns:
+            int: number of committed records
+        """
+        return self._committed
+    
+    def append(self, transaction_code, account_number, amount, balance, confirmation_code=None):
+        """Append a record, committing the group when full or due
+
+        Args:
+            transaction_code (str): transaction code
+            account_number (type): account number, at most 31 bytes once encoded
+            amount (real): transaction amount
+            balance (real): balance after transaction
+            confirmation_code (str, optional): confirmation code to take transaction id and timestamp
+                from. Defaults to None for -1 and 0.
+
+        Raises:
+            ValueError: account number is too long
+        """
+        account_bytes = str(account_number).encode()
+        if len(account_bytes) > 31:
+            raise ValueError("Account number must be at most 31 bytes.")
+        transaction_id, timestamp = -1, 0
+        if confirmation_code is not None:
+            # account numbers may contain "-", transaction id and timestamp are the last two parts
+            _, raw_dt_utc, raw_transaction_id = confirmation_code.rsplit("-", 2)
+            transaction_id, timestamp = int(raw_transaction_id), int(raw_dt_utc)
+        
+        with self._lock:
+            if TransactionJournal._offset(self._count + 1) > len(self._mm):
+                self._grow()
+            TransactionJournal._record.pack_into(
+                self._mm, TransactionJournal._offset(self._count),
+                transaction_code.encode(), account_bytes, amount, balance, transaction_id, timestamp
+            )
+            self._count += 1
+            if (self._count - self._committed >= self._group_size
+                    or time.monotonic() - self._last_commit >= self._commit_interval):
+                self._commit()
+    
+    def _grow(self):
+        """Double file size and remap, committing first"""
+        self._commit()
+        size = 2 * len(self._mm)
+        self._mm.close()
+        os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, 0)
+    
+    def commit(self):
+        """Make all appended records durable"""
+        with self._lock:
+            self._commit()
+    
+    def _commit(self):
+        """Flush records, then publish their count in the header"""
+        if self._count != self._committed:
+            # flush only the pages holding the new group
+            start = TransactionJournal._offset(self._committed) // mmap.PAGESIZE * mmap.PAGESIZE
+            self._mm.flush(start, TransactionJournal._offset(self._count) - start)
+            TransactionJournal._header.pack_into(self._mm, 0, TransactionJournal._magic, self._count)
+            self._mm.flush(0, TransactionJournal._header.size)
+            self._committed = self._count
+        self._last_commit = time.monotonic()
+    
+    def close(self):
+        """Commit and close the journal"""
+        with self._lock:
+            if self._mm.closed:
+                return
+            self._commit()
+            self._mm.close()
+            os.close(self._fd)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+    
+    @classmethod
+    def read(cls, path):
+        """Read committed records
+
+        Args:
+            path (str): journal file path
+
+        Raises:
+            ValueError: file is not a transaction journal
+
+        Returns:
+            numpy.memmap: records as a structured array, see `record_dtype`
+        """
+        with open(path, "rb") as f:
+            magic, committed = cls._header.unpack(f.read(cls._header.size))
+        if magic != cls._magic:
+            raise ValueError(f"{path} is not a transaction journal.")
+        if committed == 0:
+            return np.zeros(0, dtype=cls.record_dtype)
+        return np.memmap(path, dtype=cls.record_dtype, mode="r", offset=cls._offset(0), shape=(committed,))
+    
+    @classmethod
+    def replay(cls, path, snapshot_path=None, snapshot_every=1000000):
+        """Rebuild balances in one streaming pass, starting from the latest snapshot
+
+        Args:
+            path (str): journal file path
+            snapshot_path (str, optional): snapshot file path. Defaults to None for path + ".snapshot.npz".
+            snapshot_every (int, optional): number of records between snapshots. Defaults to 1000000.
+
+        Returns:
+            dict: balance of each account number, as str
+        """
+        if snapshot_path is None:
+            snapshot_path = f"{path}.snapshot.npz"
+        records = cls.read(path)
+        
+        start, balances = 0, {}
+        if os.path.exists(snapshot_path):
+            with np.load(snapshot_path) as snapshot:
+                start = int(snapshot["record_count"])
+                balances = dict(zip(snapshot["account_numbers"].tolist(), snapshot["balances"].tolist()))
+            if start > len(records):
+                # snapshot from a different journal
+                start, balances = 0, {}
+        
+        for chunk_start in range(start, len(records), snapshot_every):
+            chunk = records[chunk_start:chunk_start + snapshot_every]
+            # balance after the last record of each account in the chunk
+            account_numbers, last = np.unique(chunk["account_number"][::-1], return_index=True)
+            last = len(chunk) - 1 - last
+            balances.update(zip(account_numbers.tolist(), chunk["balance"][last].tolist()))
+            if len(chunk) == snapshot_every:
+                cls._write_snapshot(snapshot_path, chunk_start + len(chunk), balances)
+        
+        return {account_number.decode(): balance for account_number, balance in balances.items()}
+    
+    @staticmethod
+    def _write_snapshot(path, record_count, balances):
+        """Write snapshot atomically
+
+        Args:
+            path (str): snapshot file path
+            record_count (int): number of records covered by the snapshot
+            balances (dict): balance of each encoded account number
+        """
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            record_count=record_count,
+            account_numbers=np.array(list(balances), dtype="S31"),
+            balances=np.array(list(balances.values()), dtype=np.float64),
+        )
+        os.replace(tmp_path, path)
+
+
+class JournaledAccount(Account):
+    """Account appending its opening balance and every transaction to a journal"""
+    
+    __slots__ = ()
+    
+    journal = None
+    
+    def __init__(self, account_number, first_name, last_name, timezone=None, initial_balance=0):
+        """
+
+        Args:
+            account_number (type): account number
+            first_name (str): first name
+            last_name (str): last name
+            timezone (TimeZone, optional): preferred time zone. Defaults to None.
+            initial_balance (int, optional): initial balance. Defaults to 0.
+        """
+        super().__init__(account_number, first_name, last_name, timezone, initial_balance)
+        self._journal().append(TransactionJournal.opening_code, self.account_number, self.balance, self.balance)
+    
+    @classmethod
+    def _journal(cls):
+        """
+
+        Raises:
+            ValueError: journal is not a TransactionJournal object
+
+        Returns:
+            TransactionJournal: journal
+        """
+        if not isinstance(cls.journal, TransactionJournal):
+            raise ValueError("Journal must be a valid TransactionJournal object.")
+        return cls.journal
+    
+    def deposit(self, value):
+        """
+
+        Args:
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        journal = self._journal()
+        conf_code = super().deposit(value)
+        journal.append(conf_code[0], self.account_number, value, self.balance, conf_code)
+        return conf_code
+    
+    def deposit_many(self, values):
+        """
+
+        Args:
+            values (iterable): values
+
+        Returns:
+            list: confirmation codes, one per value
+        """
+        journal = self._journal()
+        values = list(values)
+        balance = self.balance
+        conf_codes = super().deposit_many(values)
+        for i, (value, conf_code) in enumerate(zip(values, conf_codes), 1):
+            # the last record carries the exact balance for replay
+            balance = self.balance if i == len(values) else balance + value
+            journal.append(conf_code[0], self.account_number, value, balance, conf_code)
+        return conf_codes
+    
+    def withdraw(self, value):
+        """
+
+        Args:
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        journal = self._journal()
+        conf_code = super().withdraw(value)
+        journal.append(conf_code[0], self.account_number, value, self.balance, conf_code)
+        return conf_code
+    
+    def pay_interest(self):
+        """
+
+        Returns:
+            str: confirmation code
+        """
+        journal = self._journal()
+        balance = self.balance
+        conf_code = super().pay_interest()
+        journal.append(conf_code[0], self.account_number, self.balance - balance, self.balance, conf_code)
+        return conf_code
+    
+    def accrue_interest(self, periods, rate_schedule=None):
+        """
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Returns:
+            ReservedConfirmationCodes: one confirmation code per period, formatted only when accessed
+        """
+        journal = self._journal()
+        balance = self.balance
+        conf_codes = super().accrue_interest(periods, rate_schedule)
+        if conf_codes:
+            # one record for all periods, with the last code, carrying the compounded balance
+            conf_code = conf_codes[-1]
+            journal.append(conf_code[0], self.account_number, self.balance - balance, self.balance, conf_code)
+        return conf_codes
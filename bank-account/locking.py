@@ -0,0 +1,180 @@
+"""Thread-safe accounts"""
+
+import threading
+
+from account import Account
+
+
+class LockStripes:
+    """Fixed pool of locks shared by many accounts, one stripe per hash bucket of account number"""
+    
+    def __init__(self, count=256):
+        """
+
+        Args:
+            count (int, optional): number of locks. Defaults to 256.
+
+        Raises:
+            ValueError: count is not a positive integer
+        """
+        if not isinstance(count, int) or count < 1:
+            raise ValueError("Number of lock stripes must be a positive integer.")
+        self._locks = tuple(threading.Lock() for _ in range(count))
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of locks
+        """
+        return len(self._locks)
+    
+    def stripe(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            int: index of the lock guarding the account
+        """
+        return hash(account_number) % len(self._locks)
+    
+    def lock(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            threading.Lock: lock guarding the account
+        """
+        return self._locks[self.stripe(account_number)]
+    
+    def ordered_locks(self, *account_numbers):
+        """Locks guarding the accounts, each once, in stripe order to avoid deadlock
+
+        Args:
+            account_numbers (type): account numbers
+
+        Returns:
+            list: locks to acquire in order
+        """
+        stripes = sorted({self.stripe(account_number) for account_number in account_numbers})
+        return [self._locks[stripe] for stripe in stripes]
+
+
+class ThreadSafeAccount(Account):
+    """Account whose balance changes are serialized by a striped lock"""
+    
+    __slots__ = ()
+    
+    lock_stripes = LockStripes()
+    
+    @property
+    def lock(self):
+        """
+
+        Returns:
+            threading.Lock: lock guarding the account
+        """
+        return type(self).lock_stripes.lock(self.account_number)
+    
+    def deposit(self, value):
+        """
+
+        Args:
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        with self.lock:
+            return super().deposit(value)
+    
+    def deposit_many(self, values):
+        """
+
+        Args:
+            values (iterable): values
+
+        Returns:
+            list: confirmation codes, one per value
+        """
+        with self.lock:
+            return super().deposit_many(values)
+    
+    def withdraw(self, value):
+        """
+
+        Args:
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        with self.lock:
+            return super().withdraw(value)
+    
+    def pay_interest(self):
+        """
+
+        Returns:
+            str: confirmation code
+        """
+        with self.lock:
+            return super().pay_interest()
+    
+    def accrue_interest(self, periods, rate_schedule=None):
+        """
+
+        Args:
+            periods (int): number of compounding periods, non-negative
+            rate_schedule (list, optional): (period_count, rate) segments covering all periods.
+                Defaults to None for current interest rate in every period.
+
+        Returns:
+            ReservedConfirmationCodes: one confirmation code per period, formatted only when accessed
+        """
+        with self.lock:
+            return super().accrue_interest(periods, rate_schedule)
+
+
+def transfer(src, dst, amount):
+    """Withdraw amount from src and deposit it into dst atomically
+
+    Args:
+        src (ThreadSafeAccount): account to withdraw from
+        dst (ThreadSafeAccount): account to deposit into
+        amount (type): amount
+
+    Raises:
+        ValueError: src or dst is not a ThreadSafeAccount object
+        ValueError: src and dst do not share lock stripes
+        ValueError: src and dst are the same account
+        ValueError: amount is not a real number no less than 0.01
+
+    Returns:
+        tuple: withdraw confirmation code, and deposit confirmation code or None if rejected
+    """
+    if not isinstance(src, ThreadSafeAccount) or not isinstance(dst, ThreadSafeAccount):
+        raise ValueError("Transfer accounts must be valid ThreadSafeAccount objects.")
+    stripes = type(src).lock_stripes
+    if type(dst).lock_stripes is not stripes:
+        raise ValueError("Transfer accounts must share lock stripes.")
+    if src is dst or src.account_number == dst.account_number:
+        raise ValueError("Cannot transfer to the same account.")
+    amount = Account.validate_real_number(amount, min_value=0.01)
+    
+    locks = stripes.ordered_locks(src.account_number, dst.account_number)
+    for lock in locks:
+        lock.acquire()
+    try:
+        # locks are held, call the unsynchronized implementations
+        withdraw_code = Account.withdraw(src, amount)
+        if withdraw_code.startswith(Account._transaction_codes["rejected"]):
+            return withdraw_code, None
+        return withdraw_code, Account.deposit(dst, amount)
+    finally:
+        for lock in reversed(locks):
+            lock.release()
@@ -0,0 +1,326 @@
+"""Account registry with indexed lookups"""
+
+import bisect
+
+from account import Account
+
+
+class _NameIndex:
+    """Accounts kept sorted by case-folded name, searched by binary search
+
+    Entries are split into chunks of about `load` entries, so an insertion or removal shifts
+    one chunk instead of the whole index.
+    """
+    
+    __slots__ = ("keys", "accounts", "maxes")
+    
+    load = 1000
+    
+    def __init__(self):
+        """Create an empty index"""
+        self.keys = []
+        self.accounts = []
+        self.maxes = []
+    
+    @staticmethod
+    def key(name):
+        """
+
+        Args:
+            name (type): name
+
+        Returns:
+            str: case-insensitive sort key
+        """
+        return str(name).casefold()
+    
+    def insert(self, name, account):
+        """
+
+        Args:
+            name (type): name
+            account (Account): account
+        """
+        key = _NameIndex.key(name)
+        if not self.maxes:
+            self.keys.append([key])
+            self.accounts.append([account])
+            self.maxes.append(key)
+            return
+        chunk = min(bisect.bisect_right(self.maxes, key), len(self.maxes) - 1)
+        keys, accounts = self.keys[chunk], self.accounts[chunk]
+        position = bisect.bisect_right(keys, key)
+        keys.insert(position, key)
+        accounts.insert(position, account)
+        self.maxes[chunk] = keys[-1]
+        if len(keys) > 2 * _NameIndex.load:
+            half = len(keys) // 2
+            self.keys[chunk:chunk + 1] = [keys[:half], keys[half:]]
+            self.accounts[chunk:chunk + 1] = [accounts[:half], accounts[half:]]
+            self.maxes[chunk:chunk + 1] = [keys[half - 1], keys[-1]]
+    
+    def extend(self, names, accounts):
+        """Add many accounts with one sort instead of one insertion each
+
+        Args:
+            names (iterable): names
+            accounts (iterable): accounts
+        """
+        keys = [key for chunk in self.keys for key in chunk] + [_NameIndex.key(name) for name in names]
+        accounts = [account for chunk in self.accounts for account in chunk] + list(accounts)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        keys = [keys[i] for i in order]
+        accounts = [accounts[i] for i in order]
+        load = _NameIndex.load
+        self.keys = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self.accounts = [accounts[i:i + load] for i in range(0, len(accounts), load)]
+        self.maxes = [chunk[-1] for chunk in self.keys]
+    
+    def remove(self, name, account):
+        """
+
+        Args:
+            name (type): name the account was indexed with
+            account (Account): account
+        """
+        key = _NameIndex.key(name)
+        chunk = bisect.bisect_left(self.maxes, key)
+        position = bisect.bisect_left(self.keys[chunk], key)
+        while self.accounts[chunk][position] is not account:
+            position += 1
+            if position == len(self.accounts[chunk]):
+                chunk, position = chunk + 1, 0
+        keys, accounts = self.keys[chunk], self.accounts[chunk]
+        del keys[position]
+        del accounts[position]
+        if keys:
+            self.maxes[chunk] = keys[-1]
+        else:
+            del self.keys[chunk]
+            del self.accounts[chunk]
+            del self.maxes[chunk]
+    
+    def between(self, lo, hi):
+        """
+
+        Args:
+            lo (str): inclusive lower bound of keys
+            hi (str): exclusive upper bound of keys
+
+        Returns:
+            list: accounts in key order
+        """
+        found = []
+        chunk = bisect.bisect_left(self.maxes, lo)
+        start = bisect.bisect_left(self.keys[chunk], lo) if chunk < len(self.maxes) else 0
+        while chunk < len(self.maxes):
+            keys = self.keys[chunk]
+            stop = bisect.bisect_left(keys, hi, start)
+            found.extend(self.accounts[chunk][start:stop])
+            if stop < len(keys):
+                break
+            chunk, start = chunk + 1, 0
+        return found
+    
+    def prefixed(self, prefix):
+        """
+
+        Args:
+            prefix (str): case-insensitive name prefix
+
+        Returns:
+            list: accounts with names starting with prefix, in name order
+        """
+        prefix = _NameIndex.key(prefix)
+        if not prefix:
+            return [account for chunk in self.accounts for account in chunk]
+        # first key past every key starting with prefix
+        return self.between(prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    
+    def equal(self, name):
+        """
+
+        Args:
+            name (str): case-insensitive name
+
+        Returns:
+            list: accounts with the name
+        """
+        key = _NameIndex.key(name)
+        return self.between(key, key + "\0")
+
+
+class AccountRegistry:
+    """Store of Account objects indexed by account number and by first and last name
+
+    Account numbers are looked up in a dict. Names are kept in sorted lists of case-folded keys for
+    prefix and case-insensitive searches. Registries observe the
+    `Account.first_name` and `Account.last_name` setters of their accounts, so renamed accounts are
+    reindexed immediately.
+    """
+    
+    _name_properties = ("_first_name", "_last_name")
+    
+    def __init__(self, accounts=()):
+        """
+
+        Args:
+            accounts (iterable, optional): Account objects to register. Defaults to ().
+        """
+        self._accounts = {}
+        self._name_indexes = {name: _NameIndex() for name in AccountRegistry._name_properties}
+        self.extend(accounts)
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of registered accounts
+        """
+        return len(self._accounts)
+    
+    def __contains__(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            bool: account number is registered
+        """
+        return account_number in self._accounts
+    
+    def _validate(self, account):
+        """
+
+        Args:
+            account (Account): account
+
+        Raises:
+            ValueError: account is not an Account object
+            ValueError: account number is already registered
+        """
+        if not isinstance(account, Account):
+            raise ValueError("Account must be a valid Account object.")
+        if account.account_number in self._accounts:
+            raise ValueError(f"Account number {account.account_number} already exists.")
+    
+    def add(self, account):
+        """
+
+        Args:
+            account (Account): account to register
+        """
+        self._validate(account)
+        self._accounts[account.account_number] = account
+        for name, index in self._name_indexes.items():
+            index.insert(getattr(account, name), account)
+        account.add_name_observer(self)
+    
+    def extend(self, accounts):
+        """Register many accounts, sorting each name index once
+
+        Args:
+            accounts (iterable): Account objects to register
+
+        Raises:
+            ValueError: account is not an Account object
+            ValueError: account number is already registered, nothing is registered
+        """
+        accounts = list(accounts)
+        added = {}
+        for account in accounts:
+            self._validate(account)
+            if account.account_number in added:
+                raise ValueError(f"Account number {account.account_number} already exists.")
+            added[account.account_number] = account
+        self._accounts.update(added)
+        for name, index in self._name_indexes.items():
+            index.extend([getattr(account, name) for account in accounts], accounts)
+        for account in accounts:
+            account.add_name_observer(self)
+    
+    def remove(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            Account: removed account
+        """
+        account = self.get(account_number)
+        del self._accounts[account_number]
+        for name, index in self._name_indexes.items():
+            index.remove(getattr(account, name), account)
+        account.remove_name_observer(self)
+        return account
+    
+    def get(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is not registered
+
+        Returns:
+            Account: account
+        """
+        try:
+            return self._accounts[account_number]
+        except KeyError:
+            raise ValueError(f"Unknown account number {account_number}.") from None
+    
+    def rename(self, account, property_name, old_value):
+        """Reindex a registered account after a name change, called by the Account name setters
+
+        Args:
+            account (Account): account
+            property_name (str): "_first_name" or "_last_name"
+            old_value (type): name before the change
+        """
+        index = self._name_indexes.get(property_name)
+        if index is None or self._accounts.get(account.account_number) is not account:
+            return
+        index.remove(old_value, account)
+        index.insert(getattr(account, property_name), account)
+    
+    def find_by_last_name(self, prefix):
+        """Case-insensitive prefix search on last names
+
+        Args:
+            prefix (str): last name prefix, "" for all
+
+        Returns:
+            list: accounts in last name order
+        """
+        return self._name_indexes["_last_name"].prefixed(prefix)
+    
+    def find_by_first_name(self, prefix):
+        """Case-insensitive prefix search on first names
+
+        Args:
+            prefix (str): first name prefix, "" for all
+
+        Returns:
+            list: accounts in first name order
+        """
+        return self._name_indexes["_first_name"].prefixed(prefix)
+    
+    def find_by_name(self, first_name, last_name):
+        """Case-insensitive exact search on full names
+
+        Args:
+            first_name (str): first name
+            last_name (str): last name
+
+        Returns:
+            list: accounts with both names
+        """
+        first_name = _NameIndex.key(first_name)
+        return [
+            account for account in self._name_indexes["_last_name"].equal(last_name)
+            if _NameIndex.key(account.first_name) == first_name
+        ]
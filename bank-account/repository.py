@@ -0,0 +1,234 @@
+"""SQLite persistence for accounts and transactions"""
+
+import sqlite3
+
+from account import TimeZone, Account
+from book import AccountBook
+
+
+class AccountRepository:
+    """Repository over sqlite3 storing accounts and their transactions with batched writes
+
+    Writes are buffered and flushed in one transaction per batch. Statements are constant
+    strings, so sqlite3 prepares each once and reuses it from its statement cache.
+    """
+    
+    _schema = (
+        """CREATE TABLE IF NOT EXISTS accounts (
+            account_number PRIMARY KEY,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            tz_name TEXT NOT NULL,
+            tz_offset_hours INTEGER NOT NULL,
+            tz_offset_minutes INTEGER NOT NULL,
+            balance REAL NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INTEGER NOT NULL,
+            account_number NOT NULL,
+            transaction_code TEXT NOT NULL,
+            time_utc TEXT NOT NULL,
+            confirmation_code TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS transactions_account ON transactions (account_number, transaction_id)",
+    )
+    _upsert_account = (
+        "INSERT INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (account_number) DO UPDATE SET "
+        "first_name = excluded.first_name, last_name = excluded.last_name, "
+        "tz_name = excluded.tz_name, tz_offset_hours = excluded.tz_offset_hours, "
+        "tz_offset_minutes = excluded.tz_offset_minutes, balance = excluded.balance"
+    )
+    _update_balance = "UPDATE accounts SET balance = ? WHERE account_number = ?"
+    _insert_transaction = "INSERT INTO transactions VALUES (?, ?, ?, ?, ?)"
+    _select_accounts = "SELECT * FROM accounts"
+    _select_account = "SELECT * FROM accounts WHERE account_number = ?"
+    _select_book = "SELECT account_number, tz_name, tz_offset_hours, tz_offset_minutes, balance FROM accounts"
+    _select_transactions = (
+        "SELECT confirmation_code FROM transactions WHERE account_number = ? ORDER BY transaction_id"
+    )
+    
+    def __init__(self, path, batch_size=10000):
+        """
+
+        Args:
+            path (str): database file path, or ":memory:"
+            batch_size (int, optional): number of buffered writes flushed in one transaction. Defaults to 10000.
+        """
+        self._connection = sqlite3.connect(path, cached_statements=len(AccountRepository._schema) + 16)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            for statement in AccountRepository._schema:
+                self._connection.execute(statement)
+        self._batch_size = batch_size
+        self._pending_accounts = []
+        self._pending_transactions = []
+    
+    def save_account(self, account):
+        """Buffer insert or update of an account
+
+        Args:
+            account (Account): account
+        """
+        timezone = account.timezone
+        self._pending_accounts.append((
+            account.account_number, account.first_name, account.last_name,
+            timezone.name, timezone.offset_hours, timezone.offset_minutes, account.balance,
+        ))
+        self._flush_if_full()
+    
+    def save_accounts(self, accounts):
+        """Buffer insert or update of many accounts
+
+        Args:
+            accounts (iterable): Account objects
+        """
+        for account in accounts:
+            self.save_account(account)
+    
+    def save_transaction(self, account, confirmation_code):
+        """Buffer insert of a transaction, e.g. with the code returned by `Account.deposit`
+
+        Args:
+            account (Account): account of the transaction
+            confirmation_code (str): confirmation code
+        """
+        # account numbers may contain "-", transaction id and timestamp are the last two parts
+        transaction_code, raw_dt_utc, transaction_id = confirmation_code.rsplit("-", 2)
+        self._pending_transactions.append((
+            int(transaction_id), account.account_number, transaction_code[0], raw_dt_utc, confirmation_code,
+        ))
+        self._flush_if_full()
+    
+    def save_book_balances(self, book):
+        """Update balances of stored accounts from an AccountBook
+
+        Args:
+            book (AccountBook): book
+        """
+        self.flush()
+        with self._connection:
+            self._connection.executemany(
+                AccountRepository._update_balance,
+                zip(book.balances.tolist(), book.account_numbers.tolist()),
+            )
+    
+    def _flush_if_full(self):
+        """Flush once a batch is buffered"""
+        if len(self._pending_accounts) + len(self._pending_transactions) >= self._batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered accounts and transactions in one transaction"""
+        if not self._pending_accounts and not self._pending_transactions:
+            return
+        with self._connection:
+            if self._pending_accounts:
+                self._connection.executemany(AccountRepository._upsert_account, self._pending_accounts)
+            if self._pending_transactions:
+                self._connection.executemany(AccountRepository._insert_transaction, self._pending_transactions)
+        self._pending_accounts = []
+        self._pending_transactions = []
+    
+    def close(self):
+        """Flush and close the database"""
+        self.flush()
+        self._connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of stored accounts, including buffered ones
+        """
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+    
+    def _account(self, row):
+        """
+
+        Args:
+            row (tuple): accounts row
+
+        Returns:
+            Account: hydrated account
+        """
+        account_number, first_name, last_name, tz_name, tz_offset_hours, tz_offset_minutes, balance = row
+        timezone = TimeZone(tz_name, tz_offset_hours, tz_offset_minutes)
+        return Account(account_number, first_name, last_name, timezone, balance)
+    
+    def get_account(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is not stored
+
+        Returns:
+            Account: hydrated account
+        """
+        self.flush()
+        row = self._connection.execute(AccountRepository._select_account, (account_number,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown account number {account_number}.")
+        return self._account(row)
+    
+    def load_accounts(self, chunk_size=10000):
+        """Hydrate accounts lazily, fetching chunk_size rows at a time
+
+        Args:
+            chunk_size (int, optional): number of rows per fetch. Defaults to 10000.
+
+        Yields:
+            Account: hydrated account
+        """
+        self.flush()
+        cursor = self._connection.execute(AccountRepository._select_accounts)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._account(row)
+    
+    def load_book(self, chunk_size=100000):
+        """Load balances, account numbers and time zones of all accounts into an AccountBook
+
+        Args:
+            chunk_size (int, optional): number of rows per fetch. Defaults to 100000.
+
+        Returns:
+            AccountBook: book
+        """
+        self.flush()
+        book = AccountBook()
+        cursor = self._connection.execute(AccountRepository._select_book)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return book
+            account_numbers, tz_names, tz_offset_hours, tz_offset_minutes, balances = zip(*rows)
+            timezones = map(TimeZone, tz_names, tz_offset_hours, tz_offset_minutes)
+            book.extend(account_numbers, timezones, balances)
+    
+    def load_transactions(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            list: confirmation codes of the account, in transaction order
+        """
+        self.flush()
+        cursor = self._connection.execute(AccountRepository._select_transactions, (account_number,))
+        return [confirmation_code for confirmation_code, in cursor]
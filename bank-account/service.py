@@ -0,0 +1,225 @@
+"""asyncio account service"""
+
+import asyncio
+
+from account import Account
+
+
+class AccountService:
+    """Async facade over accounts, queueing operations per account on one event loop
+
+    Each account has a queue served by its own task, so operations on one account run in
+    submission order while many accounts are served concurrently. Consecutive queued deposits
+    to one account are coalesced into one balance update.
+    """
+    
+    def __init__(self, accounts=()):
+        """
+
+        Args:
+            accounts (iterable, optional): Account objects to serve. Defaults to ().
+        """
+        self._accounts = {}
+        self._queues = {}
+        self._workers = {}
+        self._closed = False
+        for account in accounts:
+            self.register(account)
+    
+    def register(self, account):
+        """
+
+        Args:
+            account (Account): account to serve
+
+        Raises:
+            ValueError: account is not an Account object
+            ValueError: account number is already served
+        """
+        if not isinstance(account, Account):
+            raise ValueError("Account must be a valid Account object.")
+        if account.account_number in self._accounts:
+            raise ValueError(f"Account number {account.account_number} already exists.")
+        self._accounts[account.account_number] = account
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of served accounts
+        """
+        return len(self._accounts)
+    
+    def _account(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is not served
+
+        Returns:
+            Account: account
+        """
+        try:
+            return self._accounts[account_number]
+        except KeyError:
+            raise ValueError(f"Unknown account number {account_number}.") from None
+    
+    def _submit(self, account_number, operation, value=None):
+        """Queue an operation, starting the account's task if needed
+
+        Args:
+            account_number (type): account number
+            operation (str): "deposit", "withdraw" or "interest"
+            value (real, optional): value. Defaults to None.
+
+        Raises:
+            RuntimeError: service is closed
+
+        Returns:
+            asyncio.Future: confirmation code once applied
+        """
+        if self._closed:
+            raise RuntimeError("Account service is closed.")
+        account = self._account(account_number)
+        queue = self._queues.get(account_number)
+        if queue is None:
+            queue = self._queues[account_number] = asyncio.Queue()
+            self._workers[account_number] = asyncio.create_task(self._serve(account, queue))
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((operation, value, future))
+        return future
+    
+    @staticmethod
+    async def _serve(account, queue):
+        """Apply queued operations of one account in order, coalescing consecutive deposits
+
+        Args:
+            account (Account): account
+            queue (asyncio.Queue): queued operations with their futures
+        """
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            deposits = []
+            for operation, value, future in batch:
+                if operation == "deposit":
+                    deposits.append((value, future))
+                    continue
+                AccountService._apply_deposits(account, deposits)
+                deposits = []
+                if operation == "withdraw":
+                    AccountService._apply(future, account.withdraw, value)
+                else:
+                    AccountService._apply(future, account.pay_interest)
+            AccountService._apply_deposits(account, deposits)
+    
+    @staticmethod
+    def _apply(future, method, *args):
+        """Call method and pass its result or exception to future
+
+        Args:
+            future (asyncio.Future): future of the caller
+            method (callable): account method
+            args (type): arguments of method
+        """
+        try:
+            result = method(*args)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+    
+    @staticmethod
+    def _apply_deposits(account, deposits):
+        """Apply a run of deposits with one balance update
+
+        Args:
+            account (Account): account
+            deposits (list): values with their futures
+        """
+        if not deposits:
+            return
+        values, futures = zip(*deposits)
+        try:
+            conf_codes = account.deposit_many(values)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, conf_code in zip(futures, conf_codes):
+            if not future.done():
+                future.set_result(conf_code)
+    
+    async def deposit(self, account_number, value):
+        """
+
+        Args:
+            account_number (type): account number
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        # invalid values fail the caller only, not the coalesced batch
+        value = Account.validate_real_number(value, min_value=0.01)
+        return await self._submit(account_number, "deposit", value)
+    
+    async def withdraw(self, account_number, value):
+        """
+
+        Args:
+            account_number (type): account number
+            value (type): value
+
+        Returns:
+            str: confirmation code
+        """
+        value = Account.validate_real_number(value, min_value=0.01)
+        return await self._submit(account_number, "withdraw", value)
+    
+    async def pay_interest(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            str: confirmation code
+        """
+        return await self._submit(account_number, "interest")
+    
+    def balance(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Returns:
+            real: current balance, including applied operations only
+        """
+        return self._account(account_number).balance
+    
+    async def close(self):
+        """Wait for queued operations, then stop serving"""
+        self._closed = True
+        while any(not queue.empty() for queue in self._queues.values()):
+            await asyncio.sleep(0)
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        await self.close()
@@ -0,0 +1,233 @@
+"""Sharded end-of-day settlement"""
+
+import os
+import zlib
+import itertools
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from account import Account
+from book import AccountBook
+from generator import ConfirmationCodeGenerator, CounterAllocator
+
+
+Settlement = namedtuple("Settlement", "balances, confirmation_codes, interest_codes")
+
+
+def settle_serial(accounts, operations, pay_interest=True):
+    """Apply queued operations, then interest, to Account objects one at a time
+
+    Args:
+        accounts (iterable): Account objects, modified in place
+        operations (iterable): (account_number, operation, value) with operation "deposit" or "withdraw"
+        pay_interest (bool, optional): pay interest after the operations. Defaults to True.
+
+    Raises:
+        ValueError: account number is unknown
+        ValueError: operation is not "deposit" or "withdraw"
+
+    Returns:
+        Settlement: balance and interest confirmation code of each account number, and
+            confirmation codes in operation order
+    """
+    accounts = {account.account_number: account for account in accounts}
+    confirmation_codes = []
+    for account_number, operation, value in operations:
+        account = SettlementEngine._account(accounts, account_number)
+        if operation not in SettlementEngine._operations:
+            raise ValueError(f"Unknown operation {operation}.")
+        confirmation_codes.append(getattr(account, operation)(value))
+    interest_codes = {}
+    if pay_interest:
+        interest_codes = {account_number: account.pay_interest() for account_number, account in accounts.items()}
+    balances = {account_number: account.balance for account_number, account in accounts.items()}
+    return Settlement(balances, confirmation_codes, interest_codes)
+
+
+def _init_worker(interest_rate):
+    """Use the interest rate of the parent process
+
+    Args:
+        interest_rate (real): interest rate
+    """
+    Account.set_interest_rate(interest_rate)
+
+
+def _settle_shard(account_numbers, balances, op_positions, op_is_withdraw, op_values, pay_interest, first_id):
+    """Settle one shard with AccountBook, which follows Account semantics
+
+    Args:
+        account_numbers (list): account numbers of the shard
+        balances (numpy.ndarray): balances of the shard
+        op_positions (numpy.ndarray): position of each operation's account in the shard
+        op_is_withdraw (numpy.ndarray): True for withdrawals, False for deposits
+        op_values (numpy.ndarray): value of each operation
+        pay_interest (bool): pay interest after the operations
+        first_id (int): first of the transaction ids reserved for the shard by the parent process
+
+    Returns:
+        tuple: balances, confirmation codes in operation order, interest confirmation codes
+    """
+    # block size 1 takes exactly the reserved ids
+    Account.set_confirmation_code_generator(
+        ConfirmationCodeGenerator(CounterAllocator(itertools.count(first_id)), block_size=1)
+    )
+    book = AccountBook()
+    book.extend(account_numbers, None, balances)
+    numbers = book.account_numbers
+    
+    conf_codes = np.empty(len(op_positions), dtype=object)
+    # every round touches each account at most once, so rounds keep operation order per account
+    for entries in AccountBook._occurrence_rounds(op_positions):
+        withdrawals = entries[op_is_withdraw[entries]]
+        deposits = entries[~op_is_withdraw[entries]]
+        if len(deposits):
+            conf_codes[deposits] = book.deposit(numbers[op_positions[deposits]], op_values[deposits])
+        if len(withdrawals):
+            conf_codes[withdrawals] = book.withdraw(numbers[op_positions[withdrawals]], op_values[withdrawals])
+    
+    interest_codes = book.pay_interest() if pay_interest else None
+    return np.array(book.balances), conf_codes, interest_codes
+
+
+class SettlementEngine:
+    """Settlement sharding accounts by account number hash across a process pool
+
+    Each shard travels to its worker as a few compact arrays, not one pickled object per account.
+    The parent reserves one contiguous range of transaction ids from the allocator of the current
+    confirmation code generator and hands each shard its slice, so ids stay unique.
+    """
+    
+    _operations = ("deposit", "withdraw")
+    
+    def __init__(self, max_workers=None, shards=None):
+        """
+
+        Args:
+            max_workers (int, optional): number of worker processes. Defaults to None for CPU count.
+            shards (int, optional): number of shards. Defaults to None for number of workers.
+        """
+        self._max_workers = max_workers or os.cpu_count()
+        self._shards = shards or self._max_workers
+    
+    @staticmethod
+    def shard(account_number, shards):
+        """Shard of an account, stable across processes and runs
+
+        Args:
+            account_number (type): account number
+            shards (int): number of shards
+
+        Returns:
+            int: shard index
+        """
+        return zlib.crc32(str(account_number).encode()) % shards
+    
+    @staticmethod
+    def _account(accounts, account_number):
+        """
+
+        Args:
+            accounts (dict): account of each account number
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is unknown
+
+        Returns:
+            type: account
+        """
+        try:
+            return accounts[account_number]
+        except KeyError:
+            raise ValueError(f"Unknown account number {account_number}.") from None
+    
+    def _batches(self, accounts, operations):
+        """Split accounts and operations into compact per-shard batches
+
+        Args:
+            accounts (iterable): Account objects
+            operations (iterable): (account_number, operation, value)
+
+        Raises:
+            ValueError: account number is unknown
+            ValueError: operation is not "deposit" or "withdraw"
+
+        Returns:
+            tuple: per-shard batches and operation indices
+        """
+        numbers = [[] for _ in range(self._shards)]
+        balances = [[] for _ in range(self._shards)]
+        location = {}
+        for account in accounts:
+            shard = SettlementEngine.shard(account.account_number, self._shards)
+            location[account.account_number] = (shard, len(numbers[shard]))
+            numbers[shard].append(account.account_number)
+            balances[shard].append(account.balance)
+        
+        op_indices = [[] for _ in range(self._shards)]
+        op_positions = [[] for _ in range(self._shards)]
+        op_is_withdraw = [[] for _ in range(self._shards)]
+        op_values = [[] for _ in range(self._shards)]
+        for index, (account_number, operation, value) in enumerate(operations):
+            shard, position = SettlementEngine._account(location, account_number)
+            if operation not in SettlementEngine._operations:
+                raise ValueError(f"Unknown operation {operation}.")
+            op_indices[shard].append(index)
+            op_positions[shard].append(position)
+            op_is_withdraw[shard].append(operation == "withdraw")
+            op_values[shard].append(value)
+        
+        batches = [
+            (
+                numbers[shard],
+                np.array(balances[shard], dtype=np.float64),
+                np.array(op_positions[shard], dtype=np.intp),
+                np.array(op_is_withdraw[shard], dtype=bool),
+                AccountBook._validate_values(op_values[shard], len(op_values[shard]), 0.01),
+            )
+            for shard in range(self._shards)
+        ]
+        return batches, op_indices
+    
+    def settle(self, accounts, operations, pay_interest=True):
+        """Apply queued operations, then interest, shard by shard in worker processes
+
+        Args:
+            accounts (iterable): Account objects, left unchanged
+            operations (iterable): (account_number, operation, value) with operation "deposit" or "withdraw"
+            pay_interest (bool, optional): pay interest after the operations. Defaults to True.
+
+        Returns:
+            Settlement: same balances and transaction codes as `settle_serial`
+        """
+        batches, op_indices = self._batches(accounts, operations)
+        operation_count = sum(len(indices) for indices in op_indices)
+        id_counts = [len(indices) + (len(batch[0]) if pay_interest else 0) for batch, indices in zip(batches, op_indices)]
+        ids = Account.get_confirmation_code_generator().allocator.reserve(sum(id_counts))
+        first_ids = np.cumsum([ids.start] + id_counts[:-1]).tolist()
+        
+        with ProcessPoolExecutor(
+            self._max_workers, initializer=_init_worker, initargs=(Account.get_interest_rate(),)
+        ) as executor:
+            futures = [
+                executor.submit(_settle_shard, *batch, pay_interest, first_id) if batch[0] else None
+                for batch, first_id in zip(batches, first_ids)
+            ]
+            results = [None if future is None else future.result() for future in futures]
+        
+        balances = {}
+        confirmation_codes = [None] * operation_count
+        interest_codes = {}
+        for batch, indices, result in zip(batches, op_indices, results):
+            if result is None:
+                continue
+            shard_balances, shard_codes, shard_interest_codes = result
+            balances.update(zip(batch[0], shard_balances.tolist()))
+            for index, code in zip(indices, shard_codes):
+                confirmation_codes[index] = str(code)
+            if pay_interest:
+                interest_codes.update(zip(batch[0], shard_interest_codes.tolist()))
+        return Settlement(balances, confirmation_codes, interest_codes)
@@ -0,0 +1,154 @@
+"""Streaming account statements"""
+
+import os
+
+from account import Account
+from confirmation import ConfirmationParser, ParseError
+from registry import AccountRegistry
+
+
+class StatementRenderer:
+    """Renderer of statements from a stream of confirmation codes, one file per account
+
+    Lines are converted to each account's time zone as codes arrive and buffered up to
+    `chunk_size` lines in total, then appended to the statement files. Memory stays bounded by
+    the chunk size whatever the number of transactions, and files grow while the stream is read.
+    """
+    
+    _transaction_names = {
+        Account._transaction_codes["deposit"]: "Deposit",
+        Account._transaction_codes["withdraw"]: "Withdrawal",
+        Account._transaction_codes["interest"]: "Interest",
+        Account._transaction_codes["rejected"]: "Rejected",
+    }
+    
+    def __init__(self, accounts, directory, chunk_size=10000):
+        """
+
+        Args:
+            accounts (AccountRegistry or dict): accounts by account number
+            directory (str): directory of statement files, created if missing
+            chunk_size (int, optional): number of lines buffered before writing. Defaults to 10000.
+
+        Raises:
+            ValueError: chunk size is not a positive integer
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+        self._lookup = accounts.get if isinstance(accounts, AccountRegistry) else accounts.__getitem__
+        self._directory = directory
+        self._chunk_size = chunk_size
+        self._parsers = {}
+        # statement file of each account number seen
+        self._paths = {}
+        self._started = set()
+        self._errors = []
+        os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def errors(self):
+        """
+
+        Returns:
+            list: ParseError for each bad code or unknown account seen so far, in input order
+        """
+        return self._errors
+    
+    def path(self, account_number):
+        """
+
+        Args:
+            account_number (type): account number
+
+        Raises:
+            ValueError: account number is not a plain file name, e.g. contains a path separator
+
+        Returns:
+            str: path of the statement file, inside the directory
+        """
+        name = str(account_number)
+        if (
+            name in ("", ".", "..") or "\0" in name
+            or os.sep in name or (os.altsep is not None and os.altsep in name)
+        ):
+            raise ValueError(f"Account number {account_number} cannot be used as a file name.")
+        return os.path.join(self._directory, f"{name}.txt")
+    
+    def lines(self, confirmation_codes):
+        """Convert confirmation codes to statement lines lazily
+
+        Args:
+            confirmation_codes (iterable): confirmation codes, e.g. lines of a file
+
+        Yields:
+            tuple: Account object and its statement line, in input order
+        """
+        for line_number, code in ConfirmationParser.numbered(confirmation_codes):
+            parts = code.split("-")
+            if len(parts) != 4:
+                self._errors.append(ParseError(line_number, code, "Invalid confirmation code."))
+                continue
+            transaction_code, account_number, raw_dt_utc, transaction_id = parts
+            try:
+                account = self._lookup(account_number)
+            except (KeyError, ValueError):
+                self._errors.append(ParseError(line_number, code, f"Unknown account number {account_number}."))
+                continue
+            
+            if account.account_number not in self._paths:
+                try:
+                    self._paths[account.account_number] = self.path(account.account_number)
+                except ValueError as e:
+                    self._errors.append(ParseError(line_number, code, str(e)))
+                    continue
+            
+            # one parser per time zone, caching the conversion of the last datetime string
+            parser = self._parsers.get(account.timezone)
+            if parser is None:
+                parser = self._parsers[account.timezone] = ConfirmationParser(account.timezone)
+            try:
+                _, time = parser.times(raw_dt_utc)
+            except ValueError as e:
+                self._errors.append(ParseError(line_number, code, str(e)))
+                continue
+            
+            name = StatementRenderer._transaction_names.get(transaction_code, transaction_code)
+            yield account, f"{time}  {name:<10}  {transaction_id}\n"
+    
+    def _write(self, buffers):
+        """Append buffered lines to statement files, starting each file with a header
+
+        Args:
+            buffers (dict): statement lines of each Account object
+        """
+        for account, lines in buffers.items():
+            account_number = account.account_number
+            started = account_number in self._started
+            with open(self._paths[account_number], "a" if started else "w") as f:
+                if not started:
+                    f.write(f"Statement of account {account_number}, {account.full_name}, times in {account.timezone.name}\n")
+                    self._started.add(account_number)
+                f.writelines(lines)
+    
+    def render(self, confirmation_codes):
+        """Write statements of a stream of confirmation codes in chunks
+
+        Args:
+            confirmation_codes (iterable): confirmation codes, e.g. an open file
+
+        Returns:
+            int: number of statement lines written
+        """
+        written = 0
+        buffers = {}
+        buffered = 0
+        for account, line in self.lines(confirmation_codes):
+            buffers.setdefault(account, []).append(line)
+            buffered += 1
+            if buffered == self._chunk_size:
+                self._write(buffers)
+                written += buffered
+                buffers = {}
+                buffered = 0
+        self._write(buffers)
+        return written + buffered
@@ -5,6 +5,7 @@ Command line: python test_account.py
 
 from account import TimeZone, Account
 from datetime import timedelta
+import pickle
 import unittest
 
 
@@ -41,6 +42,28 @@ class TestAccount(unittest.TestCase):
             with self.subTest(test_number=i):
                 self.assertNotEqual(tz, test_tz)
     
+    def test_timezones_interned(self):
+        self.assertIs(TimeZone("ABC", -1, -30), TimeZone(" ABC ", -1, -30))
+        self.assertIsNot(TimeZone("ABC", -1, -30), TimeZone("ABC", -1, 0))
+        self.assertEqual(hash(TimeZone("ABC", -1, -30)), hash(TimeZone("ABC", -1, -30)))
+    
+    def test_timezone_immutable(self):
+        tz = TimeZone("ABC", -1, -30)
+        with self.assertRaises(AttributeError):
+            tz._name = "DEF"
+        self.assertEqual("ABC", tz.name)
+    
+    def test_timezone_pickle_interned(self):
+        self.assertIs(self.tz, pickle.loads(pickle.dumps(self.tz)))
+    
+    def test_create_timezone_invalid(self):
+        test_args = (("", 0, 0), ("ABC", 1.5, 0), ("ABC", 0, 60), ("ABC", -13, 0), ("ABC", 14, 30))
+        
+        for i, args in enumerate(test_args):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    TimeZone(*args)
+    
     def test_create_account(self):
         a = self.create_account()
         self.assertEqual(self.account_number, a.account_number)
@@ -50,6 +73,15 @@ class TestAccount(unittest.TestCase):
         self.assertEqual(self.tz, a.timezone)
         self.assertEqual(self.balance, a.balance)
     
+    def test_account_default_timezone_shared(self):
+        a1 = Account("A100", "FIRST", "LAST")
+        a2 = Account("A101", "FIRST", "LAST")
+        self.assertIs(a1.timezone, a2.timezone)
+    
+    def test_account_slotted(self):
+        a = self.create_account()
+        self.assertFalse(hasattr(a, "__dict__"))
+    
     def test_create_account_blank_first_name(self):
         self.first_name = ""
         
@@ -74,6 +106,19 @@ class TestAccount(unittest.TestCase):
         with self.assertRaises(ValueError):
             a.deposit(-100)
     
+    def test_account_deposit_many_ok(self):
+        a = self.create_account()
+        conf_codes = a.deposit_many([10, 20, 30])
+        self.assertEqual(3, len(conf_codes))
+        self.assertTrue(all(code.startswith("D-A100-") for code in conf_codes))
+        self.assertEqual(160, a.balance)
+    
+    def test_account_deposit_many_invalid_amount(self):
+        a = self.create_account()
+        with self.assertRaises(ValueError):
+            a.deposit_many([10, -100])
+        self.assertEqual(self.balance, a.balance)
+    
     def test_account_withdraw_ok(self):
         a = self.create_account()
         conf_code = a.withdraw(20)
@@ -90,6 +135,38 @@ class TestAccount(unittest.TestCase):
         conf_code = a.withdraw(200)
         self.assertTrue(conf_code.startswith("X-"))
         self.assertEqual(self.balance, a.balance)
+    
+    def test_account_accrue_interest_matches_pay_interest(self):
+        a1 = self.create_account()
+        a2 = self.create_account()
+        conf_codes = a1.accrue_interest(12)
+        for _ in range(12):
+            a2.pay_interest()
+        self.assertAlmostEqual(a2.balance, a1.balance, places=9)
+        self.assertEqual(12, len(conf_codes))
+        self.assertTrue(all(code.startswith("I-A100-") for code in conf_codes))
+        transaction_ids = [int(code.split("-")[-1]) for code in conf_codes]
+        self.assertEqual(list(range(transaction_ids[0], transaction_ids[0] + 12)), transaction_ids)
+    
+    def test_account_accrue_interest_rate_schedule(self):
+        a = self.create_account()
+        a.accrue_interest(5, [(2, 1.0), (0, 7.0), (3, 2.0)])
+        self.assertAlmostEqual(self.balance * 1.01 ** 2 * 1.02 ** 3, a.balance, places=9)
+    
+    def test_account_accrue_interest_zero_periods(self):
+        a = self.create_account()
+        self.assertEqual(0, len(a.accrue_interest(0)))
+        self.assertEqual(self.balance, a.balance)
+    
+    def test_account_accrue_interest_invalid(self):
+        a = self.create_account()
+        test_args = ((-1, None), (1.5, None), (2, [(1, 1.0)]), (2, [(1, 1.0), (1, -1.0)]), (2, [(2.0, 1.0)]))
+        
+        for i, args in enumerate(test_args):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    a.accrue_interest(*args)
+        self.assertEqual(self.balance, a.balance)
 
 
 def run_tests(test_class):
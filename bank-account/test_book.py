@@ -0,0 +1,164 @@
+"""
+Unit tests
+Command line: python test_book.py
+"""
+
+from account import TimeZone, Account
+from book import AccountBook
+import numpy as np
+import unittest
+
+
+class TestAccountBook(unittest.TestCase):
+    def setUp(self):
+        self.tz = TimeZone("TZ", 1, 30)
+        self.accounts = [
+            Account("A100", "FIRST", "LAST", self.tz, 100.00),
+            Account("A101", "FIRST", "LAST", None, 50.00),
+            Account("A102", "FIRST", "LAST", self.tz, 0),
+        ]
+    
+    def create_book(self):
+        return AccountBook.from_accounts(self.accounts)
+    
+    def test_create_book(self):
+        book = self.create_book()
+        self.assertEqual(3, len(book))
+        self.assertEqual(["A100", "A101", "A102"], list(book.account_numbers))
+        self.assertEqual([100, 50, 0], list(book.balances))
+        self.assertEqual(self.tz, book.timezone("A102"))
+        self.assertEqual(TimeZone("UTC", 0, 0), book.timezone("A101"))
+        self.assertEqual(2, len(book.timezones))
+    
+    def test_add_duplicate_account(self):
+        book = self.create_book()
+        with self.assertRaises(ValueError):
+            book.add("A100")
+    
+    def test_add_grows_capacity(self):
+        book = AccountBook()
+        for i in range(100):
+            book.add(f"A{i}", initial_balance=i)
+        self.assertEqual(100, len(book))
+        self.assertEqual(99, book.balance("A99"))
+    
+    def test_extend_ok(self):
+        book = self.create_book()
+        book.extend(["B100", "B101"], [self.tz, self.tz], [10, 20])
+        book.extend(["B102"])
+        self.assertEqual(6, len(book))
+        self.assertEqual(20, book.balance("B101"))
+        self.assertEqual(0, book.balance("B102"))
+        self.assertEqual(self.tz, book.timezone("B100"))
+    
+    def test_extend_invalid(self):
+        book = self.create_book()
+        test_batches = (
+            (["B100", "B100"], None, None),
+            (["A100"], None, None),
+            (["B100"], ["UTC"], None),
+            (["B100"], None, [-1]),
+        )
+        
+        for i, batch in enumerate(test_batches):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    book.extend(*batch)
+        self.assertEqual(3, len(book))
+    
+    def test_balances_read_only(self):
+        book = self.create_book()
+        with self.assertRaises(ValueError):
+            book.balances[0] = 1000
+    
+    def test_deposit_ok(self):
+        book = self.create_book()
+        conf_codes = book.deposit(["A100", "A102", "A100"], [10, 20, 30])
+        self.assertEqual([140, 50, 20], list(book.balances))
+        self.assertEqual(3, len(conf_codes))
+        for conf_code, account_number in zip(conf_codes, ["A100", "A102", "A100"]):
+            self.assertTrue(conf_code.startswith(f"D-{account_number}-"))
+    
+    def test_deposit_transaction_ids_consecutive(self):
+        book = self.create_book()
+        conf_codes = book.deposit(["A100", "A101"], [10, 20])
+        first_id = int(conf_codes[0].split("-")[-1])
+        self.assertEqual(first_id + 1, int(conf_codes[1].split("-")[-1]))
+        self.assertTrue(Account("A200", "F", "L").deposit(1).endswith(f"-{first_id + 2}"))
+    
+    def test_deposit_invalid_amount(self):
+        book = self.create_book()
+        test_values = ([10, -100], [10, 0], ["10", "20"], [10])
+        
+        for i, values in enumerate(test_values):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    book.deposit(["A100", "A101"], values)
+        self.assertEqual([100, 50, 0], list(book.balances))
+    
+    def test_deposit_unknown_account(self):
+        book = self.create_book()
+        with self.assertRaises(ValueError):
+            book.deposit(["A999"], [10])
+    
+    def test_withdraw_ok(self):
+        book = self.create_book()
+        conf_codes = book.withdraw(["A100", "A101"], [20, 50])
+        self.assertEqual([80, 0, 0], list(book.balances))
+        self.assertTrue(all(code.startswith("W-") for code in conf_codes))
+    
+    def test_withdraw_overdraw(self):
+        book = self.create_book()
+        conf_codes = book.withdraw(["A100", "A101", "A102"], [200, 20, 1])
+        self.assertEqual([100, 30, 0], list(book.balances))
+        self.assertEqual(["X", "W", "X"], [code[0] for code in conf_codes])
+    
+    def test_withdraw_repeated_account_in_order(self):
+        book = self.create_book()
+        conf_codes = book.withdraw(["A100", "A101", "A100", "A100"], [60, 10, 60, 40])
+        self.assertEqual([0, 40, 0], list(book.balances))
+        self.assertEqual(["W", "W", "X", "W"], [code[0] for code in conf_codes])
+    
+    def test_occurrence_rounds(self):
+        """Tests that round r holds the (r + 1)-th entry of each account, in batch order"""
+        
+        positions = np.array([2, 0, 2, 2, 1, 0, 2])
+        rounds = [entries.tolist() for entries in AccountBook._occurrence_rounds(positions)]
+        self.assertEqual([[0, 1, 4], [2, 5], [3], [6]], rounds)
+        self.assertEqual([], list(AccountBook._occurrence_rounds(np.array([], dtype=np.intp))))
+    
+    def test_withdraw_matches_account(self):
+        book = self.create_book()
+        batch = [("A100", 30), ("A101", 60), ("A100", 80), ("A102", 0.01), ("A100", 70)]
+        accounts = {account.account_number: account for account in self.accounts}
+        expected = [accounts[number].withdraw(value)[0] for number, value in batch]
+        conf_codes = book.withdraw(*zip(*batch))
+        self.assertEqual(expected, [code[0] for code in conf_codes])
+        self.assertEqual([a.balance for a in self.accounts], list(book.balances))
+    
+    def test_pay_interest_matches_account(self):
+        book = self.create_book()
+        conf_codes = book.pay_interest()
+        for account in self.accounts:
+            account.pay_interest()
+        self.assertEqual([a.balance for a in self.accounts], list(book.balances))
+        self.assertTrue(all(code.startswith("I-") for code in conf_codes))
+    
+    def test_accrue_interest_matches_account(self):
+        book = self.create_book()
+        conf_codes = book.accrue_interest(3, [(1, 1.0), (2, 0.5)])
+        for account in self.accounts:
+            account.accrue_interest(3, [(1, 1.0), (2, 0.5)])
+        self.assertEqual([a.balance for a in self.accounts], list(book.balances))
+        self.assertEqual(9, len(conf_codes))
+        self.assertEqual(["A100"] * 3 + ["A101"] * 3 + ["A102"] * 3, [code.split("-")[1] for code in conf_codes])
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestAccountBook)
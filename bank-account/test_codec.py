@@ -0,0 +1,93 @@
+"""
+Unit tests
+Command line: python test_codec.py
+"""
+
+from account import TimeZone, Account
+from codec import ConfirmationCodec
+import mmap
+import os
+import tempfile
+import unittest
+
+
+class TestConfirmationCodec(unittest.TestCase):
+    def setUp(self):
+        self.codes = [
+            "X-A100-20190325224918-101",
+            "D-A101-20190325224918-102",
+            "W-A100-21060207062815-18446744073709551615",
+            "I-A102-19700101000000-0",
+        ]
+        self.codec = ConfirmationCodec()
+    
+    def test_encode_fixed_width(self):
+        data = self.codec.encode(self.codes[0])
+        self.assertEqual(17, len(data))
+        self.assertEqual(ConfirmationCodec.record.size, ConfirmationCodec.record_dtype.itemsize)
+    
+    def test_round_trip(self):
+        tz = TimeZone("TZ", -7, 0)
+        for i, code in enumerate(self.codes):
+            with self.subTest(test_number=i):
+                decoded = self.codec.decode(self.codec.encode(code))
+                self.assertEqual(code, decoded)
+                self.assertEqual(Account.parse_confirmation_code(code, tz), Account.parse_confirmation_code(decoded, tz))
+    
+    def test_round_trip_generated(self):
+        code = Account("A200", "FIRST", "LAST").deposit(10)
+        self.assertEqual(code, self.codec.decode(self.codec.encode(code)))
+    
+    def test_account_ids(self):
+        self.codec.encode_many(self.codes)
+        self.assertEqual(("A100", "A101", "A102"), self.codec.account_numbers)
+        codec = ConfirmationCodec(self.codec.account_numbers)
+        data = self.codec.encode(self.codes[1])
+        self.assertEqual(self.codes[1], codec.decode(data))
+        with self.assertRaises(ValueError):
+            ConfirmationCodec(["A100", "A100"])
+    
+    def test_encode_invalid(self):
+        bad_codes = [
+            "not-a-code",
+            "XY-A100-20190325224918-101",
+            "X-A100-20190230224918-101",
+            "X-A100-2019032522491-101",
+            "X-A100-19691231235959-101",
+            "X-A100-21060207062816-101",
+            "X-A100-20190325224918-abc",
+            "X-A100-20190325224918--1",
+            "X-A100-20190325224918-18446744073709551616",
+        ]
+        for i, code in enumerate(bad_codes):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    self.codec.encode(code)
+    
+    def test_decode_offset(self):
+        data = self.codec.encode_many(self.codes)
+        self.assertEqual(self.codes[2], self.codec.decode(memoryview(data), 2 * ConfirmationCodec.record.size))
+    
+    def test_decode_columns_from_mmap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "codes.bin")
+            with open(path, "wb") as f:
+                f.write(self.codec.encode_many(self.codes))
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                columns = self.codec.decode_columns(mm)
+                expected = [Account.parse_confirmation_code(code) for code in self.codes]
+                self.assertEqual([c.transaction_code.encode() for c in expected], list(columns["transaction_code"]))
+                self.assertEqual([c.account_number for c in expected], list(columns["account_number"]))
+                self.assertEqual([c.time_utc for c in expected], [str(t) for t in columns["time_utc"]])
+                self.assertEqual([int(c.transaction_id) for c in expected], [int(t) for t in columns["transaction_id"]])
+                del columns
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestConfirmationCodec)
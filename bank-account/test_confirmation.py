@@ -0,0 +1,103 @@
+"""
+Unit tests
+Command line: python test_confirmation.py
+"""
+
+from account import TimeZone, Account
+from confirmation import ConfirmationParser
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class TestConfirmationParser(unittest.TestCase):
+    def setUp(self):
+        self.tz = TimeZone("TZ", -7, 0)
+        self.codes = [
+            "X-A100-20190325224918-101\n",
+            "D-A101-20190325224918-102\n",
+            "\n",
+            "not-a-code\n",
+            "W-A100-20190230224918-103\n",
+            "I-A102-20200229235959-104\n",
+            "W-A100-2019032522491x-105\n",
+        ]
+    
+    def test_parse_matches_account(self):
+        parser = ConfirmationParser(self.tz)
+        confirmations = list(parser.parse(self.codes))
+        expected = [
+            Account.parse_confirmation_code(code.strip(), self.tz)
+            for code in (self.codes[0], self.codes[1], self.codes[5])
+        ]
+        self.assertEqual(expected, confirmations)
+    
+    def test_parse_default_utc(self):
+        parser = ConfirmationParser()
+        confirmation = next(parser.parse(self.codes))
+        self.assertEqual(Account.parse_confirmation_code(self.codes[0].strip()), confirmation)
+    
+    def test_parse_reports_errors(self):
+        parser = ConfirmationParser(self.tz)
+        list(parser.parse(self.codes))
+        self.assertEqual([4, 5, 7], [error.line_number for error in parser.errors])
+        self.assertEqual("not-a-code", parser.errors[0].confirmation_code)
+        self.assertEqual("Invalid confirmation code.", parser.errors[0].message)
+        self.assertEqual("Invalid transaction datetime.", parser.errors[1].message)
+    
+    def test_parse_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "codes.log")
+            with open(path, "w") as f:
+                f.writelines(self.codes)
+            parser = ConfirmationParser(self.tz)
+            confirmations = list(parser.parse_file(path))
+        self.assertEqual(3, len(confirmations))
+        self.assertEqual(3, len(parser.errors))
+    
+    def test_invalid_timezone(self):
+        with self.assertRaises(ValueError):
+            ConfirmationParser("UTC")
+    
+    def test_parse_columns_matches_parse(self):
+        expected = list(ConfirmationParser(self.tz).parse(self.codes))
+        parser = ConfirmationParser(self.tz)
+        chunks = list(parser.parse_columns(self.codes, chunk_size=2))
+        columns = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+        self.assertEqual([1, 2, 6], list(columns["line_number"]))
+        self.assertEqual([c.account_number for c in expected], list(columns["account_number"]))
+        self.assertEqual([c.transaction_code for c in expected], list(columns["transaction_code"]))
+        self.assertEqual([c.transaction_id for c in expected], list(columns["transaction_id"]))
+        self.assertEqual([c.time_utc for c in expected], [str(t) for t in columns["time_utc"]])
+        self.assertEqual(
+            [c.time[:19] for c in expected],
+            [str(t).replace("T", " ") for t in columns["time"]]
+        )
+        self.assertEqual([4, 5, 7], [error.line_number for error in parser.errors])
+    
+    def test_parse_columns_invalid_datetimes(self):
+        bad_codes = [
+            "D-A100-00000101000000-1",
+            "D-A100-20191301000000-2",
+            "D-A100-20190431000000-3",
+            "D-A100-20190101240000-4",
+            "D-A100-20190101006000-5",
+            "D-A100-20190101000060-6",
+            "D-A100-2019010100000-7",
+            "D-A100-201901010000000-8",
+        ]
+        parser = ConfirmationParser()
+        chunk = next(parser.parse_columns(bad_codes))
+        self.assertEqual(0, len(chunk["line_number"]))
+        self.assertEqual(list(range(1, 9)), [error.line_number for error in parser.errors])
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestConfirmationParser)
@@ -0,0 +1,161 @@
+"""
+Unit tests
+Command line: python test_generator.py
+"""
+
+from account import Account
+from generator import (
+    TransactionIdAllocator, CounterAllocator, SharedMemoryAllocator, FileLockAllocator,
+    ConfirmationCodeGenerator
+)
+from unittest import mock
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+
+class CountingAllocator(CounterAllocator):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+    
+    def reserve(self, count):
+        self.calls += 1
+        return super().reserve(count)
+
+
+def generate_ids(generator, count):
+    return [int(generator.generate("D", "A100").split("-")[-1]) for _ in range(count)]
+
+
+def generate_ids_in_worker(allocator, count, queue):
+    generator = ConfirmationCodeGenerator(allocator, block_size=7)
+    queue.put(generate_ids(generator, count))
+
+
+class TestConfirmationCodeGenerator(unittest.TestCase):
+    def test_generate_ok(self):
+        generator = ConfirmationCodeGenerator()
+        with mock.patch("generator.time.time", return_value=1553554158.5):
+            conf_code = generator.generate("X", "A100")
+        self.assertEqual("X-A100-20190325224918-0", conf_code)
+        self.assertEqual(Account.parse_confirmation_code(conf_code).time_utc, "2019-03-25T22:49:18")
+    
+    def test_timestamp_formatted_once_per_second(self):
+        generator = ConfirmationCodeGenerator()
+        with mock.patch("generator.time.time", side_effect=[100.1, 100.9, 101.0]):
+            with mock.patch("generator.time.strftime", wraps=__import__("time").strftime) as strftime:
+                timestamps = [generator.timestamp() for _ in range(3)]
+        self.assertEqual(2, strftime.call_count)
+        self.assertEqual(["19700101000140", "19700101000140", "19700101000141"], timestamps)
+    
+    def test_allocator_touched_once_per_block(self):
+        allocator = CountingAllocator()
+        generator = ConfirmationCodeGenerator(allocator, block_size=10)
+        self.assertEqual(list(range(25)), generate_ids(generator, 25))
+        self.assertEqual(3, allocator.calls)
+    
+    def test_reserve_transaction_ids(self):
+        generator = ConfirmationCodeGenerator(block_size=10)
+        generate_ids(generator, 3)
+        ranges = generator.reserve_transaction_ids(20)
+        self.assertEqual(list(range(3, 23)), [i for r in ranges for i in r])
+        self.assertEqual([23], generate_ids(generator, 1))
+    
+    def test_generators_share_allocator_without_collision(self):
+        allocator = CounterAllocator()
+        generators = [ConfirmationCodeGenerator(allocator, block_size=4) for _ in range(3)]
+        ids = [i for _ in range(5) for generator in generators for i in generate_ids(generator, 3)]
+        self.assertEqual(len(ids), len(set(ids)))
+    
+    def test_invalid_arguments(self):
+        test_arguments = ((object(), 10), (None, 0), (None, 1.5))
+        
+        for i, (allocator, block_size) in enumerate(test_arguments):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    ConfirmationCodeGenerator(allocator, block_size)
+    
+    def test_base_allocator_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            TransactionIdAllocator().reserve(1)
+    
+    def test_file_lock_allocator(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counter")
+            self.assertEqual(range(100, 110), FileLockAllocator(path, start=100).reserve(10))
+            self.assertEqual(range(110, 115), FileLockAllocator(path, start=100).reserve(5))
+    
+    def run_workers(self, allocator):
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        workers = [ctx.Process(target=generate_ids_in_worker, args=(allocator, 50, queue)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        ids = [i for _ in workers for i in queue.get(timeout=30)]
+        for worker in workers:
+            worker.join()
+        return ids
+    
+    def test_shared_memory_allocator_across_processes(self):
+        ids = self.run_workers(SharedMemoryAllocator())
+        self.assertEqual(200, len(set(ids)))
+    
+    def test_file_lock_allocator_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ids = self.run_workers(FileLockAllocator(os.path.join(tmp, "counter")))
+        self.assertEqual(200, len(set(ids)))
+    
+    def test_forked_child_discards_block(self):
+        allocator = SharedMemoryAllocator()
+        generator = ConfirmationCodeGenerator(allocator, block_size=100)
+        parent_ids = generate_ids(generator, 1)
+        
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        worker = ctx.Process(target=lambda: queue.put(generate_ids(generator, 1)))
+        worker.start()
+        child_ids = queue.get(timeout=30)
+        worker.join()
+        self.assertEqual([0], parent_ids)
+        self.assertEqual([100], child_ids)
+        self.assertEqual([1], generate_ids(generator, 1))
+    
+    def test_account_uses_generator(self):
+        default = Account.get_confirmation_code_generator()
+        try:
+            Account.set_confirmation_code_generator(ConfirmationCodeGenerator(CounterAllocator()))
+            a = Account("A100", "FIRST", "LAST")
+            self.assertTrue(a.deposit(10).endswith("-0"))
+            self.assertTrue(a.withdraw(5).endswith("-1"))
+        finally:
+            Account.set_confirmation_code_generator(default)
+    
+    def test_account_invalid_generator(self):
+        with self.assertRaises(ValueError):
+            Account.set_confirmation_code_generator(CounterAllocator())
+    
+    def test_reserve_codes_lazy(self):
+        generator = ConfirmationCodeGenerator(block_size=4)
+        generate_ids(generator, 2)
+        with mock.patch("generator.time.time", return_value=1553554158.5):
+            conf_codes = generator.reserve_codes("I", ["A100", "A101"], 3)
+        self.assertEqual([8], generate_ids(generator, 1))
+        self.assertEqual(6, len(conf_codes))
+        self.assertEqual("I-A100-20190325224918-2", conf_codes[0])
+        self.assertEqual("I-A101-20190325224918-7", conf_codes[-1])
+        self.assertEqual(["I-A100-20190325224918-4", "I-A101-20190325224918-5"], conf_codes[2:4])
+        self.assertEqual([conf_codes[i] for i in range(6)], list(conf_codes))
+        with self.assertRaises(IndexError):
+            conf_codes[6]
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestConfirmationCodeGenerator)
@@ -0,0 +1,96 @@
+"""
+Unit tests
+Command line: python test_history.py
+"""
+
+from account import TimeZone, Account
+from history import TransactionHistory
+from datetime import datetime, timedelta, timezone
+import unittest
+
+
+class TestTransactionHistory(unittest.TestCase):
+    def setUp(self):
+        self.codes = [
+            "D-A100-20190325100000-1",
+            "W-A100-20190325120000-2",
+            "X-A101-20190326080000-3",
+            "X-A100-20190326090000-4",
+            "D-A101-20190324230000-5",
+            "W-A100-20190327000000-6",
+        ]
+        self.history = TransactionHistory()
+        for code in self.codes:
+            self.history.add(code)
+    
+    def ids(self, confirmations):
+        return [int(c.transaction_id) for c in confirmations]
+    
+    def test_add_ok(self):
+        self.assertEqual(6, len(self.history))
+        confirmation = self.history.add("I-A102-20190325100000-7")
+        self.assertEqual(Account.parse_confirmation_code("I-A102-20190325100000-7"), confirmation)
+    
+    def test_add_invalid(self):
+        with self.assertRaises(ValueError):
+            self.history.add("not-a-code")
+        with self.assertRaises(ValueError):
+            self.history.add_confirmation(self.codes[0])
+    
+    def test_add_from_account(self):
+        a = Account("A200", "FIRST", "LAST", None, 10)
+        self.history.add(a.deposit(10))
+        self.history.add(a.withdraw(100))
+        self.assertEqual(["D", "X"], [c.transaction_code for c in self.history.query("A200")])
+    
+    def test_query_account_in_time_order(self):
+        self.assertEqual([1, 2, 4, 6], self.ids(self.history.query("A100")))
+        self.assertEqual([5, 3], self.ids(self.history.query("A101")))
+        self.assertEqual([], self.history.query("A999"))
+    
+    def test_query_account_time_range(self):
+        confirmations = self.history.query("A100", start=datetime(2019, 3, 25, 12), end=datetime(2019, 3, 27))
+        self.assertEqual([2, 4], self.ids(confirmations))
+        self.assertEqual([4, 6], self.ids(self.history.query("A100", start="2019-03-26")))
+    
+    def test_query_aware_bounds(self):
+        """Tests that bounds with a UTC offset are converted to UTC"""
+        
+        plus_5 = timezone(timedelta(hours=5))
+        start, end = datetime(2019, 3, 25, 16, tzinfo=plus_5), datetime(2019, 3, 25, 18, tzinfo=plus_5)
+        self.assertEqual([2], self.ids(self.history.query("A100", start=start, end=end)))
+        self.assertEqual([2], self.ids(self.history.query("A100", start=start.isoformat(), end=end.isoformat())))
+    
+    def test_query_account_and_code(self):
+        self.assertEqual([2, 6], self.ids(self.history.query("A100", "W")))
+        self.assertEqual([4], self.ids(self.history.query("A100", "X", start="2019-03-26", end="2019-03-27")))
+    
+    def test_query_code(self):
+        self.assertEqual([3, 4], self.ids(self.history.query(transaction_code="X")))
+        self.assertEqual([3], self.ids(self.history.query(transaction_code="X", end="2019-03-26T09:00:00")))
+        self.assertEqual([], self.history.query(transaction_code="I"))
+    
+    def test_query_all(self):
+        self.assertEqual([5, 1, 2, 3, 4, 6], self.ids(self.history.query()))
+    
+    def test_query_invalid_bound(self):
+        with self.assertRaises(ValueError):
+            self.history.query("A100", start=20190325)
+    
+    def test_extend(self):
+        history = TransactionHistory(TimeZone("TZ", -7, 0))
+        errors = history.extend(self.codes + ["bad"])
+        self.assertEqual(6, len(history))
+        self.assertEqual([7], [error.line_number for error in errors])
+        self.assertEqual(self.history.query("A100")[0].time_utc, history.query("A100")[0].time_utc)
+        self.assertTrue(history.query("A100")[0].time.endswith("(TZ)"))
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestTransactionHistory)
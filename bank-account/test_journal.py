@@ -0,0 +1,128 @@
+"""
+Unit tests
+Command line: python test_journal.py
+"""
+
+from account import Account
+from journal import TransactionJournal, JournaledAccount
+import os
+import tempfile
+import unittest
+
+
+class TestTransactionJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal.bin")
+    
+    def tearDown(self):
+        JournaledAccount.journal = None
+        self.tmp.cleanup()
+    
+    def test_append_and_read(self):
+        with TransactionJournal(self.path, capacity=2) as journal:
+            journal.append("D", "A-100", 10, 110, "D-A-100-20190325224918-101")
+            journal.append("X", "A-100", 500, 110, "X-A-100-20190325224919-102")
+            journal.append("O", "A101", 5, 5)
+            self.assertEqual(3, len(journal))
+        
+        records = TransactionJournal.read(self.path)
+        self.assertEqual(3, len(records))
+        self.assertEqual(b"A-100", records[0]["account_number"])
+        self.assertEqual(b"X", records[1]["transaction_code"])
+        self.assertEqual(102, records[1]["transaction_id"])
+        self.assertEqual(20190325224919, records[1]["timestamp"])
+        self.assertEqual(-1, records[2]["transaction_id"])
+    
+    def test_account_number_too_long(self):
+        with TransactionJournal(self.path) as journal:
+            with self.assertRaises(ValueError):
+                journal.append("D", "A" * 32, 10, 10)
+    
+    def test_not_a_journal(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * 128)
+        with self.assertRaises(ValueError):
+            TransactionJournal(self.path)
+    
+    def test_group_commit(self):
+        journal = TransactionJournal(self.path, group_size=3, commit_interval=3600)
+        for i in range(4):
+            journal.append("D", "A100", 1, i + 1)
+        self.assertEqual(3, journal.committed)
+        # uncommitted record is lost when reopened without commit
+        self.assertEqual(3, len(TransactionJournal.read(self.path)))
+        self.assertEqual(3, len(TransactionJournal(self.path)))
+        journal.commit()
+        self.assertEqual(4, len(TransactionJournal.read(self.path)))
+        journal.close()
+    
+    def test_reopen_appends(self):
+        with TransactionJournal(self.path) as journal:
+            journal.append("D", "A100", 1, 1)
+        with TransactionJournal(self.path) as journal:
+            journal.append("D", "A100", 1, 2)
+        self.assertEqual({"A100": 2}, TransactionJournal.replay(self.path))
+    
+    def test_replay_with_snapshots(self):
+        expected = {}
+        with TransactionJournal(self.path, capacity=4) as journal:
+            for i in range(25):
+                account_number = f"A{i % 4}"
+                journal.append("D", account_number, 1, i)
+                expected[account_number] = i
+        snapshot_path = self.path + ".snapshot.npz"
+        
+        self.assertEqual(expected, TransactionJournal.replay(self.path, snapshot_every=10))
+        self.assertTrue(os.path.exists(snapshot_path))
+        
+        with TransactionJournal(self.path) as journal:
+            journal.append("W", "A9", 1, 99)
+            expected["A9"] = 99
+        self.assertEqual(expected, TransactionJournal.replay(self.path, snapshot_every=10))
+        self.assertEqual(expected, TransactionJournal.replay(self.path, os.path.join(self.tmp.name, "none")))
+    
+    def test_journaled_account(self):
+        JournaledAccount.journal = TransactionJournal(self.path)
+        a = JournaledAccount("A100", "FIRST", "LAST", None, 100)
+        b = JournaledAccount("A101", "FIRST", "LAST")
+        a.deposit(50)
+        a.withdraw(500)
+        a.pay_interest()
+        b.deposit(10)
+        JournaledAccount.journal.close()
+        
+        records = TransactionJournal.read(self.path)
+        self.assertEqual([b"O", b"O", b"D", b"X", b"I", b"D"], list(records["transaction_code"]))
+        self.assertEqual(150 * Account.get_interest_rate() / 100, records[4]["amount"])
+        self.assertEqual({"A100": a.balance, "A101": b.balance}, TransactionJournal.replay(self.path))
+    
+    def test_journaled_account_accrue_interest(self):
+        """Tests that interest of many periods is journaled as one record with the compounded balance"""
+        
+        JournaledAccount.journal = TransactionJournal(self.path)
+        a = JournaledAccount("A1", "FIRST", "LAST", None, 100)
+        a.deposit(50)
+        conf_codes = a.accrue_interest(12)
+        a.accrue_interest(0)
+        JournaledAccount.journal.close()
+        
+        records = TransactionJournal.read(self.path)
+        self.assertEqual([b"O", b"D", b"I"], list(records["transaction_code"]))
+        self.assertEqual(a.balance - 150, records[2]["amount"])
+        self.assertEqual(int(conf_codes[-1].rsplit("-", 1)[1]), records[2]["transaction_id"])
+        self.assertEqual({"A1": a.balance}, TransactionJournal.replay(self.path))
+    
+    def test_journaled_account_without_journal(self):
+        with self.assertRaises(ValueError):
+            JournaledAccount("A100", "FIRST", "LAST")
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestTransactionJournal)
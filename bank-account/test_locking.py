@@ -0,0 +1,113 @@
+"""
+Unit tests
+Command line: python test_locking.py
+"""
+
+from account import Account
+from locking import LockStripes, ThreadSafeAccount, transfer
+import random
+import threading
+import unittest
+
+
+class TestThreadSafeAccount(unittest.TestCase):
+    def setUp(self):
+        self.src = ThreadSafeAccount("A100", "FIRST", "LAST", None, 100.00)
+        self.dst = ThreadSafeAccount("A101", "FIRST", "LAST", None, 50.00)
+    
+    def run_threads(self, target, count=8):
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def test_lock_stripes(self):
+        stripes = LockStripes(4)
+        self.assertEqual(4, len(stripes))
+        self.assertIs(stripes.lock("A100"), stripes.lock("A100"))
+        self.assertEqual(1, len(stripes.ordered_locks("A100", "A100")))
+        with self.assertRaises(ValueError):
+            LockStripes(0)
+    
+    def test_ordered_locks_consistent(self):
+        stripes = LockStripes(1024)
+        self.assertEqual(stripes.ordered_locks("A100", "A101"), stripes.ordered_locks("A101", "A100"))
+    
+    def test_transactions_ok(self):
+        self.assertTrue(self.src.deposit(100).startswith("D-"))
+        self.assertTrue(self.src.withdraw(50).startswith("W-"))
+        self.assertTrue(self.src.withdraw(500).startswith("X-"))
+        self.assertTrue(self.src.pay_interest().startswith("I-"))
+        self.assertEqual(150 + 150 * Account.get_interest_rate() / 100, self.src.balance)
+    
+    def test_transfer_ok(self):
+        withdraw_code, deposit_code = transfer(self.src, self.dst, 30)
+        self.assertTrue(withdraw_code.startswith("W-A100-"))
+        self.assertTrue(deposit_code.startswith("D-A101-"))
+        self.assertEqual(70, self.src.balance)
+        self.assertEqual(80, self.dst.balance)
+    
+    def test_transfer_insufficient_funds(self):
+        withdraw_code, deposit_code = transfer(self.src, self.dst, 300)
+        self.assertTrue(withdraw_code.startswith("X-"))
+        self.assertIsNone(deposit_code)
+        self.assertEqual(100, self.src.balance)
+        self.assertEqual(50, self.dst.balance)
+    
+    def test_transfer_invalid(self):
+        plain = Account("A102", "FIRST", "LAST")
+        test_transfers = (
+            (self.src, plain, 10),
+            (self.src, self.src, 10),
+            (self.src, self.dst, -10),
+            (self.src, self.dst, "10"),
+        )
+        
+        for i, args in enumerate(test_transfers):
+            with self.subTest(test_number=i):
+                with self.assertRaises(ValueError):
+                    transfer(*args)
+    
+    def test_concurrent_deposits_preserved(self):
+        def deposit(_):
+            for _ in range(2000):
+                self.src.deposit(1)
+        
+        self.run_threads(deposit)
+        self.assertEqual(100 + 8 * 2000, self.src.balance)
+    
+    def test_accrue_interest_takes_lock(self):
+        """Tests that compounded interest waits for the account's lock"""
+        
+        thread = threading.Thread(target=self.src.accrue_interest, args=(12,))
+        with self.src.lock:
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(100, self.src.balance)
+        thread.join()
+        self.assertAlmostEqual(100 * Account.interest_factor(12), self.src.balance)
+    
+    def test_concurrent_transfers_preserve_total(self):
+        accounts = [ThreadSafeAccount(f"B{i}", "FIRST", "LAST", None, 100) for i in range(10)]
+        
+        def transfer_randomly(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                src, dst = rng.sample(accounts, 2)
+                transfer(src, dst, rng.randint(1, 30))
+        
+        self.run_threads(transfer_randomly)
+        self.assertEqual(1000, sum(account.balance for account in accounts))
+        self.assertTrue(all(account.balance >= 0 for account in accounts))
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestThreadSafeAccount)
@@ -0,0 +1,104 @@
+"""
+Unit tests
+Command line: python test_registry.py
+"""
+
+from account import Account
+from locking import ThreadSafeAccount
+from registry import AccountRegistry
+import unittest
+
+
+class TestAccountRegistry(unittest.TestCase):
+    def setUp(self):
+        self.accounts = [
+            Account("A100", "Ada", "Lovelace"),
+            Account("A101", "alan", "Turing"),
+            Account("A102", "Grace", "Hopper"),
+            Account("A103", "Alan", "Kay"),
+        ]
+        self.registry = AccountRegistry(self.accounts)
+    
+    def numbers(self, accounts):
+        return [account.account_number for account in accounts]
+    
+    def test_get_ok(self):
+        self.assertEqual(4, len(self.registry))
+        self.assertIn("A102", self.registry)
+        self.assertIs(self.accounts[2], self.registry.get("A102"))
+    
+    def test_get_unknown(self):
+        with self.assertRaises(ValueError):
+            self.registry.get("Z1")
+    
+    def test_add_invalid(self):
+        with self.assertRaises(ValueError):
+            self.registry.add("A104")
+        with self.assertRaises(ValueError):
+            self.registry.add(Account("A100", "FIRST", "LAST"))
+        with self.assertRaises(ValueError):
+            self.registry.extend([Account("A200", "FIRST", "LAST"), Account("A200", "FIRST", "LAST")])
+        self.assertNotIn("A200", self.registry)
+    
+    def test_prefix_case_insensitive(self):
+        self.assertEqual(["A101", "A103"], sorted(self.numbers(self.registry.find_by_first_name("AL"))))
+        self.assertEqual(["A102"], self.numbers(self.registry.find_by_last_name("hop")))
+        self.assertEqual([], self.registry.find_by_last_name("x"))
+        self.assertEqual(["A102", "A103", "A100", "A101"], self.numbers(self.registry.find_by_last_name("")))
+    
+    def test_find_by_name(self):
+        self.assertEqual(["A101"], self.numbers(self.registry.find_by_name("ALAN", "turing")))
+        self.assertEqual([], self.registry.find_by_name("Alan", "Hopper"))
+    
+    def test_rename(self):
+        self.accounts[1].last_name = "Kayak"
+        self.assertEqual(["A103", "A101"], self.numbers(self.registry.find_by_last_name("kay")))
+        self.assertEqual([], self.registry.find_by_last_name("tur"))
+        self.accounts[0].first_name = "Augusta"
+        self.assertEqual(["A100"], self.numbers(self.registry.find_by_first_name("aug")))
+        self.assertEqual([], self.registry.find_by_first_name("ada"))
+    
+    def test_rename_invalid(self):
+        with self.assertRaises(ValueError):
+            self.accounts[1].last_name = " "
+        self.assertEqual(["A101"], self.numbers(self.registry.find_by_last_name("turing")))
+    
+    def test_remove(self):
+        account = self.registry.remove("A101")
+        self.assertIs(self.accounts[1], account)
+        self.assertNotIn("A101", self.registry)
+        self.assertEqual(["A103"], self.numbers(self.registry.find_by_first_name("alan")))
+        # no longer reindexed
+        account.last_name = "Hopkins"
+        self.assertEqual(["A102"], self.numbers(self.registry.find_by_last_name("hop")))
+    
+    def test_subclass_and_other_registry(self):
+        account = ThreadSafeAccount("T1", "Alan", "Smith")
+        other = AccountRegistry([account])
+        self.registry.add(Account("T2", "Alan", "Smith"))
+        account.first_name = "Bob"
+        self.assertEqual(["T1"], self.numbers(other.find_by_first_name("b")))
+        self.assertEqual(["T2"], self.numbers(self.registry.find_by_name("alan", "smith")))
+    
+    def test_observers_per_account(self):
+        """Tests that only registered accounts notify, and that registries are not kept alive"""
+        
+        self.assertIsNone(Account("T1", "Alan", "Smith")._name_observers)
+        self.assertEqual(1, len(self.accounts[0]._name_observers))
+        other = AccountRegistry([self.accounts[0]])
+        self.assertEqual(2, len(self.accounts[0]._name_observers))
+        del other
+        self.accounts[0].first_name = "Augusta"
+        self.assertEqual(["A100"], self.numbers(self.registry.find_by_first_name("aug")))
+        self.registry.remove("A100")
+        self.assertIsNone(self.accounts[0]._name_observers)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestAccountRegistry)
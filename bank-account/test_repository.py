@@ -0,0 +1,104 @@
+"""
+Unit tests
+Command line: python test_repository.py
+"""
+
+from account import TimeZone, Account
+from repository import AccountRepository
+import os
+import sqlite3
+import tempfile
+import unittest
+
+
+class TestAccountRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "accounts.db")
+        self.tz = TimeZone("TZ", 1, 30)
+        self.accounts = [
+            Account("A100", "FIRST", "LAST", self.tz, 100.00),
+            Account("A101", "FIRST", "OTHER", None, 50.00),
+            Account(102, "FIRST", "LAST", self.tz, 0),
+        ]
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def create_repository(self, batch_size=10000):
+        return AccountRepository(self.path, batch_size)
+    
+    def assertAccountEqual(self, expected, actual):
+        for attr_name in ("account_number", "first_name", "last_name", "timezone", "balance"):
+            self.assertEqual(getattr(expected, attr_name), getattr(actual, attr_name))
+    
+    def test_wal_mode(self):
+        with self.create_repository():
+            pass
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual("wal", connection.execute("PRAGMA journal_mode").fetchone()[0])
+    
+    def test_save_and_load_accounts(self):
+        with self.create_repository() as repository:
+            repository.save_accounts(self.accounts)
+        
+        with self.create_repository() as repository:
+            self.assertEqual(3, len(repository))
+            loaded = list(repository.load_accounts(chunk_size=2))
+        for expected, actual in zip(self.accounts, loaded):
+            self.assertAccountEqual(expected, actual)
+        self.assertIs(loaded[0].timezone, loaded[2].timezone)
+    
+    def test_save_account_updates(self):
+        with self.create_repository() as repository:
+            repository.save_accounts(self.accounts)
+            self.accounts[0].deposit(10)
+            self.accounts[0].last_name = "NEW"
+            repository.save_account(self.accounts[0])
+            self.assertEqual(3, len(repository))
+            self.assertAccountEqual(self.accounts[0], repository.get_account("A100"))
+    
+    def test_get_account_unknown(self):
+        with self.create_repository() as repository:
+            with self.assertRaises(ValueError):
+                repository.get_account("A999")
+    
+    def test_batched_writes(self):
+        repository = self.create_repository(batch_size=2)
+        repository.save_account(self.accounts[0])
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(0, connection.execute("SELECT COUNT(*) FROM accounts").fetchone()[0])
+            repository.save_account(self.accounts[1])
+            self.assertEqual(2, connection.execute("SELECT COUNT(*) FROM accounts").fetchone()[0])
+        repository.close()
+    
+    def test_transactions(self):
+        a = self.accounts[0]
+        codes = [a.deposit(10), a.withdraw(500), a.pay_interest()]
+        with self.create_repository() as repository:
+            for code in codes:
+                repository.save_transaction(a, code)
+            self.assertEqual(codes, repository.load_transactions("A100"))
+            self.assertEqual([], repository.load_transactions("A101"))
+    
+    def test_load_book(self):
+        with self.create_repository() as repository:
+            repository.save_accounts(self.accounts)
+            book = repository.load_book(chunk_size=2)
+            self.assertEqual(["A100", "A101", 102], list(book.account_numbers))
+            self.assertEqual([100, 50, 0], list(book.balances))
+            self.assertEqual(self.tz, book.timezone(102))
+            
+            book.deposit(["A101"], [25])
+            repository.save_book_balances(book)
+            self.assertEqual(75, repository.get_account("A101").balance)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestAccountRepository)
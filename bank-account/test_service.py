@@ -0,0 +1,81 @@
+"""
+Unit tests
+Command line: python test_service.py
+"""
+
+from account import Account
+from service import AccountService
+import asyncio
+import unittest
+
+
+class TestAccountService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.accounts = [
+            Account("A100", "FIRST", "LAST", None, 100.00),
+            Account("A101", "FIRST", "LAST", None, 50.00),
+        ]
+        self.service = AccountService(self.accounts)
+    
+    async def asyncTearDown(self):
+        await self.service.close()
+    
+    async def test_operations_ok(self):
+        self.assertTrue((await self.service.deposit("A100", 10)).startswith("D-A100-"))
+        self.assertTrue((await self.service.withdraw("A100", 500)).startswith("X-A100-"))
+        self.assertTrue((await self.service.withdraw("A100", 10)).startswith("W-A100-"))
+        self.assertTrue((await self.service.pay_interest("A101")).startswith("I-A101-"))
+        self.assertEqual(100, self.service.balance("A100"))
+        self.assertEqual(50 + 50 * Account.get_interest_rate() / 100, self.service.balance("A101"))
+    
+    async def test_deposits_coalesced(self):
+        calls = []
+        deposit_many = Account.deposit_many
+        
+        def spy(account, values):
+            calls.append(list(values))
+            return deposit_many(account, values)
+        
+        Account.deposit_many = spy
+        try:
+            conf_codes = await asyncio.gather(*(self.service.deposit("A100", 1) for _ in range(50)))
+        finally:
+            Account.deposit_many = deposit_many
+        self.assertEqual(150, self.service.balance("A100"))
+        self.assertEqual(50, len(set(conf_codes)))
+        self.assertEqual([[1] * 50], calls)
+    
+    async def test_order_preserved_per_account(self):
+        results = await asyncio.gather(
+            self.service.withdraw("A101", 60),
+            self.service.deposit("A101", 20),
+            self.service.deposit("A101", 20),
+            self.service.withdraw("A101", 60),
+            self.service.deposit("A100", 1),
+        )
+        self.assertEqual(["X", "D", "D", "W", "D"], [code[0] for code in results])
+        self.assertEqual(30, self.service.balance("A101"))
+    
+    async def test_invalid_requests(self):
+        with self.assertRaises(ValueError):
+            await self.service.deposit("A100", -1)
+        with self.assertRaises(ValueError):
+            await self.service.withdraw("A999", 1)
+        with self.assertRaises(ValueError):
+            self.service.register(self.accounts[0])
+        self.assertEqual(100, self.service.balance("A100"))
+    
+    async def test_closed(self):
+        await self.service.close()
+        with self.assertRaises(RuntimeError):
+            await self.service.deposit("A100", 1)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestAccountService)
@@ -0,0 +1,76 @@
+"""
+Unit tests
+Command line: python test_settlement.py
+"""
+
+from account import Account
+from settlement import SettlementEngine, settle_serial
+import random
+import unittest
+
+
+class TestSettlement(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(12)
+        self.opening = {f"A{i}": round(rng.uniform(0, 500), 2) for i in range(200)}
+        self.operations = [
+            (rng.choice(list(self.opening)), rng.choice(("deposit", "withdraw")), round(rng.uniform(0.01, 300), 2))
+            for _ in range(2000)
+        ]
+    
+    def accounts(self):
+        return [Account(n, "FIRST", "LAST", None, b) for n, b in self.opening.items()]
+    
+    def test_matches_serial(self):
+        serial = settle_serial(self.accounts(), self.operations)
+        sharded = SettlementEngine(max_workers=2, shards=5).settle(self.accounts(), self.operations)
+        self.assertEqual(serial.balances, sharded.balances)
+        self.assertEqual(
+            [code.split("-")[:2] for code in serial.confirmation_codes],
+            [code.split("-")[:2] for code in sharded.confirmation_codes],
+        )
+        self.assertEqual(
+            {n: code.split("-")[:2] for n, code in serial.interest_codes.items()},
+            {n: code.split("-")[:2] for n, code in sharded.interest_codes.items()},
+        )
+        self.assertIn("X", {code[0] for code in sharded.confirmation_codes})
+    
+    def test_transaction_ids_unique(self):
+        result = SettlementEngine(max_workers=2, shards=3).settle(self.accounts(), self.operations)
+        codes = result.confirmation_codes + list(result.interest_codes.values())
+        ids = [int(code.split("-")[-1]) for code in codes]
+        self.assertEqual(len(ids), len(set(ids)))
+        later = int(Account("B1", "FIRST", "LAST").deposit(1).split("-")[-1])
+        self.assertNotIn(later, ids)
+    
+    def test_no_interest(self):
+        result = SettlementEngine(max_workers=2).settle(self.accounts(), [("A1", "deposit", 10)], pay_interest=False)
+        self.assertEqual(self.opening["A1"] + 10, result.balances["A1"])
+        self.assertEqual(self.opening["A2"], result.balances["A2"])
+        self.assertEqual({}, result.interest_codes)
+    
+    def test_shard_stable(self):
+        shards = [SettlementEngine.shard(n, 7) for n in self.opening]
+        self.assertEqual(shards, [SettlementEngine.shard(n, 7) for n in self.opening])
+        self.assertTrue(all(0 <= s < 7 for s in shards))
+    
+    def test_invalid_operations(self):
+        engine = SettlementEngine(max_workers=1)
+        with self.assertRaises(ValueError):
+            engine.settle(self.accounts(), [("Z1", "deposit", 10)])
+        with self.assertRaises(ValueError):
+            engine.settle(self.accounts(), [("A1", "transfer", 10)])
+        with self.assertRaises(ValueError):
+            engine.settle(self.accounts(), [("A1", "deposit", 0)])
+        with self.assertRaises(ValueError):
+            settle_serial(self.accounts(), [("A1", "transfer", 10)])
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestSettlement)
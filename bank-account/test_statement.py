@@ -0,0 +1,109 @@
+"""
+Unit tests
+Command line: python test_statement.py
+"""
+
+from account import Account, TimeZone
+from registry import AccountRegistry
+from statement import StatementRenderer
+import os
+import tempfile
+import unittest
+
+
+class TestStatementRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.accounts = {
+            "A100": Account("A100", "Ada", "Lovelace", TimeZone("EST", -5, 0)),
+            "A101": Account("A101", "Alan", "Turing"),
+        }
+        self.codes = [
+            "D-A100-20190325224918-101\n",
+            "W-A101-20190325224918-102\n",
+            "\n",
+            "X-A100-20190326030000-103\n",
+            "I-A101-20190326030000-104\n",
+            "D-A100-20190326030001-105\n",
+        ]
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def read(self, renderer, account_number):
+        with open(renderer.path(account_number)) as f:
+            return f.read().splitlines()
+    
+    def test_render_ok(self):
+        renderer = StatementRenderer(self.accounts, self.tmp.name, chunk_size=2)
+        self.assertEqual(5, renderer.render(self.codes))
+        self.assertEqual([
+            "Statement of account A100, Ada Lovelace, times in EST",
+            "2019-03-25 17:49:18 (EST)  Deposit     101",
+            "2019-03-25 22:00:00 (EST)  Rejected    103",
+            "2019-03-25 22:00:01 (EST)  Deposit     105",
+        ], self.read(renderer, "A100"))
+        self.assertEqual([
+            "Statement of account A101, Alan Turing, times in UTC",
+            "2019-03-25 22:49:18 (UTC)  Withdrawal  102",
+            "2019-03-26 03:00:00 (UTC)  Interest    104",
+        ], self.read(renderer, "A101"))
+        self.assertEqual([], renderer.errors)
+    
+    def test_times_match_parse_confirmation_code(self):
+        renderer = StatementRenderer(self.accounts, self.tmp.name)
+        for account, line in renderer.lines(self.codes):
+            pass
+        code = self.codes[-1].strip()
+        expected = Account.parse_confirmation_code(code, self.accounts["A100"].timezone).time
+        self.assertTrue(line.startswith(expected))
+    
+    def test_output_flows_while_reading(self):
+        renderer = StatementRenderer(self.accounts, self.tmp.name, chunk_size=1)
+        path = renderer.path("A100")
+        
+        def codes():
+            yield self.codes[0]
+            yield self.codes[1]
+            self.assertTrue(os.path.exists(path))
+            yield self.codes[3]
+        
+        renderer.render(codes())
+        self.assertEqual(3, len(self.read(renderer, "A100")))
+    
+    def test_registry_and_errors(self):
+        renderer = StatementRenderer(AccountRegistry(self.accounts.values()), self.tmp.name)
+        codes = ["D-A100-20190325224918-101", "bad", "D-Z1-20190325224918-102", "D-A101-20191325224918-103"]
+        self.assertEqual(1, renderer.render(codes))
+        self.assertEqual([2, 3, 4], [error.line_number for error in renderer.errors])
+        self.assertEqual("Unknown account number Z1.", renderer.errors[1].message)
+        self.assertFalse(os.path.exists(renderer.path("A101")))
+    
+    def test_account_number_not_a_file_name(self):
+        """Tests that account numbers that would write outside the directory are reported, not used"""
+        
+        directory = os.path.join(self.tmp.name, "statements")
+        accounts = {number: Account(number, "Ada", "Lovelace") for number in ["../x", "..", "A100"]}
+        renderer = StatementRenderer(accounts, directory)
+        codes = ["D-../x-20190325224918-101", "D-..-20190325224918-102", "D-A100-20190325224918-103"]
+        self.assertEqual(1, renderer.render(codes))
+        self.assertEqual([1, 2], [error.line_number for error in renderer.errors])
+        self.assertEqual("Account number ../x cannot be used as a file name.", renderer.errors[0].message)
+        self.assertEqual(["A100.txt"], os.listdir(directory))
+        self.assertEqual(["statements"], os.listdir(self.tmp.name))
+        with self.assertRaises(ValueError):
+            renderer.path("../x")
+    
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            StatementRenderer(self.accounts, self.tmp.name, chunk_size=0)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestStatementRenderer)
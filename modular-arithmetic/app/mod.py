@@ -1,6 +1,12 @@
-from functools import total_ordering
+from functools import lru_cache, total_ordering
+import math
 import operator
 
+try:
+    import numpy as np
+except ImportError:  # only needed by ModArray
+    np = None
+
 
 @total_ordering
 class Mod:
@@ -24,7 +30,7 @@ class Mod:
             raise ValueError("Modulus can only be positive.")
         if not isinstance(residue, int):
             raise TypeError("Value can only be an integer.")
-
+        
         self._modulus = modulus
         self._residue = residue % modulus
     
@@ -107,6 +113,8 @@ class Mod:
         Returns:
             bool: True if two residues equal
         """
+        if isinstance(other, (ModArray, MontgomeryMod)):
+            return NotImplemented
         other_residue = self._get_residue(other)
         return other_residue == self.residue
     
@@ -121,6 +129,8 @@ class Mod:
         """
         # raising TypeError instead of returning NotImplemented would result in 
         # Python not trying reflection, which is ok since using @total_ordering
+        if isinstance(other, (ModArray, MontgomeryMod)):
+            return NotImplemented
         other_residue = self._get_residue(other)
         return self.residue < other_residue
     
@@ -138,7 +148,21 @@ class Mod:
         Returns:
             Mod: a Mod object
         """
-        return Mod(self.modulus, -self.residue)
+        return self._new(-self._residue % self._modulus)
+    
+    def _new(self, residue):
+        """
+
+        Args:
+            residue (int): residue, already reduced
+
+        Returns:
+            Mod: a new Mod object with the same modulus, without validation
+        """
+        result = object.__new__(Mod)
+        result._modulus = self._modulus
+        result._residue = residue
+        return result
     
     def _perform_operation(self, other, op, *, in_place=False):
         """Universal operations
@@ -151,12 +175,22 @@ class Mod:
         Returns:
             Mod: a Mod object
         """
-        other_residue = self._get_residue(other)
-        new_residue = op(self.residue, other_residue)
+        modulus = self._modulus
+        if type(other) is Mod and other._modulus == modulus:
+            other_residue = other._residue
+        elif isinstance(other, (ModArray, MontgomeryMod)):
+            return NotImplemented
+        else:
+            other_residue = self._get_residue(other)
+        new_residue = op(self._residue, other_residue) % modulus
         if in_place:
-            self.residue = new_residue % self.modulus
+            self.residue = new_residue
             return self
-        return Mod(self.modulus, new_residue)
+        # _new() inlined
+        result = object.__new__(Mod)
+        result._modulus = modulus
+        result._residue = new_residue
+        return result
     
     def __add__(self, other):
         """
@@ -206,13 +240,50 @@ class Mod:
         """
         return self._perform_operation(other, operator.mul, in_place=True)
     
+    def _get_exponent(self, other):
+        """Get exponent from other Mod object or integer value
+
+        Args:
+            other (type): other
+
+        Raises:
+            TypeError: other is not a Mod object or an integer
+
+        Returns:
+            int: residue of other Mod object, or integer value as is
+        """
+        if isinstance(other, Mod) and self.modulus == other.modulus:
+            return other.residue
+        if isinstance(other, int):
+            return other
+        raise TypeError("Incompatible types: Mod object with same modulus, or integer.")
+    
+    def _power(self, exponent):
+        """Power with modular reduction after every multiplication
+
+        Args:
+            exponent (int): exponent, negative for powers of the inverse
+
+        Raises:
+            ValueError: exponent is negative and residue is not invertible
+
+        Returns:
+            int: residue of the power
+        """
+        try:
+            return pow(self.residue, exponent, self.modulus)
+        except ValueError:
+            raise ValueError("Residue must be invertible for negative exponents.") from None
+    
     def __pow__(self, other):
         """
 
         Returns:
             Mod: a new Mod object
         """
-        return self._perform_operation(other, operator.pow)
+        if isinstance(other, (ModArray, MontgomeryMod)):
+            return NotImplemented
+        return self._new(self._power(self._get_exponent(other)))
     
     def __ipow__(self, other):
         """
@@ -220,5 +291,894 @@ class Mod:
         Returns:
             Mod: a modified Mod object
         """
-        return self._perform_operation(other, operator.pow, in_place=True)
+        if isinstance(other, (ModArray, MontgomeryMod)):
+            return NotImplemented
+        self.residue = self._power(self._get_exponent(other))
+        return self
+    
+    def fixed_base(self, window_bits=4):
+        """
+
+        Args:
+            window_bits (int, optional): bits of exponent per precomputed window. Defaults to 4.
+
+        Returns:
+            FixedBase: powers of self with precomputed windows
+        """
+        return FixedBase(self, window_bits)
+
+
+class FixedBase:
+    """Powers of a fixed Mod base to many exponents, with precomputed windows
+
+    For windows of w bits, the table holds base ** (d * 2 ** (w * i)) for every digit d of w bits
+    and window i, so a power takes one multiplication per non-zero window of the exponent and no
+    squaring. The table grows with the largest exponent seen and holds 2 ** w - 1 residues per
+    window. Faster than pow() for large moduli, where multiplications dominate the interpreter.
+    """
+    
+    def __init__(self, base, window_bits=4):
+        """
+
+        Args:
+            base (Mod): base
+            window_bits (int, optional): bits of exponent per precomputed window. Defaults to 4.
+
+        Raises:
+            TypeError: base is not a Mod object
+            ValueError: window_bits is not a positive integer
+        """
+        if not isinstance(base, Mod):
+            raise TypeError("Base can only be a Mod object.")
+        if not isinstance(window_bits, int) or window_bits <= 0:
+            raise ValueError("Window bits can only be a positive integer.")
+        self._base = Mod(base.modulus, base.residue)
+        self._window_bits = window_bits
+        self._table = []
+        self._next = base.residue  # base ** (2 ** (w * len(table)))
+    
+    @property
+    def base(self):
+        """
+
+        Returns:
+            Mod: base
+        """
+        return self._base
+    
+    @property
+    def window_bits(self):
+        """
+
+        Returns:
+            int: bits of exponent per precomputed window
+        """
+        return self._window_bits
+    
+    def _extend(self, bit_length):
+        """Precompute windows covering exponents of bit_length bits
+
+        Args:
+            bit_length (int): bit length of exponent
+        """
+        modulus = self._base.modulus
+        while len(self._table) * self._window_bits < bit_length:
+            window_base = self._next
+            row = [1 % modulus, window_base]
+            for _ in range(2, 1 << self._window_bits):
+                row.append(row[-1] * window_base % modulus)
+            self._table.append(row)
+            self._next = row[-1] * window_base % modulus
+    
+    def pow(self, exponent):
+        """
+
+        Args:
+            exponent (Mod or int): exponent, as for Mod.__pow__
+
+        Raises:
+            TypeError: exponent is not a Mod object with the same modulus or an integer
+            ValueError: exponent is negative and base is not invertible
+
+        Returns:
+            Mod: base raised to exponent
+        """
+        exponent = self._base._get_exponent(exponent)
+        modulus = self._base.modulus
+        if exponent < 0:
+            return self.pow(-exponent) ** -1
+        self._extend(exponent.bit_length())
+        
+        residue = 1 % modulus
+        mask = (1 << self._window_bits) - 1
+        for row in self._table:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                residue = residue * row[digit] % modulus
+            exponent >>= self._window_bits
+        return Mod(modulus, residue)
+
+
+class ModArray:
+    """ModArray class for element-wise modular arithmetic on residues sharing one modulus
+
+    Residues are stored in an int64 array for moduli up to 2 ** 62, where the sum of two residues
+    fits in int64, and in an object array of integers for larger moduli. Products of int64
+    residues that may not fit in int64 are reduced in 31-bit halves of one factor, each with a
+    floating-point estimate of the quotient corrected with wrapping int64 arithmetic.
+    """
+    
+    # numpy defers operations with ndarray and numpy scalars to the reflected methods
+    __array_ufunc__ = None
+    # element-wise __eq__
+    __hash__ = None
+    _MAX_INT64_MODULUS = 2 ** 62
+    # largest modulus whose products of two residues fit in int64
+    _MAX_DIRECT_MODULUS = math.isqrt(2 ** 63 - 1) + 1
+    _LOW_BITS = 31
+    
+    def __init__(self, modulus, residues):
+        """
+
+        Args:
+            modulus (type): modulus
+            residues (type): one-dimensional list or array of raw residues
+
+        Raises:
+            ImportError: numpy is not installed
+            TypeError: modulus is not an integer
+            ValueError: modulus is positive
+            TypeError: values are not integers
+            ValueError: values are not one-dimensional
+        """
+        if np is None:
+            raise ImportError("ModArray requires numpy.")
+        if not isinstance(modulus, int):
+            raise TypeError("Modulus can only be an integer.")
+        if modulus <= 0:
+            raise ValueError("Modulus can only be positive.")
+        
+        self._modulus = modulus
+        self._residues = self._reduce(residues)
+    
+    def _reduce(self, values):
+        """
+
+        Args:
+            values (type): one-dimensional list or array of raw residues
+
+        Raises:
+            TypeError: values are not integers
+            ValueError: values are not one-dimensional
+
+        Returns:
+            numpy.ndarray: residues, int64 for moduli up to 2 ** 62, else object
+        """
+        modulus = self._modulus
+        int64 = modulus <= ModArray._MAX_INT64_MODULUS
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+            if not values:
+                return np.zeros(0, dtype=np.int64 if int64 else object)
+            values = np.array(values, dtype=object)
+        if values.ndim != 1:
+            raise ValueError("Values can only be one-dimensional.")
+        
+        if values.dtype.kind == "O":
+            if not all(isinstance(value, (int, np.integer)) for value in values):
+                raise TypeError("Values can only be integers.")
+            residues = np.fromiter((int(value) % modulus for value in values), dtype=object, count=len(values))
+            return residues.astype(np.int64) if int64 else residues
+        if values.dtype.kind == "u" and int64:
+            # residues of uint64 values fit in int64
+            return (values % np.uint64(modulus)).astype(np.int64)
+        if values.dtype.kind in "iu" and int64:
+            return values.astype(np.int64) % modulus
+        if values.dtype.kind in "iu":
+            return values.astype(object) % modulus
+        raise TypeError("Values can only be integers.")
+    
+    def _new(self, residues):
+        """
+
+        Args:
+            residues (numpy.ndarray): reduced residues
+
+        Returns:
+            ModArray: a new ModArray object with the same modulus, without reducing residues
+        """
+        result = ModArray.__new__(ModArray)
+        result._modulus = self._modulus
+        result._residues = residues
+        return result
+    
+    @property
+    def modulus(self):
+        """
+
+        Returns:
+            int: modulus
+        """
+        return self._modulus
+    
+    @property
+    def residues(self):
+        """
+
+        Returns:
+            numpy.ndarray: read-only view of residues
+        """
+        residues = self._residues.view()
+        residues.flags.writeable = False
+        return residues
+    
+    def __len__(self):
+        """
+
+        Returns:
+            int: number of residues
+        """
+        return len(self._residues)
+    
+    def __getitem__(self, index):
+        """
+
+        Args:
+            index (type): integer index, slice or index array
+
+        Returns:
+            Mod: a Mod object for an integer index
+            ModArray: a new ModArray object otherwise
+        """
+        residues = self._residues[index]
+        if isinstance(residues, np.ndarray):
+            return self._new(residues)
+        return Mod(self._modulus, int(residues))
+    
+    def __iter__(self):
+        """
+
+        Yields:
+            Mod: a Mod object per residue
+        """
+        for residue in self._residues.tolist():
+            yield Mod(self._modulus, residue)
+    
+    def __repr__(self):
+        """
+
+        Returns:
+            str: detailed representation
+        """
+        return f"ModArray({self._modulus}, {self._residues.tolist()})"
+    
+    def _get_residues(self, other):
+        """Get residues from other ModArray object, residue from Mod object or integer value
+
+        Args:
+            other (type): other
+
+        Raises:
+            TypeError: other is not a ModArray or a Mod object with same modulus, or an integer
+
+        Returns:
+            numpy.ndarray: residues of other ModArray object
+            type: residue, of the dtype of residues
+        """
+        if isinstance(other, ModArray) and self._modulus == other.modulus:
+            return other._residues
+        if isinstance(other, Mod) and self._modulus == other.modulus:
+            residue = other.residue
+        elif isinstance(other, (int, np.integer)):
+            residue = int(other) % self._modulus
+        else:
+            raise TypeError("Incompatible types: ModArray or Mod object with same modulus, or integer.")
+        return residue if self._residues.dtype == object else np.int64(residue)
+    
+    def _multiply(self, left, right):
+        """Products of residues without overflow
+
+        Args:
+            left (numpy.ndarray): residues
+            right (type): residues or residue
+
+        Returns:
+            numpy.ndarray: residues of products
+        """
+        modulus = self._modulus
+        if left.dtype == object or modulus <= ModArray._MAX_DIRECT_MODULUS:
+            return left * right % modulus
+        # left * right = left * high * 2 ** 31 + left * low, with factors of at most 31 bits
+        high = self._multiply_small(left, right >> ModArray._LOW_BITS)
+        high = self._multiply_small(high, np.int64(1 << ModArray._LOW_BITS))
+        low = self._multiply_small(left, right & ((1 << ModArray._LOW_BITS) - 1))
+        residues = high + low
+        np.subtract(residues, modulus, out=residues, where=residues >= modulus)
+        return residues
+    
+    def _multiply_small(self, left, right):
+        """Products of int64 residues and factors of at most 31 bits, for moduli up to 2 ** 62
+
+        The quotient of each product is estimated in float64 with an error below 1, so the remainder
+        computed in wrapping int64 arithmetic is off by at most one modulus.
+
+        Args:
+            left (numpy.ndarray): residues
+            right (type): factors of at most 31 bits
+
+        Returns:
+            numpy.ndarray: residues of products
+        """
+        modulus = self._modulus
+        quotients = np.floor(left.astype(np.float64) * right / modulus).astype(np.int64)
+        with np.errstate(over="ignore"):
+            residues = np.asarray(left * right - quotients * modulus)
+        np.add(residues, modulus, out=residues, where=residues < 0)
+        np.subtract(residues, modulus, out=residues, where=residues >= modulus)
+        return residues
+    
+    def _power(self, bases, exponents):
+        """Powers with modular reduction after every multiplication
+
+        Args:
+            bases (type): residues or residue
+            exponents (type): non-negative residues, or integer exponent, negative for powers of the inverse
+
+        Raises:
+            ValueError: exponent is negative and a residue is not invertible
+
+        Returns:
+            numpy.ndarray: residues of powers
+        """
+        modulus = self._modulus
+        shape = np.broadcast_shapes(np.shape(bases), np.shape(exponents))
+        large = isinstance(exponents, int) and not 0 <= exponents < 2 ** 63
+        if large or self._residues.dtype == object:
+            # inverses, exponents beyond int64, and powers of Python integers are computed by pow() one by one
+            try:
+                powers = np.frompyfunc(pow, 3, 1)(
+                    np.broadcast_to(np.asarray(bases).astype(object), shape),
+                    np.asarray(exponents).astype(object), modulus,
+                )
+            except ValueError:
+                raise ValueError("Residues must be invertible for negative exponents.") from None
+            powers = np.asarray(powers, dtype=object).reshape(shape)
+            return powers if self._residues.dtype == object else powers.astype(np.int64)
+        
+        bases = np.broadcast_to(np.asarray(bases, dtype=np.int64), shape).copy()
+        exponents = np.broadcast_to(np.asarray(exponents, dtype=np.int64), shape).copy()
+        powers = np.full(shape, 1 % modulus, dtype=np.int64)
+        while exponents.any():
+            odd = (exponents & 1).astype(bool)
+            powers[odd] = self._multiply(powers[odd], bases[odd])
+            exponents >>= 1
+            bases = self._multiply(bases, bases)
+        return powers
+    
+    def _get_exponents(self, other):
+        """Get exponents from other ModArray object, Mod object or integer value
+
+        Args:
+            other (type): other
+
+        Raises:
+            TypeError: other is not a ModArray or a Mod object with same modulus, or an integer
+
+        Returns:
+            numpy.ndarray: residues of other ModArray object
+            int: residue of Mod object, or integer value as is
+        """
+        if isinstance(other, ModArray) and self._modulus == other.modulus:
+            return other._residues
+        if isinstance(other, Mod) and self._modulus == other.modulus:
+            return other.residue
+        if isinstance(other, (int, np.integer)):
+            return int(other)
+        raise TypeError("Incompatible types: ModArray or Mod object with same modulus, or integer.")
+    
+    def __eq__(self, other):
+        """Element-wise equality based on residues
+
+        Returns:
+            numpy.ndarray: True where residues equal
+        """
+        return np.asarray(self._residues == self._get_residues(other), dtype=bool)
+    
+    def __ne__(self, other):
+        """
+
+        Returns:
+            numpy.ndarray: True where residues differ
+        """
+        return np.asarray(self._residues != self._get_residues(other), dtype=bool)
+    
+    def __lt__(self, other):
+        """Element-wise ordering based on residues
+
+        Returns:
+            numpy.ndarray: True where residues of self are less than those of other
+        """
+        return np.asarray(self._residues < self._get_residues(other), dtype=bool)
+    
+    def __le__(self, other):
+        """
+
+        Returns:
+            numpy.ndarray: True where residues of self are less than or equal to those of other
+        """
+        return np.asarray(self._residues <= self._get_residues(other), dtype=bool)
+    
+    def __gt__(self, other):
+        """
+
+        Returns:
+            numpy.ndarray: True where residues of self are greater than those of other
+        """
+        return np.asarray(self._residues > self._get_residues(other), dtype=bool)
+    
+    def __ge__(self, other):
+        """
+
+        Returns:
+            numpy.ndarray: True where residues of self are greater than or equal to those of other
+        """
+        return np.asarray(self._residues >= self._get_residues(other), dtype=bool)
+    
+    def __neg__(self):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        residues = self._modulus - self._residues
+        residues[residues == self._modulus] = 0
+        return self._new(residues)
+    
+    def __add__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        residues = self._residues + self._get_residues(other)
+        np.subtract(residues, self._modulus, out=residues, where=residues >= self._modulus)
+        return self._new(residues)
+    
+    def __radd__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return self + other
+    
+    def __sub__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        residues = self._residues - self._get_residues(other)
+        np.add(residues, self._modulus, out=residues, where=residues < 0)
+        return self._new(residues)
+    
+    def __rsub__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return -self + other
+    
+    def __mul__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return self._new(self._multiply(self._residues, self._get_residues(other)))
+    
+    def __rmul__(self, other):
+        """
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return self * other
+    
+    def __pow__(self, other):
+        """Element-wise powers, to residues of other ModArray or Mod object, or to an integer as is
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return self._new(self._power(self._residues, self._get_exponents(other)))
+    
+    def __rpow__(self, other):
+        """Powers of other Mod object or integer to each residue
+
+        Returns:
+            ModArray: a new ModArray object
+        """
+        return self._new(self._power(self._get_residues(other), self._residues))
+    
+    def sum(self):
+        """
+
+        Returns:
+            Mod: sum of residues
+        """
+        if self._residues.dtype == object:
+            return Mod(self._modulus, int(self._residues.sum()))
+        # sums of 31-bit halves fit in int64 for up to 2 ** 32 residues
+        high = int((self._residues >> ModArray._LOW_BITS).sum())
+        low = int((self._residues & ((1 << ModArray._LOW_BITS) - 1)).sum())
+        return Mod(self._modulus, (high << ModArray._LOW_BITS) + low)
+    
+    def prod(self):
+        """
+
+        Returns:
+            Mod: product of residues
+        """
+        residues = self._residues
+        if residues.dtype == object:
+            product = 1
+            for residue in residues:
+                product = product * residue % self._modulus
+            return Mod(self._modulus, product)
+        # pairwise products, halving the number of residues each round
+        while len(residues) > 1:
+            half = len(residues) // 2
+            products = self._multiply(residues[:half], residues[half:2 * half])
+            residues = np.concatenate([products, residues[2 * half:]])
+        return Mod(self._modulus, int(residues[0]) if len(residues) else 1)
+
+
+@lru_cache(maxsize=64)
+def _montgomery_parameters(modulus):
+    """
+
+    Args:
+        modulus (int): odd modulus
+
+    Returns:
+        tuple: modulus, bits k of R = 2 ** k > modulus, R - 1, and -modulus ** -1 mod R
+    """
+    bits = modulus.bit_length()
+    mask = (1 << bits) - 1
+    return modulus, bits, mask, -pow(modulus, -1, 1 << bits) & mask
+
+
+@total_ordering
+class MontgomeryMod:
+    """MontgomeryMod class for repeated multiplications modulo the same odd modulus
+
+    A residue x is kept in Montgomery form x * R mod modulus, with R the smallest power of 2 above
+    the modulus. Products of two values are reduced with shifts and masks instead of a division,
+    and new values skip the validation of the initializer. Residues are converted back lazily, by
+    `residue`, `int()` and `repr()`. Equal to a Mod object with the same modulus and residue.
+    """
+    
+    __slots__ = ("_parameters", "_value")
+    
+    def __init__(self, modulus, residue):
+        """
+
+        Args:
+            modulus (type): modulus
+            residue (type): raw residue
+
+        Raises:
+            TypeError: modulus is not an integer
+            ValueError: modulus is positive and odd
+            TypeError: value is not an integer
+        """
+        if not isinstance(modulus, int):
+            raise TypeError("Modulus can only be an integer.")
+        if modulus <= 0 or modulus % 2 == 0:
+            raise ValueError("Modulus can only be positive and odd.")
+        if not isinstance(residue, int):
+            raise TypeError("Value can only be an integer.")
+        
+        self._parameters = _montgomery_parameters(modulus)
+        self._value = (residue << self._parameters[1]) % modulus
+    
+    def _new(self, value):
+        """
 
+        Args:
+            value (int): value in Montgomery form
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object with the same modulus, without validation
+        """
+        result = object.__new__(MontgomeryMod)
+        result._parameters = self._parameters
+        result._value = value
+        return result
+    
+    def _reduce(self, value):
+        """Montgomery reduction
+
+        Args:
+            value (int): value less than modulus * R
+
+        Returns:
+            int: value * R ** -1 mod modulus
+        """
+        modulus, bits, mask, factor = self._parameters
+        value = (value + ((value & mask) * factor & mask) * modulus) >> bits
+        return value - modulus if value >= modulus else value
+    
+    @property
+    def modulus(self):
+        """
+
+        Returns:
+            int: modulus
+        """
+        return self._parameters[0]
+    
+    @property
+    def residue(self):
+        """
+
+        Returns:
+            int: residue, converted from Montgomery form
+        """
+        return self._reduce(self._value)
+    
+    def __int__(self):
+        """
+
+        Returns:
+            int: residue
+        """
+        return self.residue
+    
+    def __repr__(self):
+        """
+
+        Returns:
+            str: detailed representation
+        """
+        return f"MontgomeryMod({self.modulus}, {self.residue})"
+    
+    def to_mod(self):
+        """
+
+        Returns:
+            Mod: a Mod object with the same modulus and residue
+        """
+        return Mod(self.modulus, self.residue)
+    
+    def _get_value(self, other):
+        """Get value in Montgomery form from other MontgomeryMod object, Mod object or integer value
+
+        Args:
+            other (type): other
+
+        Raises:
+            TypeError: other is not a MontgomeryMod or a Mod object with same modulus, or an integer
+
+        Returns:
+            int: value in Montgomery form
+        """
+        if isinstance(other, MontgomeryMod) and self._parameters[0] == other._parameters[0]:
+            return other._value
+        if isinstance(other, Mod) and self._parameters[0] == other.modulus:
+            other = other.residue
+        elif not isinstance(other, int):
+            raise TypeError("Incompatible types: MontgomeryMod or Mod object with same modulus, or integer.")
+        return (other << self._parameters[1]) % self._parameters[0]
+    
+    def __eq__(self, other):
+        """Equality based on residue
+
+        Args:
+            other (type): other
+
+        Returns:
+            bool: True if two residues equal
+        """
+        return self._value == self._get_value(other)
+    
+    def __lt__(self, other):
+        """Ordering based on residue
+
+        Args:
+            other (type): other
+
+        Returns:
+            bool: True if residue of self is less than that of other
+        """
+        return self.residue < self._reduce(self._get_value(other))
+    
+    def __hash__(self):
+        """
+
+        Returns:
+            int: hash value, the same as that of an equal Mod object
+        """
+        return hash((self.modulus, self.residue))
+    
+    def __neg__(self):
+        """
+
+        Returns:
+            MontgomeryMod: a MontgomeryMod object
+        """
+        return self._new(-self._value % self._parameters[0])
+    
+    def _add(self, other, sign):
+        """
+
+        Args:
+            other (type): other
+            sign (int): 1 to add, -1 to subtract
+
+        Returns:
+            int: value in Montgomery form
+        """
+        value = self._value + sign * self._get_value(other)
+        modulus = self._parameters[0]
+        if value >= modulus:
+            return value - modulus
+        return value + modulus if value < 0 else value
+    
+    def _multiply(self, other):
+        """
+
+        Args:
+            other (type): other
+
+        Returns:
+            int: value in Montgomery form
+        """
+        parameters = self._parameters
+        if type(other) is MontgomeryMod and other._parameters is parameters:
+            # _reduce() inlined, parameters are shared by values of a modulus
+            modulus, bits, mask, factor = parameters
+            value = self._value * other._value
+            value = (value + ((value & mask) * factor & mask) * modulus) >> bits
+            return value - modulus if value >= modulus else value
+        if isinstance(other, MontgomeryMod) and parameters[0] == other._parameters[0]:
+            return self._reduce(self._value * other._value)
+        if isinstance(other, int):
+            # x * R * other is already in Montgomery form
+            return self._value * other % self._parameters[0]
+        return self._reduce(self._value * self._get_value(other))
+    
+    def _power(self, other):
+        """
+
+        Args:
+            other (type): exponent, residue of a MontgomeryMod or Mod object or integer as is
+
+        Raises:
+            TypeError: other is not a MontgomeryMod or a Mod object with same modulus, or an integer
+            ValueError: exponent is negative and residue is not invertible
+
+        Returns:
+            int: value in Montgomery form
+        """
+        modulus, bits = self._parameters[:2]
+        if isinstance(other, (MontgomeryMod, Mod)) and other.modulus == modulus:
+            exponent = other.residue
+        elif isinstance(other, int):
+            exponent = other
+        else:
+            raise TypeError("Incompatible types: MontgomeryMod or Mod object with same modulus, or integer.")
+        try:
+            residue = pow(self.residue, exponent, modulus)
+        except ValueError:
+            raise ValueError("Residue must be invertible for negative exponents.") from None
+        return (residue << bits) % modulus
+    
+    def __add__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return self._new(self._add(other, 1))
+    
+    def __radd__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return self._new(self._add(other, 1))
+    
+    def __iadd__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a modified MontgomeryMod object
+        """
+        self._value = self._add(other, 1)
+        return self
+    
+    def __sub__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return self._new(self._add(other, -1))
+    
+    def __rsub__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return -self + other
+    
+    def __isub__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a modified MontgomeryMod object
+        """
+        self._value = self._add(other, -1)
+        return self
+    
+    def __mul__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        result = object.__new__(MontgomeryMod)
+        result._value = self._multiply(other)
+        result._parameters = self._parameters
+        return result
+    
+    def __rmul__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return self._new(self._multiply(other))
+    
+    def __imul__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a modified MontgomeryMod object
+        """
+        self._value = self._multiply(other)
+        return self
+    
+    def __pow__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        return self._new(self._power(other))
+    
+    def __rpow__(self, other):
+        """Power of other Mod object or integer to the residue
+
+        Returns:
+            MontgomeryMod: a new MontgomeryMod object
+        """
+        modulus, bits = self._parameters[:2]
+        base = self._reduce(self._get_value(other))
+        return self._new((pow(base, self.residue, modulus) << bits) % modulus)
+    
+    def __ipow__(self, other):
+        """
+
+        Returns:
+            MontgomeryMod: a modified MontgomeryMod object
+        """
+        self._value = self._power(other)
+        return self
@@ -0,0 +1,36 @@
+"""
+Benchmark for repeated multiplications modulo the same large odd modulus
+Command line: python bench_montgomery.py [multiplications]
+"""
+
+import random
+import sys
+import timeit
+
+from app.mod import Mod, MontgomeryMod
+
+
+def main(count):
+    rng = random.Random(0)
+    print(f"{'bits':>6}{'int %':>12}{'int REDC':>12}{'Mod':>12}{'MontgomeryMod':>15}")
+    for bits in [256, 512, 1024, 2048, 4096]:
+        modulus = rng.getrandbits(bits) | 1 << (bits - 1) | 1
+        x, y = rng.randrange(modulus), rng.randrange(modulus)
+        mask = (1 << bits) - 1
+        factor = -pow(modulus, -1, 1 << bits) & mask
+        timings = []
+        for setup, statement in [
+            ("a = x", "a = a * y % modulus"),
+            # Montgomery reduction of values in Montgomery form, with R = 2 ** bits
+            ("a = x", "t = a * y; t = (t + ((t & mask) * factor & mask) * modulus) >> bits; a = t - modulus if t >= modulus else t"),
+            ("a = Mod(modulus, x); b = Mod(modulus, y)", "a = a * b"),
+            ("a = MontgomeryMod(modulus, x); b = MontgomeryMod(modulus, y)", "a = a * b"),
+        ]:
+            namespace = {"Mod": Mod, "MontgomeryMod": MontgomeryMod, "modulus": modulus, "x": x, "y": y, "mask": mask, "factor": factor, "bits": bits}
+            seconds = min(timeit.repeat(statement, setup, globals=namespace, number=count, repeat=5))
+            timings.append(seconds / count * 1e9)
+        print(f"{bits:>6}{timings[0]:>9.0f} ns{timings[1]:>9.0f} ns{timings[2]:>9.0f} ns{timings[3]:>12.0f} ns")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -5,7 +5,14 @@ Command line: python -m pytest tests/unit
 
 import pytest
 
-from app.mod import Mod
+from app.mod import FixedBase, Mod, ModArray, MontgomeryMod
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason="ModArray requires numpy")
 
 
 @pytest.fixture
@@ -101,6 +108,13 @@ def test_imul_ok(mod, other):
     mod *= other
     assert mod.residue == 2
 
+def test_operation_results_match_initializer():
+    a, b = Mod(11, 3), Mod(11, 4)
+    for result, residue in [(a + b, 7), (a - b, 10), (a * b, 1), (a * -5, 7), (-a, 8), (a ** 3, 5)]:
+        assert type(result) is Mod
+        assert (result.modulus, result.residue) == (11, residue)
+        assert hash(result) == hash(Mod(11, residue))
+
 @pytest.mark.parametrize("other", [Mod(10, 4), Mod(10, 14), 4])
 def test_pow_ok(mod, other):
     result = mod ** other
@@ -110,3 +124,202 @@ def test_pow_ok(mod, other):
 def test_ipow_ok(mod, other):
     mod **= other
     assert mod.residue == 1
+
+def test_pow_int_exponent_not_reduced(mod):
+    assert (mod ** 14).residue == pow(3, 14, 10)
+
+def test_pow_large_exponent():
+    result = Mod(10 ** 9 + 7, 3) ** 10 ** 6
+    assert result.residue == pow(3, 10 ** 6, 10 ** 9 + 7)
+
+@pytest.mark.parametrize("exponent", [-1, -3])
+def test_pow_negative_exponent(mod, exponent):
+    result = mod ** exponent
+    assert (result * mod ** -exponent).residue == 1
+
+def test_pow_negative_exponent_not_invertible():
+    with pytest.raises(ValueError):
+        Mod(10, 4) ** -1
+
+def test_ipow_negative_exponent(mod):
+    mod **= -1
+    assert mod.residue == 7
+
+@pytest.mark.parametrize("modulus, residue, window_bits", [(10, 3, 4), (1, 0, 4), (2 ** 127 - 1, 5, 3), (997, 0, 1)])
+def test_fixed_base_pow_ok(modulus, residue, window_bits):
+    base = Mod(modulus, residue)
+    fixed = base.fixed_base(window_bits)
+    for exponent in [0, 1, 2, 15, 16, 17, 2 ** 64 + 12345, 3 ** 200]:
+        assert fixed.pow(exponent) == base ** exponent
+        assert fixed.pow(exponent).modulus == modulus
+
+def test_fixed_base_pow_negative_and_mod_exponent(mod):
+    fixed = mod.fixed_base()
+    assert fixed.pow(-3) == mod ** -3
+    assert fixed.pow(Mod(10, 14)) == mod ** Mod(10, 14)
+
+def test_fixed_base_invalid(mod):
+    with pytest.raises(TypeError):
+        mod.fixed_base().pow(Mod(13, 3))
+    with pytest.raises(ValueError):
+        Mod(10, 4).fixed_base().pow(-1)
+    with pytest.raises(ValueError):
+        mod.fixed_base(0)
+    with pytest.raises(TypeError):
+        FixedBase(3)
+
+@requires_numpy
+@pytest.mark.parametrize("modulus", [10, 2 ** 62, 2 ** 62 + 1])
+def test_create_mod_array_ok(modulus):
+    residues = [3, -1, 13, 2 ** 70]
+    array = ModArray(modulus, residues)
+    assert array.modulus == modulus
+    assert array.residues.tolist() == [residue % modulus for residue in residues]
+    assert array.residues.dtype == (np.int64 if modulus <= 2 ** 62 else object)
+    assert ModArray(modulus, np.array([3, -1], dtype=np.int8)).residues.tolist() == [3, modulus - 1]
+    assert len(ModArray(modulus, [])) == 0
+
+@requires_numpy
+@pytest.mark.parametrize("residues", [["3"], [3.0], np.array([3.0]) if np else None])
+def test_create_mod_array_invalid_residues_type(residues):
+    with pytest.raises(TypeError):
+        ModArray(10, residues)
+
+@requires_numpy
+def test_create_mod_array_invalid():
+    with pytest.raises(TypeError):
+        ModArray(10.0, [3])
+    with pytest.raises(ValueError):
+        ModArray(-10, [3])
+    with pytest.raises(ValueError):
+        ModArray(10, np.zeros((2, 2), dtype=int))
+
+@requires_numpy
+def test_mod_array_items():
+    array = ModArray(10, [3, 14, 5])
+    assert array[1] == Mod(10, 4)
+    assert list(array) == [Mod(10, 3), Mod(10, 4), Mod(10, 5)]
+    assert array[1:].residues.tolist() == [4, 5]
+    assert repr(array) == "ModArray(10, [3, 4, 5])"
+    with pytest.raises(ValueError):
+        array.residues[0] = 1
+
+# moduli with direct int64 products, with products in 31-bit halves, and with object residues
+@requires_numpy
+@pytest.mark.parametrize("modulus", [10 ** 9 + 7, 2 ** 61 - 1, 2 ** 62, 2 ** 127 - 1])
+def test_mod_array_operations_ok(modulus):
+    left = [0, 1, modulus - 1, modulus // 3, 12345678901234567 % modulus]
+    right = [modulus - 1, modulus - 1, modulus - 1, 7, modulus // 2]
+    a, b = ModArray(modulus, left), ModArray(modulus, right)
+    assert (a + b).residues.tolist() == [(x + y) % modulus for x, y in zip(left, right)]
+    assert (a - b).residues.tolist() == [(x - y) % modulus for x, y in zip(left, right)]
+    assert (a * b).residues.tolist() == [x * y % modulus for x, y in zip(left, right)]
+    assert (a ** b).residues.tolist() == [pow(x, y, modulus) for x, y in zip(left, right)]
+    assert (a ** 65537).residues.tolist() == [pow(x, 65537, modulus) for x in left]
+    assert (-a).residues.tolist() == [-x % modulus for x in left]
+    assert (a < b).tolist() == [x < y for x, y in zip(left, right)]
+    assert (a == b).tolist() == [x == y for x, y in zip(left, right)]
+    assert a.sum() == Mod(modulus, sum(left))
+    product = 1
+    for x in right:
+        product = product * x % modulus
+    assert b.prod() == Mod(modulus, product)
+
+@requires_numpy
+def test_mod_array_scalar_operands():
+    array = ModArray(10, [3, 4])
+    assert (array + 9).residues.tolist() == [2, 3]
+    assert (9 - array).residues.tolist() == [6, 5]
+    assert (Mod(10, 3) * array).residues.tolist() == [9, 2]
+    assert (array * np.int64(3)).residues.tolist() == [9, 2]
+    assert (Mod(10, 2) ** array).residues.tolist() == [8, 6]
+    assert (array >= Mod(10, 4)).tolist() == [False, True]
+    assert (Mod(10, 3) == array).tolist() == [True, False]
+
+@requires_numpy
+def test_mod_array_negative_exponent():
+    array = ModArray(10, [3, 7])
+    assert (array ** -1 * array).residues.tolist() == [1, 1]
+    with pytest.raises(ValueError):
+        ModArray(10, [3, 4]) ** -1
+
+@requires_numpy
+@pytest.mark.parametrize("exponent", [2 ** 63 - 1, 2 ** 63, 2 ** 70, np.uint64(2 ** 64 - 1) if np else None, -2 ** 70])
+def test_mod_array_exponent_beyond_int64(exponent):
+    array = ModArray(10 ** 9 + 7, [1, 2, 3])
+    assert (array ** exponent).residues.tolist() == [pow(x, int(exponent), 10 ** 9 + 7) for x in [1, 2, 3]]
+
+@requires_numpy
+@pytest.mark.parametrize("other", [ModArray(13, [3]) if np else None, Mod(13, 3), 3.0])
+def test_mod_array_invalid_operand(other):
+    with pytest.raises(TypeError):
+        ModArray(10, [3]) + other
+
+@requires_numpy
+def test_mod_array_empty_reductions():
+    array = ModArray(10, [])
+    assert array.sum() == Mod(10, 0)
+    assert array.prod() == Mod(10, 1)
+
+@pytest.mark.parametrize("modulus, residue", [(11, 3), (11, -1), (1, 5), (2 ** 255 - 19, 2 ** 300)])
+def test_create_montgomery_mod_ok(modulus, residue):
+    value = MontgomeryMod(modulus, residue)
+    assert value.modulus == modulus
+    assert value.residue == residue % modulus
+    assert int(value) == residue % modulus
+    assert repr(value) == f"MontgomeryMod({modulus}, {residue % modulus})"
+    assert value.to_mod() == Mod(modulus, residue)
+
+@pytest.mark.parametrize("modulus, residue, error", [
+    ("11", 3, TypeError), (11, 3.0, TypeError), (10, 3, ValueError), (-11, 3, ValueError)
+])
+def test_create_montgomery_mod_invalid(modulus, residue, error):
+    with pytest.raises(error):
+        MontgomeryMod(modulus, residue)
+
+@pytest.mark.parametrize("modulus", [11, 2 ** 127 - 1, 2 ** 255 - 19])
+def test_montgomery_mod_operations_ok(modulus):
+    x, y = 12345678901234567 % modulus, -98765
+    a, b = MontgomeryMod(modulus, x), MontgomeryMod(modulus, y)
+    mod_a, mod_b = Mod(modulus, x), Mod(modulus, y)
+    assert a + b == mod_a + mod_b
+    assert a - b == mod_a - mod_b
+    assert a * b == mod_a * mod_b
+    assert a * y == mod_a * y
+    assert y * a == mod_a * y
+    assert 7 - a == Mod(modulus, 7) - mod_a
+    assert a * mod_b == mod_a * mod_b
+    assert mod_b * a == mod_a * mod_b
+    assert a ** 65537 == mod_a ** 65537
+    assert a ** b == mod_a ** mod_b
+    assert mod_a ** b == mod_a ** mod_b
+    assert a ** -1 * a == 1
+    assert -a == -mod_a
+    assert (a < b) == (mod_a < mod_b)
+    assert hash(a) == hash(mod_a)
+
+def test_montgomery_mod_in_place():
+    value = MontgomeryMod(11, 3)
+    value *= MontgomeryMod(11, 4)
+    value += 5
+    value -= Mod(11, 2)
+    value **= 2
+    assert value.residue == (3 * 4 + 5 - 2) ** 2 % 11
+
+def test_mod_in_place_with_montgomery_mod():
+    value = Mod(11, 3)
+    value *= MontgomeryMod(11, 4)
+    assert value == MontgomeryMod(11, 1)
+    value = Mod(11, 3)
+    value **= MontgomeryMod(11, 2)
+    assert type(value) is MontgomeryMod
+    assert value.residue == 9
+
+@pytest.mark.parametrize("other", [MontgomeryMod(13, 3), Mod(13, 3), 3.0])
+def test_montgomery_mod_invalid_operand(other):
+    with pytest.raises(TypeError):
+        MontgomeryMod(11, 3) * other
+
+def test_montgomery_mod_negative_exponent_not_invertible():
+    with pytest.raises(ValueError):
+        MontgomeryMod(15, 5) ** -1
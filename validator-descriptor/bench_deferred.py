@@ -0,0 +1,68 @@
+"""
+Benchmark for deferred validation
+Command line: python bench_deferred.py [objects]
+"""
+
+from validator import IntegerValidator, StringValidator
+from deferred import Deferred, ValidationError
+import sys
+import timeit
+
+
+class Person:
+    age = IntegerValidator(0, 150)
+    score = IntegerValidator(0, 100)
+    name = StringValidator(1, 20)
+
+
+def immediate(obj, age, score, name):
+    """Assignments raising on the first invalid field"""
+    
+    obj.age = age
+    obj.score = score
+    obj.name = name
+
+
+def collected(obj, age, score, name):
+    """Former approach to report every error: one try per assignment, storing valid fields"""
+    
+    messages = []
+    for prop_name, value in [("age", age), ("score", score), ("name", name)]:
+        try:
+            setattr(obj, prop_name, value)
+        except ValueError as e:
+            messages.append(str(e))
+    if messages:
+        raise ValidationError(messages)
+
+
+def deferred(obj, age, score, name):
+    """Staged assignments validated together on exit"""
+    
+    with Deferred(obj) as staged:
+        staged.age = age
+        staged.score = score
+        staged.name = name
+
+
+def main(count):
+    obj = Person()
+    print(f"{'':<28}{'valid':>12}{'2 invalid':>12}")
+    for label, function in [
+        ("immediate (first error)", immediate),
+        ("try per field", collected),
+        ("Deferred", deferred),
+    ]:
+        timings = []
+        for args in [(42, 50, "Ada"), (200, 50, "")]:
+            def run():
+                try:
+                    function(obj, *args)
+                except ValueError:
+                    pass
+            timings.append(min(timeit.repeat(run, number=count, repeat=5)) / count * 1e9)
+        print(f"{label:<28}{timings[0]:>9.0f} ns{timings[1]:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,83 @@
+"""
+Benchmark for streaming construction of validated objects
+Command line: python bench_loader.py [rows]
+"""
+
+from validator import IntegerValidator, StringValidator
+from loader import RecordLoader
+import csv
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+class Person:
+    age = IntegerValidator(0, 150)
+    score = IntegerValidator(0, 100)
+    name = StringValidator(1, 20)
+
+
+def write_csv(path, row_count):
+    """Write rows with about 1% invalid values
+
+    Args:
+        path (str): file path
+        row_count (int): number of rows
+    """
+    rng = random.Random(0)
+    names = ["Ada", "Alan", "Grace", "Barbara", "Edsger", "Donald"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "age", "score"])
+        for i in range(row_count):
+            age = rng.randrange(-1, 149)
+            writer.writerow([names[i % len(names)], age, i % 100])
+
+
+def former(path):
+    """Former approach: a dict per row and an assignment through each descriptor
+
+    Args:
+        path (str): file path
+
+    Yields:
+        object: instance or error message
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            obj = Person()
+            try:
+                obj.name = row["name"]
+                obj.age = int(row["age"])
+                obj.score = int(row["score"])
+            except ValueError as e:
+                yield str(e)
+            else:
+                yield obj
+
+
+def main(row_count):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "people.csv")
+        write_csv(path, row_count)
+        print(f"{row_count:,} rows, {os.path.getsize(path) / 2 ** 20:.0f} MiB")
+        
+        started = time.perf_counter()
+        errors = sum(1 for record in RecordLoader(Person).load_file(path) if not isinstance(record, Person))
+        elapsed = time.perf_counter() - started
+        print(f"RecordLoader: {row_count / elapsed:,.0f} rows/s, {errors:,} errors")
+        
+        # former approach on at most 1M rows
+        sample = min(row_count, 1_000_000)
+        started = time.perf_counter()
+        for _ in itertools.islice(former(path), sample):
+            pass
+        elapsed = time.perf_counter() - started
+        print(f"DictReader and descriptors: {sample / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
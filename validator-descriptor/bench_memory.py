@@ -0,0 +1,66 @@
+"""
+Benchmark for memory of validated instances
+Command line: python bench_memory.py [instances]
+"""
+
+from validator import IntegerValidator, StringValidator, slotted
+import sys
+import tracemalloc
+
+
+class DictRecord:
+    """Former layout: values stored in the instance __dict__"""
+    
+    age = IntegerValidator(0, 150)
+    score = IntegerValidator(0, 100)
+    name = StringValidator(1, 50)
+    
+    def __init__(self, age, score, name):
+        self.age = age
+        self.score = score
+        self.name = name
+
+
+@slotted
+class SlottedRecord:
+    """Values stored in hidden slots"""
+    
+    age = IntegerValidator(0, 150)
+    score = IntegerValidator(0, 100)
+    name = StringValidator(1, 50)
+    
+    def __init__(self, age, score, name):
+        self.age = age
+        self.score = score
+        self.name = name
+
+
+def bytes_per_instance(cls, count, name):
+    """
+
+    Args:
+        cls (type): record class
+        count (int): number of instances
+        name (str): shared name value, so that only the instances are measured
+
+    Returns:
+        real: allocated bytes per instance, including the list holding them
+    """
+    tracemalloc.start()
+    records = [cls(i % 150, i % 100, name) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size / count
+
+
+def main(count):
+    dict_size = bytes_per_instance(DictRecord, count, "Ada")
+    slotted_size = bytes_per_instance(SlottedRecord, count, "Ada")
+    print(f"{count:,} instances with 3 validated fields")
+    print(f"__dict__: {dict_size:.0f} bytes per instance")
+    print(f"slotted:  {slotted_size:.0f} bytes per instance ({dict_size / slotted_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,39 @@
+"""
+Benchmark for parallel validation of large files
+Command line: python bench_runner.py [rows] [max_workers]
+"""
+
+from bench_loader import Person, write_csv
+from loader import RecordLoader
+from runner import ValidationRunner
+import os
+import sys
+import tempfile
+import time
+
+
+def main(row_count, max_workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "people.csv")
+        write_csv(path, row_count)
+        print(f"{row_count:,} rows, {os.path.getsize(path) / 2 ** 20:.0f} MiB, {os.cpu_count()} CPUs")
+        
+        started = time.perf_counter()
+        for _ in RecordLoader(Person).load_file(path):
+            pass
+        serial = time.perf_counter() - started
+        print(f"serial RecordLoader: {row_count / serial:,.0f} rows/s")
+        
+        workers = 1
+        while workers <= max_workers:
+            started = time.perf_counter()
+            ValidationRunner(Person, max_workers=workers, chunk_size=4 * 2 ** 20).run(path)
+            elapsed = time.perf_counter() - started
+            print(f"{workers:>2} workers: {row_count / elapsed:,.0f} rows/s, {serial / elapsed:.2f}x serial")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    main(row_count, max_workers)
@@ -0,0 +1,86 @@
+"""
+Benchmark for validator descriptors
+Command line: python bench_validator.py [assignments]
+"""
+
+from validator import BaseValidator, IntegerValidator, StringValidator
+import numbers
+import sys
+import timeit
+
+
+class GenericIntegerValidator(IntegerValidator):
+    """Former behavior: overriding validate() keeps the generic __set__ calling it"""
+    
+    def validate(self, value):
+        super().validate(value)
+
+
+class GenericStringValidator(StringValidator):
+    """Former behavior: overriding validate() keeps the generic __set__ calling it"""
+    
+    def validate(self, value):
+        super().validate(value)
+
+
+class Plain:
+    pass
+
+
+class WithProperty:
+    @property
+    def age(self):
+        return self._age
+    
+    @age.setter
+    def age(self, value):
+        if not isinstance(value, numbers.Integral):
+            raise ValueError("age must be an integer.")
+        if value < 0:
+            raise ValueError("age must be >= 0.")
+        if value > 150:
+            raise ValueError("age must be <= 150.")
+        self._age = value
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @name.setter
+    def name(self, value):
+        if not isinstance(value, str):
+            raise ValueError("name must be a string.")
+        if len(value) > 50:
+            raise ValueError("name must be <= 50 chars.")
+        self._name = value
+
+
+class Generic:
+    age = GenericIntegerValidator(0, 150)
+    name = GenericStringValidator(None, 50)
+
+
+class Specialized:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(None, 50)
+
+
+def main(count):
+    print(f"{'':<26}{'age = 42':>14}{'name = ...':>14}")
+    for label, cls, instrumented in [
+        ("plain attribute", Plain, False),
+        ("property", WithProperty, False),
+        ("generic descriptor", Generic, False),
+        ("specialized descriptor", Specialized, False),
+        ("instrumented", Specialized, True),
+        ("instrumentation stopped", Specialized, False),
+    ]:
+        BaseValidator.instrument(instrumented)
+        obj = cls()
+        age = min(timeit.repeat("obj.age = 42", globals={"obj": obj}, number=count, repeat=5))
+        name = min(timeit.repeat("obj.name = 'Ada'", globals={"obj": obj}, number=count, repeat=5))
+        print(f"{label:<26}{age / count * 1e9:>11.1f} ns{name / count * 1e9:>11.1f} ns")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
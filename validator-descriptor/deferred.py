@@ -0,0 +1,122 @@
+"""Deferred validation of descriptor-backed objects"""
+
+from validator import validated_fields
+
+
+class ValidationError(ValueError):
+    """Error reporting every invalid field of an object at once"""
+    
+    def __init__(self, messages):
+        """
+
+        Args:
+            messages (list): messages of validate() for each invalid field, in definition order
+        """
+        super().__init__(" ".join(messages))
+        self.messages = messages
+
+
+_missing = object()
+
+
+def _compile(cls):
+    """Generate the function validating staged values and storing them in an instance of cls
+
+    Args:
+        cls (type): class with validator descriptors
+
+    Returns:
+        callable: function of instance and staged values by name, raising ValidationError with
+            every message of the invalid fields, or setting other attributes then storing all fields
+    """
+    fields = validated_fields(cls)
+    namespace = {"ValidationError": ValidationError, "missing": _missing, "fields": fields}
+    lines = ["def commit(obj, values):", "    messages = []", "    staged = 0"]
+    for i, (name, descriptor) in enumerate(fields.items()):
+        lines += [
+            f"    v{i} = value = values.get({name!r}, missing)",
+            "    if value is not missing:",
+            "        staged += 1",
+        ]
+        lines += descriptor._check_source(f"_{i}", "        ", namespace)
+    lines += [
+        "    if messages:",
+        "        raise ValidationError(messages)",
+        "    if staged != len(values):",
+        "        for name, value in values.items():",
+        "            if name not in fields:",
+        "                setattr(obj, name, value)",
+    ]
+    if any(descriptor._slot is None for descriptor in fields.values()):
+        lines.append("    d = obj.__dict__")
+    for i, (name, descriptor) in enumerate(fields.items()):
+        lines.append(f"    if v{i} is not missing:")
+        if not descriptor._stores_directly():
+            # overridden __set__, e.g. transforming the value, is called as for an assignment
+            namespace[f"store_{i}"] = descriptor.__set__
+            lines.append(f"        store_{i}(obj, v{i})")
+        elif descriptor._slot is None:
+            lines.append(f"        d[{name!r}] = v{i}")
+        else:
+            namespace[f"store_{i}"] = descriptor._slot.__set__
+            lines.append(f"        store_{i}(obj, v{i})")
+    exec("\n".join(lines), namespace)
+    return namespace["commit"]
+
+
+class Deferred:
+    """Context manager staging assignments to an object and validating them all on exit
+
+    Attributes set on the context are staged, and attributes that are not staged are read from the
+    object. On a normal exit, every staged field is validated with the checks of its validator, and
+    a ValidationError reports all invalid fields together, leaving the object unchanged. Attributes
+    without a validator are then set as usual, and valid values are stored last, without going
+    through the descriptors again. If setting one of those attributes raises, the ones set before it
+    keep their values and no field is stored. Nothing is stored when the block raises.
+
+    Example:
+        with Deferred(person) as staged:
+            staged.name = name
+            staged.age = age
+    """
+    
+    __slots__ = ("__dict__", "_deferred_target")
+    
+    def __init__(self, instance):
+        """
+
+        Args:
+            instance (object): instance of a class with validator descriptors
+        """
+        self._deferred_target = instance
+    
+    def __enter__(self):
+        return self
+    
+    def __getattr__(self, name):
+        """Read attributes that are not staged from the object
+
+        Args:
+            name (str): attribute name
+
+        Returns:
+            type: attribute value of the object
+        """
+        return getattr(self._deferred_target, name)
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Validate and store staged values, unless the block raised
+
+        Raises:
+            ValidationError: staged values are invalid, with the messages of every invalid field
+        """
+        if exc_type is None:
+            target = self._deferred_target
+            cls = type(target)
+            # (class, commit) kept on the class itself, so it is freed with the class; one inherited
+            # or copied into a class rebuilt from its namespace, e.g. by slotted, is recompiled
+            cached = getattr(cls, "_deferred_commit", None)
+            if cached is None or cached[0] is not cls:
+                cached = (cls, _compile(cls))
+                type.__setattr__(cls, "_deferred_commit", cached)
+            cached[1](target, self.__dict__)
@@ -0,0 +1,185 @@
+"""Streaming construction of validated objects"""
+
+import csv
+import json
+from collections import namedtuple
+
+from validator import validated_fields
+
+
+RowError = namedtuple("RowError", "line_number, messages")
+
+
+class RecordLoader:
+    """Loader building instances of a class with validator descriptors from CSV or JSONL rows
+
+    For each input format, one function is generated per class that checks every field of a row
+    with the conditions of the validators' _checks() and stores the values directly, without
+    calling __init__ or __set__. Rows are read lazily and every field error of a row is reported
+    together. Validators overriding validate() without _checks() are called as such.
+    """
+    
+    _missing = object()
+    
+    def __init__(self, cls):
+        """
+
+        Args:
+            cls (type): class with validator descriptors, created without calling its __init__
+
+        Raises:
+            ValueError: class has no validator descriptors
+        """
+        fields = validated_fields(cls)
+        if not fields:
+            raise ValueError("Class must have validator descriptors.")
+        self._cls = cls
+        self._fields = list(fields.items())
+        self._jsonl_row = None
+    
+    @property
+    def fields(self):
+        """
+
+        Returns:
+            tuple: names of the validated fields, in definition order
+        """
+        return tuple(name for name, _ in self._fields)
+    
+    def _compile(self, sources, convert, optional):
+        """Generate the function validating a row and building its instance
+
+        Args:
+            sources (list): expression reading each field from `row`
+            convert (bool): convert text with the validators' `text_type` first
+            optional (bool): sources may give `missing`
+
+        Returns:
+            callable: function of row and line number returning an instance or a RowError
+        """
+        namespace = {
+            "RowError": RowError,
+            "missing": RecordLoader._missing,
+            "cls": self._cls,
+            "new": self._cls.__new__,
+        }
+        lines = ["def load_row(row, line_number):", "    messages = []"]
+        for i, ((name, descriptor), source) in enumerate(zip(self._fields, sources)):
+            lines.append(f"    value = {source}")
+            pad = "    "
+            if optional:
+                lines.append("    if value is missing:")
+                lines.append(f"        messages.append({name + ' is missing.'!r})")
+                lines.append("    else:")
+                pad = "        "
+            text_type = descriptor.text_type
+            if convert and text_type is not None:
+                # text that does not parse is validated as is, e.g. "abc" is not an integer
+                namespace[f"text_type_{i}"] = text_type
+                lines += [
+                    f"{pad}try:",
+                    f"{pad}    value = text_type_{i}(value)",
+                    f"{pad}except ValueError:",
+                    f"{pad}    pass",
+                ]
+            lines += descriptor._check_source(f"_{i}", pad, namespace)
+            lines.append(f"    v{i} = value")
+        
+        lines += ["    if messages:", "        return RowError(line_number, messages)", "    obj = new(cls)"]
+        if any(descriptor._slot is None for _, descriptor in self._fields):
+            lines.append("    d = obj.__dict__")
+        for i, (name, descriptor) in enumerate(self._fields):
+            if not descriptor._stores_directly():
+                # overridden __set__, e.g. transforming the value, is called as for an assignment
+                namespace[f"store_{i}"] = descriptor.__set__
+                lines.append(f"    store_{i}(obj, v{i})")
+            elif descriptor._slot is None:
+                lines.append(f"    d[{name!r}] = v{i}")
+            else:
+                namespace[f"store_{i}"] = descriptor._slot.__set__
+                lines.append(f"    store_{i}(obj, v{i})")
+        lines.append("    return obj")
+        exec("\n".join(lines), namespace)
+        return namespace["load_row"]
+    
+    def load_csv(self, lines):
+        """Build instances from CSV text with a header row, read lazily
+
+        Columns are matched to fields by the header, extra columns are ignored, and values are
+        converted from text with each validator's `text_type` before validation.
+
+        Args:
+            lines (iterable): lines of CSV text, e.g. a file opened with newline=""
+
+        Raises:
+            ValueError: header has no column for a field
+
+        Yields:
+            object: instance, or RowError with the messages of every invalid field of a row
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = {column.strip(): index for index, column in enumerate(header)}
+        for name, _ in self._fields:
+            if name not in columns:
+                raise ValueError(f"Missing column {name}.")
+        load_row = self._compile([f"row[{columns[name]}]" for name, _ in self._fields], True, False)
+        
+        width = len(header)
+        message = [f"Row must have {width} fields."]
+        for row in reader:
+            if len(row) != width:
+                if row:
+                    yield RowError(reader.line_num, message)
+                continue
+            yield load_row(row, reader.line_num)
+    
+    def load_jsonl(self, lines):
+        """Build instances from JSON Lines text, one object per line, read lazily
+
+        Args:
+            lines (iterable): lines of JSON Lines text, e.g. an open file
+
+        Yields:
+            object: instance, or RowError with the messages of every invalid field of a row
+        """
+        if self._jsonl_row is None:
+            self._jsonl_row = self._compile(
+                [f"row.get({name!r}, missing)" for name, _ in self._fields], False, True
+            )
+        load_row = self._jsonl_row
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield RowError(line_number, ["Invalid JSON."])
+                continue
+            if not isinstance(row, dict):
+                yield RowError(line_number, ["Row must be a JSON object."])
+                continue
+            yield load_row(row, line_number)
+    
+    def load_file(self, path):
+        """Build instances from a .csv or .jsonl file, read lazily
+
+        Args:
+            path (str): file path
+
+        Raises:
+            ValueError: file extension is not .csv, .jsonl or .ndjson
+
+        Yields:
+            object: instance or RowError
+        """
+        if path.endswith(".csv"):
+            with open(path, newline="") as f:
+                yield from self.load_csv(f)
+        elif path.endswith((".jsonl", ".ndjson")):
+            with open(path) as f:
+                yield from self.load_jsonl(f)
+        else:
+            raise ValueError("File must be a .csv, .jsonl or .ndjson file.")
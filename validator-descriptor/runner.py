@@ -0,0 +1,147 @@
+"""Parallel validation of large files"""
+
+import io
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from loader import RecordLoader, RowError
+
+
+ValidationReport = namedtuple("ValidationReport", "rows, errors")
+
+
+def _validate_chunk(cls, path, start, end, header):
+    """Validate the rows of a byte range of a file
+
+    Args:
+        cls (type): class with validator descriptors
+        path (str): file path
+        start (int): offset of the first byte, at the start of a line
+        end (int): offset past the last byte, at the start of a line or the end of the file
+        header (str or None): CSV header line, None for JSONL
+
+    Returns:
+        tuple: number of lines, number of rows and RowError records with line numbers
+            relative to the chunk
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    line_count = data.count(b"\n") + (0 if data.endswith(b"\n") or not data else 1)
+    text = io.StringIO(data.decode(), newline="" if header is not None else None)
+    
+    loader = RecordLoader(cls)
+    rows = 0
+    errors = []
+    if header is not None:
+        # the header takes line 1
+        records = loader.load_csv(_prepend(header, text))
+        shift = -1
+    else:
+        records = loader.load_jsonl(text)
+        shift = 0
+    for record in records:
+        rows += 1
+        if isinstance(record, RowError):
+            errors.append(RowError(record.line_number + shift, record.messages))
+    return line_count, rows, errors
+
+
+def _prepend(line, lines):
+    """
+
+    Args:
+        line (str): first line
+        lines (iterable): next lines
+
+    Yields:
+        str: lines
+    """
+    yield line
+    yield from lines
+
+
+class ValidationRunner:
+    """Runner validating a CSV or JSONL file in byte-range chunks across a process pool
+
+    Chunks end at line boundaries, so rows must not contain line breaks inside quoted CSV fields.
+    Each chunk is validated in a worker process with `RecordLoader`, and the error reports are
+    merged in file order.
+    """
+    
+    def __init__(self, cls, max_workers=None, chunk_size=16 * 2 ** 20):
+        """
+
+        Args:
+            cls (type): class with validator descriptors, importable by worker processes
+            max_workers (int, optional): number of worker processes. Defaults to None for CPU count.
+            chunk_size (int, optional): approximate bytes per chunk. Defaults to 16 MiB.
+
+        Raises:
+            ValueError: chunk size is not a positive integer
+        """
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+        RecordLoader(cls)  # fail early on classes without validators
+        self._cls = cls
+        self._max_workers = max_workers or os.cpu_count()
+        self._chunk_size = chunk_size
+    
+    def chunks(self, path):
+        """Split a file into byte ranges ending at line boundaries
+
+        Args:
+            path (str): file path
+
+        Returns:
+            tuple: CSV header line (None for JSONL) and list of (start, end) offsets of the rows
+        """
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            header = None
+            if path.endswith(".csv"):
+                header = f.readline().decode()
+            boundaries = [f.tell()]
+            while boundaries[-1] < size:
+                f.seek(max(boundaries[-1] + self._chunk_size, boundaries[-1] + 1) - 1)
+                # a chunk ends after the line holding its last byte
+                f.readline()
+                boundaries.append(min(f.tell(), size))
+        return header, list(zip(boundaries[:-1], boundaries[1:]))
+    
+    def run(self, path):
+        """Validate every row of a .csv or .jsonl file
+
+        Args:
+            path (str): file path
+
+        Raises:
+            ValueError: file extension is not .csv, .jsonl or .ndjson
+            ValueError: CSV header has no column for a field
+
+        Returns:
+            ValidationReport: number of rows and RowError records in file order
+        """
+        if not path.endswith((".csv", ".jsonl", ".ndjson")):
+            raise ValueError("File must be a .csv, .jsonl or .ndjson file.")
+        header, ranges = self.chunks(path)
+        lines_before = 0
+        if header is not None:
+            # check columns once, before starting workers
+            next(RecordLoader(self._cls).load_csv([header]), None)
+            lines_before = 1
+        
+        rows = 0
+        errors = []
+        with ProcessPoolExecutor(self._max_workers) as executor:
+            futures = [
+                executor.submit(_validate_chunk, self._cls, path, start, end, header)
+                for start, end in ranges
+            ]
+            for future in futures:
+                line_count, chunk_rows, chunk_errors = future.result()
+                rows += chunk_rows
+                errors.extend(RowError(e.line_number + lines_before, e.messages) for e in chunk_errors)
+                lines_before += line_count
+        return ValidationReport(rows, errors)
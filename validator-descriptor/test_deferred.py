@@ -0,0 +1,149 @@
+"""
+Unit tests
+Command line: python test_deferred.py
+"""
+
+from validator import IntegerValidator, StringValidator, slotted
+from deferred import Deferred, ValidationError
+import gc
+import unittest
+import weakref
+
+
+class Person:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(1, 10)
+    
+    @property
+    def label(self):
+        return self._label
+    
+    @label.setter
+    def label(self, value):
+        self._label = value.upper()
+
+
+@slotted
+class SlottedPerson:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(1, 10)
+
+
+class EvenValidator(IntegerValidator):
+    def validate(self, value):
+        super().validate(value)
+        if value % 2:
+            raise ValueError(f"{self.prop_name} must be even.")
+
+
+class TestDeferred(unittest.TestCase):
+    def test_commit(self):
+        """Tests that valid staged values are stored on exit only"""
+        
+        for cls in [Person, SlottedPerson]:
+            with self.subTest(cls=cls.__name__):
+                obj = cls()
+                with Deferred(obj) as staged:
+                    staged.age = 36
+                    staged.name = "Ada"
+                    self.assertIsNone(obj.age)
+                    self.assertEqual(36, staged.age)
+                self.assertEqual((36, "Ada"), (obj.age, obj.name))
+    
+    def test_all_errors(self):
+        """Tests that every invalid field is reported in definition order and nothing is stored"""
+        
+        for cls in [Person, SlottedPerson]:
+            with self.subTest(cls=cls.__name__):
+                obj = cls()
+                obj.age = 20
+                with self.assertRaises(ValidationError) as context:
+                    with Deferred(obj) as staged:
+                        staged.name = ""
+                        staged.age = 200
+                self.assertEqual(["age must be <= 150.", "name must be >= 1 chars."], context.exception.messages)
+                self.assertIsInstance(context.exception, ValueError)
+                self.assertEqual((20, None), (obj.age, obj.name))
+    
+    def test_unstaged_fields(self):
+        """Tests that fields that are not staged are neither validated nor changed"""
+        
+        obj = Person()
+        obj.name = "Ada"
+        with Deferred(obj) as staged:
+            staged.age = 5
+            self.assertEqual("Ada", staged.name)
+        self.assertEqual((5, "Ada"), (obj.age, obj.name))
+    
+    def test_block_raises(self):
+        obj = Person()
+        with self.assertRaises(KeyError):
+            with Deferred(obj) as staged:
+                staged.age = 5
+                raise KeyError
+        self.assertIsNone(obj.age)
+    
+    def test_other_attributes(self):
+        """Tests that attributes without validators are set as usual, before the fields are stored"""
+        
+        obj = Person()
+        with Deferred(obj) as staged:
+            staged.age = 5
+            staged.label = "a"
+            staged.note = "b"
+        self.assertEqual((5, "A", "b"), (obj.age, obj.label, obj.note))
+        with self.assertRaises(AttributeError):
+            with Deferred(obj) as staged:
+                staged.age = 6
+                staged.note = "c"
+                staged.label = 1
+        self.assertEqual((5, "A", "c"), (obj.age, obj.label, obj.note))
+    
+    def test_commit_cached_on_class(self):
+        """Tests that compiled commits are freed with their class and not reused by rebuilt or derived classes"""
+        
+        def stage(obj, age):
+            with Deferred(obj) as staged:
+                staged.age = age
+            return obj.age
+        
+        cls = type("TestClass", (), {"age": IntegerValidator(0, 10)})
+        self.assertEqual(1, stage(cls(), 1))
+        self.assertEqual(2, stage(type("SubClass", (cls,), {})(), 2))
+        self.assertEqual(3, stage(slotted(cls)(), 3))
+        
+        ref = weakref.ref(type("TestClass", (), {"age": IntegerValidator(0, 10)}))
+        self.assertEqual(4, stage(ref()(), 4))
+        gc.collect()
+        self.assertIsNone(ref())
+    
+    def test_custom_set(self):
+        """Tests that validators overriding __set__ store values through it"""
+        
+        class UpperValidator(StringValidator):
+            def __set__(self, instance, value):
+                super().__set__(instance, value.upper())
+        
+        obj = type("TestClass", (), {"name": UpperValidator(1, 5), "age": IntegerValidator(0, 10)})()
+        with Deferred(obj) as staged:
+            staged.name = "abc"
+            staged.age = 4
+        self.assertEqual(("ABC", 4), (obj.name, obj.age))
+    
+    def test_custom_validate(self):
+        obj = type("TestClass", (), {"age": EvenValidator(0, 10), "name": StringValidator(1, 5)})()
+        with self.assertRaises(ValidationError) as context:
+            with Deferred(obj) as staged:
+                staged.age = 3
+                staged.name = 5
+        self.assertEqual(["age must be even.", "name must be a string."], context.exception.messages)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestDeferred)
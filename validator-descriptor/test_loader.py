@@ -0,0 +1,134 @@
+"""
+Unit tests
+Command line: python test_loader.py
+"""
+
+from validator import ChoiceValidator, IntegerValidator, PatternValidator, StringValidator, slotted
+from loader import RecordLoader, RowError
+import io
+import os
+import tempfile
+import unittest
+
+
+class Person:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(1, 10)
+
+
+@slotted
+class SlottedPerson:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(1, 10)
+
+
+class EvenValidator(IntegerValidator):
+    def validate(self, value):
+        super().validate(value)
+        if value % 2:
+            raise ValueError(f"{self.prop_name} must be even.")
+
+
+class TestRecordLoader(unittest.TestCase):
+    def test_csv_ok(self):
+        """Tests that CSV rows become instances with converted values"""
+        
+        text = "name,age,extra\nAda,36,x\nAlan, 41 ,y\n"
+        records = list(RecordLoader(Person).load_csv(io.StringIO(text)))
+        self.assertEqual([("Ada", 36), ("Alan", 41)], [(r.name, r.age) for r in records])
+        self.assertIsInstance(records[0], Person)
+    
+    def test_csv_errors(self):
+        """Tests that every field error of a row is reported with the messages of validate()"""
+        
+        text = "age,name\n200,\nabc,Ada\n1.5,Ada\n5\n\n30,Grace\n"
+        records = list(RecordLoader(Person).load_csv(io.StringIO(text)))
+        self.assertEqual([
+            RowError(2, ["age must be <= 150.", "name must be >= 1 chars."]),
+            RowError(3, ["age must be an integer."]),
+            RowError(4, ["age must be an integer."]),
+            RowError(5, ["Row must have 2 fields."]),
+        ], records[:4])
+        self.assertEqual(("Grace", 30), (records[4].name, records[4].age))
+    
+    def test_csv_missing_column(self):
+        with self.assertRaises(ValueError):
+            list(RecordLoader(Person).load_csv(io.StringIO("age\n5\n")))
+    
+    def test_jsonl(self):
+        """Tests that JSON values are validated as they are, without conversion"""
+        
+        text = '{"age": 36, "name": "Ada"}\n{"age": "36", "name": "Ada"}\n{"name": "Ada"}\n[1]\n{bad\n'
+        records = list(RecordLoader(Person).load_jsonl(io.StringIO(text)))
+        self.assertEqual(("Ada", 36), (records[0].name, records[0].age))
+        self.assertEqual([
+            RowError(2, ["age must be an integer."]),
+            RowError(3, ["age is missing."]),
+            RowError(4, ["Row must be a JSON object."]),
+            RowError(5, ["Invalid JSON."]),
+        ], records[1:])
+    
+    def test_slotted(self):
+        records = list(RecordLoader(SlottedPerson).load_csv(io.StringIO("age,name\n36,Ada\n")))
+        self.assertEqual(("Ada", 36), (records[0].name, records[0].age))
+        self.assertFalse(hasattr(records[0], "__dict__"))
+    
+    def test_custom_validate(self):
+        """Tests that validators overriding validate() only are called as such"""
+        
+        cls = type("TestClass", (), {"age": EvenValidator(0, 10)})
+        records = list(RecordLoader(cls).load_csv(io.StringIO("age\n4\n3\n")))
+        self.assertEqual(4, records[0].age)
+        self.assertEqual(RowError(3, ["age must be even."]), records[1])
+    
+    def test_custom_set(self):
+        """Tests that validators overriding __set__ store values through it"""
+        
+        class UpperValidator(StringValidator):
+            def __set__(self, instance, value):
+                super().__set__(instance, value.upper())
+        
+        cls = type("TestClass", (), {"name": UpperValidator(1, 5)})
+        records = list(RecordLoader(cls).load_csv(io.StringIO("name\nabc\nabcdef\n")))
+        self.assertEqual("ABC", records[0].name)
+        self.assertEqual(RowError(3, ["name must be <= 5 chars."]), records[1])
+    
+    def test_pattern_and_choice(self):
+        """Tests that conditions using values other than the bounds are checked"""
+        
+        cls = type("TestClass", (), {"code": PatternValidator(r"[A-Z]+"), "size": ChoiceValidator(["S", "M"])})
+        records = list(RecordLoader(cls).load_csv(io.StringIO("code,size\nAB,S\nab,L\n")))
+        self.assertEqual(("AB", "S"), (records[0].code, records[0].size))
+        self.assertEqual(RowError(3, ["code must match '[A-Z]+'.", "size must be one of 'M', 'S'."]), records[1])
+    
+    def test_choice_text_type(self):
+        """Tests that CSV fields are compared with integer choices as integers"""
+        
+        cls = type("TestClass", (), {"level": ChoiceValidator([1, 2, 3])})
+        records = list(RecordLoader(cls).load_csv(io.StringIO("level\n2\n4\nx\n")))
+        self.assertEqual(2, records[0].level)
+        self.assertEqual(RowError(3, ["level must be one of 1, 2, 3."]), records[1])
+        self.assertEqual(RowError(4, ["level must be one of 1, 2, 3."]), records[2])
+    
+    def test_load_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "people.jsonl")
+            with open(path, "w") as f:
+                f.write('{"age": 36, "name": "Ada"}\n')
+            self.assertEqual(36, next(RecordLoader(Person).load_file(path)).age)
+            with self.assertRaises(ValueError):
+                next(RecordLoader(Person).load_file(os.path.join(tmp, "people.txt")))
+    
+    def test_no_validators(self):
+        with self.assertRaises(ValueError):
+            RecordLoader(object)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestRecordLoader)
@@ -0,0 +1,92 @@
+"""
+Unit tests
+Command line: python test_runner.py
+"""
+
+from validator import IntegerValidator, StringValidator
+from loader import RecordLoader, RowError
+from runner import ValidationRunner
+import os
+import random
+import tempfile
+import unittest
+
+
+class Person:
+    age = IntegerValidator(0, 150)
+    name = StringValidator(1, 10)
+
+
+class TestValidationRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = random.Random(0)
+        self.csv_path = os.path.join(self.tmp.name, "people.csv")
+        with open(self.csv_path, "w") as f:
+            f.write("name,age\n")
+            for _ in range(500):
+                r = rng.random()
+                if r < 0.02:
+                    f.write("\n")
+                elif r < 0.04:
+                    f.write("Ada\n")
+                else:
+                    f.write(f"{rng.choice(['Ada', '', 'A' * 11])},{rng.choice([1, 200, 'x', 40])}\n")
+        self.jsonl_path = os.path.join(self.tmp.name, "people.jsonl")
+        with open(self.jsonl_path, "w") as f:
+            for _ in range(500):
+                r = rng.random()
+                if r < 0.02:
+                    f.write("{bad\n")
+                else:
+                    f.write('{"name": "%s", "age": %s}\n' % (rng.choice(["Ada", ""]), rng.choice([1, 200, '"x"'])))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def expected(self, path):
+        records = list(RecordLoader(Person).load_file(path))
+        return len(records), [record for record in records if isinstance(record, RowError)]
+    
+    def test_matches_serial(self):
+        """Tests that merged reports equal the serial loader's, whatever the chunk size"""
+        
+        for path in [self.csv_path, self.jsonl_path]:
+            rows, errors = self.expected(path)
+            for chunk_size in [1, 97, 2 ** 20]:
+                with self.subTest(path=os.path.basename(path), chunk_size=chunk_size):
+                    report = ValidationRunner(Person, max_workers=2, chunk_size=chunk_size).run(path)
+                    self.assertEqual(rows, report.rows)
+                    self.assertEqual(errors, report.errors)
+    
+    def test_chunks_at_line_boundaries(self):
+        header, ranges = ValidationRunner(Person, chunk_size=100).chunks(self.csv_path)
+        self.assertEqual("name,age\n", header)
+        with open(self.csv_path, "rb") as f:
+            data = f.read()
+        self.assertEqual(len(header), ranges[0][0])
+        self.assertEqual(len(data), ranges[-1][1])
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(b"\n", data[end - 1:end])
+    
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ValidationRunner(Person, chunk_size=0)
+        with self.assertRaises(ValueError):
+            ValidationRunner(Person).run(os.path.join(self.tmp.name, "people.txt"))
+        path = os.path.join(self.tmp.name, "other.csv")
+        with open(path, "w") as f:
+            f.write("name\nAda\n")
+        with self.assertRaises(ValueError):
+            ValidationRunner(Person).run(path)
+
+
+def run_tests(test_class):
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
+
+
+if __name__ == "__main__":
+    run_tests(TestValidationRunner)
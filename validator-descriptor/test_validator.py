@@ -3,7 +3,11 @@ Unit tests
 Command line: python test_validator.py
 """
 
-from validator import IntegerValidator, StringValidator
+from validator import BaseValidator, ChoiceValidator, IntegerValidator, PatternValidator, StringValidator, slotted
+import io
+import json
+import numpy as np
+import re
 import unittest
 
 
@@ -177,6 +181,407 @@ class TestStringValidator(unittest.TestCase):
                 self.assertEqual(value, obj.name)
 
 
+class TestPatternValidator(unittest.TestCase):
+    def test_set_ok(self):
+        obj = type("TestClass", (), {"code": PatternValidator(r"[A-Z]{2}-\d{3}")})()
+        obj.code = "AB-123"
+        self.assertEqual("AB-123", obj.code)
+    
+    def test_set_invalid(self):
+        """Tests that the whole value must match, after the string checks"""
+        
+        obj = type("TestClass", (), {"code": PatternValidator(r"[A-Z]{2}-\d{3}", None, 6)})()
+        for value in ["AB-1234", "xAB-123", "ab-123", 123]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    obj.code = value
+        with self.assertRaisesRegex(ValueError, "must match"):
+            obj.code = "AB-12"
+        self.assertIsNone(obj.code)
+    
+    def test_flags(self):
+        obj = type("TestClass", (), {"code": PatternValidator("ab", flags=re.IGNORECASE)})()
+        obj.code = "AB"
+        self.assertEqual("AB", obj.code)
+    
+    def test_shared_pattern(self):
+        """Tests that validators of the same pattern share one compiled regex"""
+        
+        self.assertIs(PatternValidator(r"\d+")._pattern, PatternValidator(r"\d+")._pattern)
+        compiled = re.compile(r"\w+")
+        self.assertIs(compiled, PatternValidator(compiled)._pattern)
+
+
+class TestChoiceValidator(unittest.TestCase):
+    def test_set_ok(self):
+        obj = type("TestClass", (), {"color": ChoiceValidator(["red", "green"])})()
+        obj.color = "green"
+        self.assertEqual("green", obj.color)
+    
+    def test_set_invalid(self):
+        obj = type("TestClass", (), {"color": ChoiceValidator(["red", "green"])})()
+        for value in ["blue", None, ["red"], {"red"}]:
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(ValueError, "must be one of 'green', 'red'"):
+                    obj.color = value
+        self.assertIsNone(obj.color)
+    
+    def test_frozen(self):
+        choices = ["red"]
+        obj = type("TestClass", (), {"color": ChoiceValidator(choices)})()
+        choices.append("blue")
+        self.assertIsInstance(type(obj).color._choices, frozenset)
+        with self.assertRaises(ValueError):
+            obj.color = "blue"
+    
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            ChoiceValidator([])
+    
+    def test_text_type(self):
+        """Tests that text is converted to the shared type of the choices, or to the given type"""
+        
+        cases = [
+            (ChoiceValidator([1, 2]), int),
+            (ChoiceValidator([0.5, 1.5]), float),
+            (ChoiceValidator(["S", "M"]), None),
+            (ChoiceValidator([1, "M"]), None),
+            (ChoiceValidator([True, False]), None),
+            (ChoiceValidator([1, 2], text_type=str), str),
+        ]
+        for i, (descriptor, text_type) in enumerate(cases):
+            with self.subTest(test_number=i):
+                self.assertIs(text_type, descriptor.text_type)
+
+
+class TestSpecializedSet(unittest.TestCase):
+    @staticmethod
+    def messages(descriptor, obj, values):
+        messages = []
+        for value in values:
+            try:
+                descriptor.validate(value)
+            except ValueError as e:
+                validate_message = str(e)
+            else:
+                validate_message = None
+            try:
+                setattr(obj, descriptor.prop_name, value)
+            except ValueError as e:
+                messages.append((validate_message, str(e)))
+            else:
+                messages.append((validate_message, None))
+        return messages
+    
+    def test_set_specialized(self):
+        """Tests that __set__ is generated at class creation and the descriptor keeps its type"""
+        
+        obj = type("TestClass", (), {"age": IntegerValidator(0, 10)})()
+        descriptor = type(obj).age
+        self.assertIsInstance(descriptor, IntegerValidator)
+        self.assertIsNot(type(descriptor).__set__, BaseValidator.__set__)
+    
+    def test_messages_match_validate(self):
+        """Tests that the generated __set__ raises the messages of validate()"""
+        
+        cases = [
+            (IntegerValidator(-10, 10), [5, -11, 11, 10.5, "abc", True]),
+            (IntegerValidator(None, 10), [-100, 11]),
+            (IntegerValidator(None, None), [10 ** 20, 1.0]),
+            (StringValidator(2, 4), ["abc", "a", "abcde", 5]),
+            (StringValidator(None, None), ["", "a" * 1000, None]),
+            (PatternValidator(r"[a-z]+", 2, 4), ["abc", "a", "abcde", "ab1", 5]),
+            (ChoiceValidator(["red", 1]), ["red", 1, True, "blue", [1], None]),
+        ]
+        for i, (descriptor, values) in enumerate(cases):
+            with self.subTest(test_number=i):
+                obj = type("TestClass", (), {"field": descriptor})()
+                for validate_message, set_message in self.messages(descriptor, obj, values):
+                    self.assertEqual(validate_message, set_message)
+    
+    def test_custom_validate_not_specialized(self):
+        """Tests that subclasses overriding validate() only keep calling it"""
+        
+        class EvenValidator(IntegerValidator):
+            def validate(self, value):
+                super().validate(value)
+                if value % 2:
+                    raise ValueError(f"{self.prop_name} must be even.")
+        
+        obj = type("TestClass", (), {"age": EvenValidator(0, 10)})()
+        self.assertIs(type(type(obj).age), EvenValidator)
+        obj.age = 4
+        self.assertEqual(4, obj.age)
+        with self.assertRaises(ValueError):
+            obj.age = 3
+    
+    def test_custom_set_not_specialized(self):
+        """Tests that subclasses overriding __set__ keep calling it, with or without __slots__"""
+        
+        class UpperValidator(StringValidator):
+            def __set__(self, instance, value):
+                super().__set__(instance, value.upper())
+        
+        calls = []
+        
+        class CountingValidator(IntegerValidator):
+            def __set__(self, instance, value):
+                calls.append(value)
+                super().__set__(instance, value)
+        
+        for cls in [type("TestClass", (), {"name": UpperValidator(1, 5), "age": CountingValidator(0, 10)}),
+                    slotted(type("TestClass", (), {"name": UpperValidator(1, 5), "age": CountingValidator(0, 10)}))]:
+            with self.subTest(slotted=hasattr(cls, "__slots__")):
+                obj = cls()
+                obj.name = "abc"
+                obj.age = 4
+                self.assertEqual(("ABC", 4), (obj.name, obj.age))
+                with self.assertRaises(ValueError):
+                    obj.age = 11
+        self.assertEqual([4, 11, 4, 11], calls)
+
+
+class TestValidateMany(unittest.TestCase):
+    @staticmethod
+    def expected(descriptor, values):
+        messages = []
+        for value in values:
+            try:
+                descriptor.validate(value)
+            except ValueError as e:
+                messages.append(str(e))
+            else:
+                messages.append(None)
+        return messages
+    
+    def assert_matches_validate(self, descriptor, values):
+        result = descriptor.validate_many(values)
+        expected = self.expected(descriptor, list(values))
+        self.assertEqual([message is None for message in expected], result.valid.tolist())
+        self.assertEqual([i for i, message in enumerate(expected) if message is not None], result.indices.tolist())
+        self.assertEqual([message for message in expected if message is not None], result.messages)
+    
+    def test_integer_column(self):
+        """Tests that integer columns report the failures and messages of validate()"""
+        
+        descriptor = type("TestClass", (), {"age": IntegerValidator(0, 150)}).age
+        columns = [
+            [5, -1, 151, 2 ** 80, True, 10.5, "abc", (1, 2), None, np.int64(7), np.bool_(True)],
+            np.array([1, -5, 200, 150, 0]),
+            np.array([1, 2], dtype=np.uint8),
+            np.array([1.0, 2.0]),
+            np.array([5, "abc", -1], dtype=object),
+            [],
+        ]
+        for i, values in enumerate(columns):
+            with self.subTest(test_number=i):
+                self.assert_matches_validate(descriptor, values)
+    
+    def test_string_column(self):
+        """Tests that string columns report the failures and messages of validate()"""
+        
+        descriptor = type("TestClass", (), {"name": StringValidator(2, 5)}).name
+        columns = [
+            ["ab", "a", "abcdef", "", 5, None, b"abc", np.str_("abc")],
+            np.array(["ab", "a", "abcdefg"]),
+            np.array([b"ab"]),
+        ]
+        for i, values in enumerate(columns):
+            with self.subTest(test_number=i):
+                self.assert_matches_validate(descriptor, values)
+    
+    def test_string_validator_non_string_array(self):
+        """Tests that arrays without strings are reported as invalid rather than raising"""
+        
+        descriptor = type("TestClass", (), {"name": StringValidator(2, 5)}).name
+        for i, values in enumerate([np.array([1, 2, 3]), np.array([1.5, 2.5]), np.array([True])]):
+            with self.subTest(test_number=i):
+                result = descriptor.validate_many(values)
+                self.assertFalse(result.valid.any())
+                self.assertEqual(list(range(len(values))), result.indices.tolist())
+                self.assertTrue(all(message.endswith("must be a string.") for message in result.messages))
+                self.assert_matches_validate(descriptor, values)
+    
+    def test_pattern_column(self):
+        """Tests that pattern columns report the failures and messages of validate()"""
+        
+        descriptor = type("TestClass", (), {"code": PatternValidator(r"[A-Z]{2}\d+", None, 5)}).code
+        columns = [
+            ["AB1", "AB", "ab1", "AB1234", 5, None],
+            np.array(["AB12", "A1", "AB123456"]),
+            np.array([1, 2]),
+            [],
+        ]
+        for i, values in enumerate(columns):
+            with self.subTest(test_number=i):
+                self.assert_matches_validate(descriptor, values)
+    
+    def test_choice_column(self):
+        """Tests that choice columns report the failures and messages of validate()"""
+        
+        descriptor = type("TestClass", (), {"color": ChoiceValidator(["red", "green", 3])}).color
+        columns = [
+            ["red", "blue", 3, 3.0, [3], None],
+            np.array(["red", "blue", "red", "green"]),
+            np.array([3, 4, 3]),
+            np.array(["red", [3], 3], dtype=object),
+            [],
+        ]
+        for i, values in enumerate(columns):
+            with self.subTest(test_number=i):
+                self.assert_matches_validate(descriptor, values)
+    
+    def test_custom_validate(self):
+        """Tests that subclasses overriding validate() only are validated value by value"""
+        
+        class EvenValidator(IntegerValidator):
+            def validate(self, value):
+                super().validate(value)
+                if value % 2:
+                    raise ValueError(f"{self.prop_name} must be even.")
+        
+        descriptor = type("TestClass", (), {"age": EvenValidator(0, 10)}).age
+        self.assert_matches_validate(descriptor, [2, 3, 12, "abc"])
+    
+    def test_not_one_dimensional(self):
+        descriptor = type("TestClass", (), {"age": IntegerValidator(0, 10)}).age
+        with self.assertRaises(ValueError):
+            descriptor.validate_many(np.zeros((2, 2), dtype=int))
+
+
+class TestSlotted(unittest.TestCase):
+    @staticmethod
+    def create_test_class():
+        class Base:
+            __slots__ = ()
+        
+        @slotted
+        class Person(Base):
+            __slots__ = ("note",)
+            age = IntegerValidator(0, 150)
+            name = StringValidator(1, 10)
+            
+            def __init__(self, age, name):
+                super().__init__()
+                self.age = age
+                self.name = name
+        
+        return Person
+    
+    def test_set_ok(self):
+        """Tests that values are stored in hidden slots, without __dict__"""
+        
+        Person = self.create_test_class()
+        obj = Person(30, "Ada")
+        self.assertEqual(30, obj.age)
+        self.assertEqual("Ada", obj.name)
+        self.assertFalse(hasattr(obj, "__dict__"))
+        self.assertEqual(("note", "_slot_age", "_slot_name"), Person.__slots__)
+        obj.note = "kept"
+        self.assertEqual("kept", obj.note)
+    
+    def test_set_invalid(self):
+        """Tests that slot-backed descriptors raise the messages of validate()"""
+        
+        obj = self.create_test_class()(30, "Ada")
+        for i, (prop_name, value, message) in enumerate([
+            ("age", 151, "age must be <= 150."),
+            ("age", "30", "age must be an integer."),
+            ("name", "", "name must be >= 1 chars."),
+        ]):
+            with self.subTest(test_number=i):
+                with self.assertRaisesRegex(ValueError, message):
+                    setattr(obj, prop_name, value)
+        self.assertEqual(30, obj.age)
+    
+    def test_get_unset(self):
+        """Tests that unset slot-backed values read as None, as with __dict__ storage"""
+        
+        Person = self.create_test_class()
+        obj = Person.__new__(Person)
+        self.assertIsNone(obj.age)
+        self.assertIsInstance(Person.age, IntegerValidator)
+    
+    def test_custom_validate(self):
+        """Tests that the generic __set__ also stores in slots"""
+        
+        class EvenValidator(IntegerValidator):
+            def validate(self, value):
+                super().validate(value)
+                if value % 2:
+                    raise ValueError(f"{self.prop_name} must be even.")
+        
+        obj = slotted(type("TestClass", (), {"age": EvenValidator(0, 10)}))()
+        obj.age = 4
+        self.assertEqual(4, obj.age)
+        self.assertFalse(hasattr(obj, "__dict__"))
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        BaseValidator.instrument(False)
+        BaseValidator.instrumentation_snapshot(reset=True)
+    
+    @staticmethod
+    def field(snapshot, owner_class, prop_name):
+        name = f"{owner_class.__module__}.{owner_class.__qualname__}"
+        return next(f for f in snapshot["fields"] if (f["owner_class"], f["prop_name"]) == (name, prop_name))
+    
+    def test_counts(self):
+        """Tests that calls, failures and time are counted per owner class and property"""
+        
+        cls = type("TestClass", (), {"age": IntegerValidator(0, 10), "name": StringValidator(1, 5)})
+        obj = cls()
+        BaseValidator.instrument()
+        obj.age = 5
+        for value in [20, "abc"]:
+            with self.assertRaises(ValueError):
+                obj.age = value
+        obj.name = "Ada"
+        self.assertEqual(5, obj.age)
+        
+        snapshot = BaseValidator.instrumentation_snapshot()
+        self.assertTrue(snapshot["enabled"])
+        age = self.field(snapshot, cls, "age")
+        self.assertEqual((3, 2), (age["calls"], age["failures"]))
+        self.assertGreater(age["seconds"], 0)
+        name = self.field(snapshot, cls, "name")
+        self.assertEqual((1, 0), (name["calls"], name["failures"]))
+    
+    def test_disabled_unchanged(self):
+        """Tests that __set__ is swapped back and nothing is counted when disabled"""
+        
+        cls = type("TestClass", (), {"age": IntegerValidator(0, 10)})
+        descriptor = cls.age
+        set_ = type(descriptor).__set__
+        BaseValidator.instrument()
+        self.assertIsNot(set_, type(descriptor).__set__)
+        self.assertIsInstance(descriptor, IntegerValidator)
+        BaseValidator.instrument(False)
+        self.assertIs(set_, type(descriptor).__set__)
+        cls().age = 1
+        self.assertEqual(0, self.field(BaseValidator.instrumentation_snapshot(), cls, "age")["calls"])
+    
+    def test_named_while_enabled(self):
+        """Tests that descriptors of classes created while enabled are instrumented, slotted ones included"""
+        
+        BaseValidator.instrument()
+        cls = slotted(type("TestClass", (), {"age": IntegerValidator(0, 10)}))
+        obj = cls()
+        obj.age = 1
+        self.assertEqual(1, obj.age)
+        self.assertEqual(1, self.field(BaseValidator.instrumentation_snapshot(), cls, "age")["calls"])
+    
+    def test_dump_reset(self):
+        cls = type("TestClass", (), {"age": IntegerValidator(0, 10)})
+        BaseValidator.instrument()
+        cls().age = 1
+        fp = io.StringIO()
+        BaseValidator.dump_instrumentation(fp, reset=True)
+        self.assertEqual(1, self.field(json.loads(fp.getvalue()), cls, "age")["calls"])
+        self.assertEqual(0, self.field(BaseValidator.instrumentation_snapshot(), cls, "age")["calls"])
+
+
 def run_tests(test_class):
     suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
     runner = unittest.TextTestRunner(verbosity=2)
@@ -186,3 +591,9 @@ def run_tests(test_class):
 if __name__ == "__main__":
     run_tests(TestIntegerValidator)
     run_tests(TestStringValidator)
+    run_tests(TestPatternValidator)
+    run_tests(TestChoiceValidator)
+    run_tests(TestSpecializedSet)
+    run_tests(TestValidateMany)
+    run_tests(TestSlotted)
+    run_tests(TestInstrumentation)
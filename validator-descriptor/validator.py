@@ -1,12 +1,42 @@
 """Validator models"""
 
 
+import functools
+import json
+import re
+import time
+import types
 import numbers
+import weakref
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # only needed by validate_many
+    np = None
+
+
+BatchResult = namedtuple("BatchResult", "valid, indices, messages")
+
+# compiled regexes shared by every PatternValidator, bounded so that generated patterns cannot grow it forever
+_compile_pattern = functools.lru_cache(maxsize=256)(re.compile)
 
 
 class BaseValidator:
     """Base class for validators"""
     
+    # names available to the conditions of _checks()
+    _check_globals = {"Integral": numbers.Integral}
+    # slot member storing the value, if the owner class has one, see slot_name()
+    _slot = None
+    # type converting text input such as CSV fields before validation, None to validate text as is
+    text_type = None
+    # descriptors with a property name, see instrument()
+    _descriptors = weakref.WeakSet()
+    _instrumenting = False
+    # calls, failures and nanoseconds spent in __set__, see instrument()
+    _counters = None
+    
     def __init__(self, min_=None, max_=None):
         """
 
@@ -17,14 +47,33 @@ class BaseValidator:
         self._min = min_
         self._max = max_
     
+    @staticmethod
+    def slot_name(prop_name):
+        """
+
+        Args:
+            prop_name (str): property name
+
+        Returns:
+            str: name of the hidden slot storing the value in classes with __slots__
+        """
+        return f"_slot_{prop_name}"
+    
     def __set_name__(self, owner_class, prop_name):
-        """Set property name
+        """Set property name, choose slot or __dict__ storage and specialize __set__
 
         Args:
             owner_class (type): owner class
             prop_name (str): property name
         """
         self.prop_name = prop_name
+        slot = owner_class.__dict__.get(BaseValidator.slot_name(prop_name))
+        self._slot = slot if isinstance(slot, types.MemberDescriptorType) else None
+        self._owner_class = owner_class
+        self._specialize()
+        BaseValidator._descriptors.add(self)
+        if BaseValidator._instrumenting:
+            self._instrument()
     
     def __get__(self, instance, owner_class):
         """Get instance or value depending on where it is called from
@@ -39,6 +88,11 @@ class BaseValidator:
         """
         if instance is None:
             return self
+        elif self._slot is not None:
+            try:
+                return self._slot.__get__(instance, owner_class)
+            except AttributeError:
+                return None
         else:
             return instance.__dict__.get(self.prop_name, None)
     
@@ -50,6 +104,192 @@ class BaseValidator:
         """
         pass
     
+    def _messages(self):
+        """Error messages of validate(), implemented specifically in each subclass
+
+        Returns:
+            tuple: messages, indexed by the failure codes of _batch_codes() minus 1
+        """
+        return ()
+    
+    def _checks(self):
+        """Checks of validate() as source code, implemented along with validate() in each subclass
+
+        Returns:
+            list: (condition, message) pairs, where condition is an expression of `value`, `min_`,
+                `max_` and the names of _check_values() that is true for invalid values, with only the
+                checks that apply
+        """
+        return []
+    
+    def _check_values(self):
+        """Values other than the bounds used by the conditions of _checks()
+
+        Returns:
+            dict: value by name
+        """
+        return {}
+    
+    def _check_source(self, suffix, pad, namespace):
+        """Source code appending the messages of validate() for `value` to `messages`
+
+        Args:
+            suffix (str): suffix making the names added to namespace unique
+            pad (str): indentation of the lines
+            namespace (dict): globals of the generated code, updated with the values the lines use
+
+        Returns:
+            list: lines of source code, with the conditions of _checks() or a call of validate()
+        """
+        if not self._implements("_checks"):
+            namespace[f"validate{suffix}"] = self.validate
+            return [
+                f"{pad}try:",
+                f"{pad}    validate{suffix}(value)",
+                f"{pad}except ValueError as e:",
+                f"{pad}    messages.append(str(e))",
+            ]
+        namespace.update(BaseValidator._check_globals)
+        namespace[f"min_{suffix}"], namespace[f"max_{suffix}"] = self._min, self._max
+        lines = [f"{pad}min_ = min_{suffix}", f"{pad}max_ = max_{suffix}"]
+        for value_name, value in self._check_values().items():
+            namespace[f"{value_name}_{suffix}"] = value
+            lines.append(f"{pad}{value_name} = {value_name}_{suffix}")
+        keyword = "if"
+        for condition, message in self._checks():
+            lines.append(f"{pad}{keyword} {condition}:")
+            lines.append(f"{pad}    messages.append({message!r})")
+            keyword = "elif"
+        return lines
+    
+    def _batch_codes(self, values):
+        """Checks of validate() on a whole column, implemented along with validate() in each subclass
+
+        Args:
+            values (list or numpy.ndarray): values
+
+        Returns:
+            numpy.ndarray: 0 for each valid value, else 1 + index of its message in _messages()
+        """
+        return np.zeros(len(values), dtype=np.int8)
+    
+    def _user_class(self):
+        """
+
+        Returns:
+            type: class of the descriptor before specialization and instrumentation
+        """
+        cls = type(self)
+        while cls.__dict__.get("_instrumented_set", False):
+            cls = cls.__base__
+        return getattr(self, "_generic_class", cls)
+    
+    def _stores_directly(self):
+        """
+
+        Returns:
+            bool: __set__ is not overridden, so a valid value can be stored without calling it
+        """
+        return self._user_class().__set__ is BaseValidator.__set__
+    
+    def _implements(self, method_name):
+        """
+
+        Args:
+            method_name (str): method mirroring validate()
+
+        Returns:
+            bool: the class defining validate() also defines method_name
+        """
+        generic_class = self._user_class()
+        validate_owner = next(cls for cls in generic_class.__mro__ if "validate" in cls.__dict__)
+        return method_name in validate_owner.__dict__
+    
+    def validate_many(self, values):
+        """Validate a column of values in one vectorized pass, reporting every failure instead of raising
+
+        Subclasses overriding validate() without overriding _batch_codes() are validated value by value.
+
+        Args:
+            values (list or numpy.ndarray): one-dimensional column of values
+
+        Raises:
+            ImportError: numpy is not installed
+            ValueError: values are not one-dimensional
+
+        Returns:
+            BatchResult: mask of valid values, indices of invalid values and their messages, the same
+                as those raised by validate()
+        """
+        if np is None:
+            raise ImportError("validate_many requires numpy.")
+        if isinstance(values, np.ndarray):
+            if values.ndim != 1:
+                raise ValueError("Values must be one-dimensional.")
+        else:
+            values = list(values)
+        
+        if not self._implements("_batch_codes"):
+            messages = []
+            for value in values:
+                try:
+                    self.validate(value)
+                except ValueError as e:
+                    messages.append(str(e))
+                else:
+                    messages.append(None)
+            valid = np.array([message is None for message in messages], dtype=bool).reshape(-1)
+            indices = np.flatnonzero(~valid)
+            return BatchResult(valid, indices, [messages[i] for i in indices])
+        
+        codes = self._batch_codes(values)
+        valid = codes == 0
+        indices = np.flatnonzero(~valid)
+        messages = np.array((None,) + self._messages(), dtype=object)
+        return BatchResult(valid, indices, messages[codes[indices]].tolist())
+    
+    @staticmethod
+    def _typed_column(values, kinds, is_type):
+        """Split a column into values of the validated type and failure codes for the others
+
+        Args:
+            values (list or numpy.ndarray): values
+            kinds (str): dtype kinds whose elements are all of the validated type
+            is_type (callable): type check of one value
+
+        Returns:
+            tuple: failure codes (1 for wrong type), positions and values of the right type
+        """
+        codes = np.zeros(len(values), dtype=np.int8)
+        if isinstance(values, np.ndarray) and values.dtype.kind in kinds:
+            return codes, np.arange(len(values)), values
+        if isinstance(values, np.ndarray) and values.dtype.kind != "O":
+            codes[:] = 1
+            return codes, np.zeros(0, dtype=np.intp), values[:0]
+        column = np.fromiter(values, dtype=object, count=len(values))
+        typed = np.fromiter((is_type(value) for value in column), dtype=bool, count=len(column))
+        codes[~typed] = 1
+        return codes, np.flatnonzero(typed), column[typed]
+    
+    def _bound_codes(self, codes, positions, measures):
+        """Mark values out of bounds, the lower bound first as in validate()
+
+        Args:
+            codes (numpy.ndarray): failure codes, updated in place
+            positions (numpy.ndarray): positions of measured values
+            measures (numpy.ndarray): values or lengths to compare with the bounds
+
+        Returns:
+            numpy.ndarray: failure codes
+        """
+        low = np.zeros(len(positions), dtype=bool)
+        if self._min is not None:
+            low = measures < self._min
+            codes[positions[low]] = 2
+        if self._max is not None:
+            codes[positions[(measures > self._max) & ~low]] = 3
+        return codes
+    
     def __set__(self, instance, value):
         """Call validate(value) and store value in instance if valid
 
@@ -58,10 +298,187 @@ class BaseValidator:
             value (type): value type
         """
         self.validate(value)
-        instance.__dict__[self.prop_name] = value
+        if self._slot is not None:
+            self._slot.__set__(instance, value)
+        else:
+            instance.__dict__[self.prop_name] = value
+    
+    def _specialize(self):
+        """Move to a subclass whose __set__ is generated from _checks(), with bounds and property name baked in
+
+        Subclasses overriding validate() without overriding _checks(), or overriding __set__, keep
+        their __set__. Bounds changed after the owner class is created are not seen by the generated
+        __set__.
+        """
+        if not self._implements("_checks") or not self._stores_directly():
+            return
+        generic_class = self._user_class()
+        
+        values = self._check_values()
+        lines = [f"def make({', '.join(['min_', 'max_', 'store', *values])}):", "    def __set__(self, instance, value):"]
+        for condition, message in self._checks():
+            lines.append(f"        if {condition}:")
+            lines.append(f"            raise ValueError({message!r})")
+        if self._slot is not None:
+            lines.append("        store(instance, value)")
+        else:
+            lines.append(f"        instance.__dict__[{self.prop_name!r}] = value")
+        lines.append("    return __set__")
+        namespace = dict(BaseValidator._check_globals)
+        exec("\n".join(lines), namespace)
+        
+        store = None if self._slot is None else self._slot.__set__
+        self._generic_class = generic_class
+        self.__class__ = type(generic_class.__name__, (generic_class,), {
+            "__set__": namespace["make"](self._min, self._max, store, **values),
+            "__module__": generic_class.__module__,
+            "__qualname__": generic_class.__qualname__,
+        })
+    
+    @staticmethod
+    def instrument(enabled=True):
+        """Start or stop counting calls, failures and time of __set__ for every descriptor
+
+        Instrumented descriptors move to a subclass whose __set__ wraps the current one, and move
+        back when instrumentation stops, so __set__ is unchanged when it is disabled. Descriptors
+        named while it is enabled are instrumented too. Counters are kept across calls. RecordLoader
+        and Deferred inline the checks of _checks() and are not counted.
+
+        Args:
+            enabled (bool, optional): start if True, stop if False. Defaults to True.
+        """
+        BaseValidator._instrumenting = enabled
+        for descriptor in list(BaseValidator._descriptors):
+            if enabled:
+                descriptor._instrument()
+            elif type(descriptor).__dict__.get("_instrumented_set", False):
+                descriptor.__class__ = type(descriptor).__base__
+    
+    def _instrument(self):
+        """Move to a subclass whose __set__ counts calls, failures and time of the current __set__"""
+        cls = type(self)
+        if cls.__dict__.get("_instrumented_set", False):
+            return
+        if self._counters is None:
+            self._counters = [0, 0, 0]
+        counters = self._counters
+        set_ = cls.__set__
+        perf_counter_ns = time.perf_counter_ns
+        
+        def __set__(self, instance, value):
+            start = perf_counter_ns()
+            try:
+                set_(self, instance, value)
+            except ValueError:
+                counters[1] += 1
+                raise
+            finally:
+                counters[0] += 1
+                counters[2] += perf_counter_ns() - start
+        
+        self.__class__ = type(cls.__name__, (cls,), {
+            "__set__": __set__,
+            "_instrumented_set": True,
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+        })
+    
+    @staticmethod
+    def instrumentation_snapshot(reset=False):
+        """
+
+        Args:
+            reset (bool, optional): set counters back to 0. Defaults to False.
+
+        Returns:
+            dict: whether instrumentation is enabled, and calls, failures and seconds spent in __set__
+                for each (owner class, property name) ever instrumented, by decreasing time
+        """
+        fields = []
+        for descriptor in list(BaseValidator._descriptors):
+            counters = descriptor._counters
+            if counters is None:
+                continue
+            owner_class = descriptor._owner_class
+            calls, failures, nanoseconds = counters
+            fields.append({
+                "owner_class": f"{owner_class.__module__}.{owner_class.__qualname__}",
+                "prop_name": descriptor.prop_name,
+                "calls": calls,
+                "failures": failures,
+                "seconds": nanoseconds / 1e9,
+            })
+            if reset:
+                counters[:] = [0, 0, 0]
+        fields.sort(key=lambda field: (-field["seconds"], field["owner_class"], field["prop_name"]))
+        return {"enabled": BaseValidator._instrumenting, "fields": fields}
+    
+    @staticmethod
+    def dump_instrumentation(fp, reset=False):
+        """Write instrumentation_snapshot() as JSON
+
+        Args:
+            fp (file): text file open for writing
+            reset (bool, optional): set counters back to 0. Defaults to False.
+        """
+        json.dump(BaseValidator.instrumentation_snapshot(reset), fp, indent=2)
+
+
+def validated_fields(cls):
+    """
+
+    Args:
+        cls (type): class with validator descriptors
+
+    Returns:
+        dict: validator descriptors by property name, including inherited ones, in definition order
+    """
+    fields = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in klass.__dict__.items():
+            if isinstance(value, BaseValidator):
+                fields[name] = value
+    return fields
+
+
+def slotted(cls):
+    """Class decorator rebuilding cls with __slots__, adding a hidden slot per validator
+
+    Instances have no __dict__ when every base class also defines __slots__. Existing __slots__
+    of cls are kept.
+
+    Args:
+        cls (type): class with validator descriptors
+
+    Returns:
+        type: new class with __slots__
+    """
+    namespace = dict(cls.__dict__)
+    slots = namespace.pop("__slots__", ())
+    slots = (slots,) if isinstance(slots, str) else tuple(slots)
+    for name in slots + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    prop_names = [name for name, value in namespace.items() if isinstance(value, BaseValidator)]
+    namespace["__slots__"] = slots + tuple(BaseValidator.slot_name(name) for name in prop_names)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    
+    # zero-argument super() in methods refers to the class through a __class__ cell
+    for value in namespace.values():
+        value = getattr(value, "__func__", value)
+        functions = [value.fget, value.fset, value.fdel] if isinstance(value, property) else [value]
+        for function in functions:
+            for cell in getattr(function, "__closure__", None) or ():
+                try:
+                    if cell.cell_contents is cls:
+                        cell.cell_contents = new_cls
+                except ValueError:
+                    pass  # empty cell
+    return new_cls
 
 
 class IntegerValidator(BaseValidator):
+    text_type = int
+    
     def validate(self, value):
         """Validate value as an integer between bounds, if any
 
@@ -79,6 +496,52 @@ class IntegerValidator(BaseValidator):
             raise ValueError(f"{self.prop_name} must be >= {self._min}.")
         if self._max is not None and value > self._max:
             raise ValueError(f"{self.prop_name} must be <= {self._max}.")
+    
+    def _checks(self):
+        """Checks of validate() as source code
+
+        Returns:
+            list: (condition, message) pairs
+        """
+        type_message, min_message, max_message = self._messages()
+        # exact int first, the ABC check of numbers.Integral is slow
+        checks = [("type(value) is not int and not isinstance(value, Integral)", type_message)]
+        if self._min is not None:
+            checks.append(("value < min_", min_message))
+        if self._max is not None:
+            checks.append(("value > max_", max_message))
+        return checks
+    
+    def _messages(self):
+        """Error messages of validate()
+
+        Returns:
+            tuple: not an integer, less than lower bound, larger than upper bound
+        """
+        return (
+            f"{self.prop_name} must be an integer.",
+            f"{self.prop_name} must be >= {self._min}.",
+            f"{self.prop_name} must be <= {self._max}.",
+        )
+    
+    def _batch_codes(self, values):
+        """Checks of validate() on a whole column
+
+        Args:
+            values (list or numpy.ndarray): values
+
+        Returns:
+            numpy.ndarray: failure codes
+        """
+        codes, positions, column = BaseValidator._typed_column(
+            values, "iu", lambda value: type(value) is int or isinstance(value, numbers.Integral)
+        )
+        if column.dtype == object:
+            try:
+                column = column.astype(np.int64)
+            except OverflowError:
+                pass  # compare as Python integers
+        return self._bound_codes(codes, positions, column)
 
 
 class StringValidator(BaseValidator):
@@ -109,3 +572,197 @@ class StringValidator(BaseValidator):
             raise ValueError(f"{self.prop_name} must be >= {self._min} chars.")
         if self._max is not None and len(value) > self._max:
             raise ValueError(f"{self.prop_name} must be <= {self._max} chars.")
+    
+    def _checks(self):
+        """Checks of validate() as source code, skipping a lower bound of 0
+
+        Returns:
+            list: (condition, message) pairs
+        """
+        type_message, min_message, max_message = self._messages()[:3]
+        checks = [("not isinstance(value, str)", type_message)]
+        if self._min:
+            checks.append(("len(value) < min_", min_message))
+        if self._max is not None:
+            checks.append(("len(value) > max_", max_message))
+        return checks
+    
+    def _messages(self):
+        """Error messages of validate()
+
+        Returns:
+            tuple: not a string, shorter than lower bound, longer than upper bound
+        """
+        return (
+            f"{self.prop_name} must be a string.",
+            f"{self.prop_name} must be >= {self._min} chars.",
+            f"{self.prop_name} must be <= {self._max} chars.",
+        )
+    
+    def _batch_codes(self, values):
+        """Checks of validate() on a whole column
+
+        Args:
+            values (list or numpy.ndarray): values
+
+        Returns:
+            numpy.ndarray: failure codes
+        """
+        codes, positions, column = BaseValidator._typed_column(values, "U", lambda value: isinstance(value, str))
+        if column.dtype.kind == "U":
+            lengths = np.char.str_len(column)
+        else:
+            lengths = np.fromiter((len(value) for value in column), dtype=np.int64, count=len(column))
+        return self._bound_codes(codes, positions, lengths)
+
+
+class PatternValidator(StringValidator):
+    def __init__(self, pattern, min_=None, max_=None, flags=0):
+        """Compile pattern once, sharing it with other validators of the same pattern
+
+        Args:
+            pattern (str or re.Pattern): regular expression the whole value must match
+            min_ (int, optional): minimal length. Defaults to None.
+            max_ (int, optional): maximal length. Defaults to None.
+            flags (int, optional): flags of re.compile, for a str pattern. Defaults to 0.
+        """
+        super().__init__(min_, max_)
+        self._pattern = pattern if isinstance(pattern, re.Pattern) else _compile_pattern(pattern, flags)
+    
+    def validate(self, value):
+        """Validate value as a string with length between bounds, if any, fully matching the pattern
+
+        Args:
+            value (type): value type
+
+        Raises:
+            ValueError: value is not a string
+            ValueError: value is shorter than lower bound
+            ValueError: value is longer than upper bound
+            ValueError: value does not match the pattern
+        """
+        super().validate(value)
+        if self._pattern.fullmatch(value) is None:
+            raise ValueError(self._messages()[3])
+    
+    def _checks(self):
+        """Checks of validate() as source code
+
+        Returns:
+            list: (condition, message) pairs
+        """
+        return super()._checks() + [("fullmatch(value) is None", self._messages()[3])]
+    
+    def _check_values(self):
+        """
+
+        Returns:
+            dict: bound fullmatch method of the pattern
+        """
+        return {"fullmatch": self._pattern.fullmatch}
+    
+    def _messages(self):
+        """Error messages of validate()
+
+        Returns:
+            tuple: messages of StringValidator, not matching the pattern
+        """
+        return super()._messages() + (f"{self.prop_name} must match {self._pattern.pattern!r}.",)
+    
+    def _batch_codes(self, values):
+        """Checks of validate() on a whole column, matching only values passing the string checks
+
+        Args:
+            values (list or numpy.ndarray): values
+
+        Returns:
+            numpy.ndarray: failure codes
+        """
+        codes = super()._batch_codes(values)
+        positions = np.flatnonzero(codes == 0)
+        if isinstance(values, np.ndarray):
+            candidates = values[positions].tolist()
+        else:
+            candidates = [values[i] for i in positions]
+        fullmatch = self._pattern.fullmatch
+        matched = np.fromiter((fullmatch(value) is not None for value in candidates), dtype=bool, count=len(candidates))
+        codes[positions[~matched]] = 4
+        return codes
+
+
+class ChoiceValidator(BaseValidator):
+    def __init__(self, choices, text_type=None):
+        """Freeze allowed values for constant-time membership checks
+
+        Args:
+            choices (iterable): allowed hashable values
+            text_type (type, optional): type converting text input before validation. Defaults to
+                int or float when every choice is of that type, else text is validated as is.
+
+        Raises:
+            ValueError: no allowed values
+        """
+        super().__init__()
+        self._choices = frozenset(choices)
+        if not self._choices:
+            raise ValueError("Choices must not be empty.")
+        if text_type is None:
+            types = {type(choice) for choice in self._choices}
+            if len(types) == 1 and types <= {int, float}:
+                text_type = types.pop()
+        self.text_type = text_type
+    
+    def validate(self, value):
+        """Validate value as one of the allowed values
+
+        Args:
+            value (type): value type
+
+        Raises:
+            ValueError: value is not allowed, including unhashable values
+        """
+        if type(value).__hash__ is None or value not in self._choices:
+            raise ValueError(self._messages()[0])
+    
+    def _checks(self):
+        """Checks of validate() as source code
+
+        Returns:
+            list: (condition, message) pairs
+        """
+        return [("type(value).__hash__ is None or value not in choices", self._messages()[0])]
+    
+    def _check_values(self):
+        """
+
+        Returns:
+            dict: allowed values
+        """
+        return {"choices": self._choices}
+    
+    def _messages(self):
+        """Error messages of validate()
+
+        Returns:
+            tuple: not allowed
+        """
+        return (f"{self.prop_name} must be one of {', '.join(sorted(map(repr, self._choices)))}.",)
+    
+    def _batch_codes(self, values):
+        """Checks of validate() on a whole column, checking each distinct value of typed arrays once
+
+        Args:
+            values (list or numpy.ndarray): values
+
+        Returns:
+            numpy.ndarray: failure codes
+        """
+        choices = self._choices
+        if isinstance(values, np.ndarray) and values.dtype.kind != "O":
+            distinct, inverse = np.unique(values, return_inverse=True)
+            allowed = np.fromiter((value in choices for value in distinct.tolist()), dtype=bool, count=len(distinct))
+            return (~allowed[inverse.reshape(-1)]).astype(np.int8)
+        allowed = np.fromiter(
+            (type(value).__hash__ is not None and value in choices for value in values), dtype=bool, count=len(values)
+        )
+        return (~allowed).astype(np.int8)